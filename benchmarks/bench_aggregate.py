@@ -0,0 +1,57 @@
+"""
+Soft validation of invalid bulk payloads with full and aggregated reports,
+aggregated report keeps one group per path template and kind of error.
+
+    $ python benchmarks/bench_aggregate.py
+"""
+
+import time
+import tracemalloc
+
+from common import print_table
+
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import AggregatedReport, Report
+
+SIZES = (1000, 100000, 500000)
+
+
+def run(node, data, report):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        node.validate(data, report)
+        str(report)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_size(size: int) -> str:
+    return "%.1f KiB" % (size / 1024)
+
+
+def main():
+    node = compile_schema({"items": [{"id": int, "price": float}]})
+    rows = []
+    for size in SIZES:
+        data = {"items": [{"id": i, "price": str(i)} for i in range(size)]}
+        before, before_memory = run(node, data, Report(soft=True))
+        after, after_memory = run(node, data, AggregatedReport())
+        rows.append(
+            [
+                size,
+                before,
+                format_size(before_memory),
+                after,
+                format_size(after_memory),
+            ]
+        )
+    print_table(
+        ["items", "full report", "peak memory", "aggregated", "peak memory"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
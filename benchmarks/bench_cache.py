@@ -0,0 +1,108 @@
+"""
+Validation of polled payloads which mostly don't change between calls:
+Checker.validate without cache against validate with ValidationCache
+of unchanged payload, of payload with one changed item, and of new
+payload every call (cold cache). Cost of cold cache by depth of nested
+dicts shows that every level is encoded once, not by every cached parent.
+
+    $ python benchmarks/bench_cache.py
+"""
+
+from itertools import count
+
+from common import measure, print_table
+
+from json_checker import Checker, ValidationCache
+
+SIZES = (100, 1000, 10000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item %s" % i, "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+DEPTHS = (1, 10, 40, 100)
+
+
+def nested(depth: int) -> tuple:
+    schema = {"id": int, "tags": [str]}
+    data = {"id": 0, "tags": ["a", "b", "c"]}
+    for level in range(1, depth):
+        schema = {"id": int, "tags": [str], "child": schema}
+        data = {"id": level, "tags": ["a", "b", "c"], "child": data}
+    return schema, data
+
+
+def change_one(checker, data, counter=count()):
+    data["items"][0]["price"] = float(next(counter))
+    return checker.validate(data)
+
+
+def cold(checker, data, counter=count()):
+    data["id"] = next(counter)
+    checker.cache.clear()
+    return checker.validate(data)
+
+
+def main():
+    plain = Checker(SCHEMA)
+    cached = Checker(SCHEMA, cache=ValidationCache(max_entries=100000))
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(plain.validate, data)
+        unchanged = measure(cached.validate, data)
+        changed = measure(change_one, cached, data)
+        first = measure(cold, cached, data)
+        rows.append(
+            [
+                size,
+                full,
+                unchanged,
+                "%.1fx" % (full / unchanged),
+                changed,
+                "%.1fx" % (full / changed),
+                first,
+                "%.1fx" % (first / full),
+            ]
+        )
+    print_table(
+        [
+            "items",
+            "validate",
+            "unchanged",
+            "speedup",
+            "one changed",
+            "speedup",
+            "cold cache",
+            "cost",
+        ],
+        rows,
+    )
+
+    rows = []
+    for depth in DEPTHS:
+        schema, data = nested(depth)
+        plain = Checker(schema)
+        cached = Checker(schema, cache=ValidationCache(max_entries=100000))
+        full = measure(plain.validate, data)
+        first = measure(cold, cached, data)
+        rows.append([depth, full, first, "%.2fx" % (first / full)])
+    print_table(["depth", "validate", "cold cache", "cost"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Overhead of checkpoints of validate_ndjson: validation of the same file
+without checkpoint and with checkpoints saved every N lines.
+
+    $ python benchmarks/bench_checkpoint.py
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from common import print_table
+
+from json_checker import validate_ndjson
+
+SIZE = 200000
+
+INTERVALS = (None, 100000, 10000, 1000)
+
+SCHEMA = {"id": int, "name": str, "price": float, "tags": [str]}
+
+
+def write_file(path: str):
+    with open(path, "w") as f:
+        for i in range(SIZE):
+            price = "1" if i % 100 == 0 else 1.5
+            record = {"id": i, "name": "item", "price": price, "tags": ["a"]}
+            f.write(json.dumps(record) + "\n")
+
+
+def validate(path: str, checkpoint, every):
+    kwargs = {}
+    if every is not None:
+        kwargs = {"checkpoint": checkpoint, "checkpoint_every": every}
+    for _ in validate_ndjson(path, SCHEMA, **kwargs):
+        pass
+
+
+def best(func, *args, repeat: int = 3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.ndjson")
+        checkpoint = os.path.join(tmp, "checkpoint")
+        write_file(path)
+        baseline = best(validate, path, checkpoint, None)
+        for every in INTERVALS:
+            elapsed = best(validate, path, checkpoint, every)
+            rows.append(
+                [
+                    every or "off",
+                    (SIZE - 1) // every if every else 0,
+                    elapsed,
+                    "%+.1f%%" % ((elapsed / baseline - 1) * 100),
+                ]
+            )
+    print_table(["every lines", "saves", "time", "overhead"], rows)
+
+
+if __name__ == "__main__":
+    main()
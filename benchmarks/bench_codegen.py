@@ -0,0 +1,73 @@
+"""
+Generated validator module against compiled plan,
+and startup cost of generating it against loading it from cache_dir.
+
+    $ python benchmarks/bench_codegen.py
+"""
+
+import shutil
+import tempfile
+
+from common import measure, print_table
+
+from json_checker import And, OptionalKey, Or, register
+from json_checker.core.codegen import load_plan
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+positive = register(lambda x: x >= 0, name="bench.positive")
+
+SCHEMA = {
+    "id": int,
+    "name": str,
+    "price": And(float, positive),
+    "tags": [str],
+    OptionalKey("parent"): Or(int, None),
+    "items": [{"sku": str, "count": int, "flags": [bool, bool]}],
+}
+
+
+def make_data(items: int) -> dict:
+    return {
+        "id": 1,
+        "name": "order",
+        "price": 12.5,
+        "tags": ["a", "b", "c"],
+        "parent": None,
+        "items": [
+            {"sku": "sku-%d" % i, "count": i, "flags": [True, False]}
+            for i in range(items)
+        ],
+    }
+
+
+def run(plan, data):
+    plan.validate(data, Report(soft=False))
+
+
+def main():
+    compiled = compile_schema(SCHEMA)
+    generated = load_plan(SCHEMA)
+    rows = []
+    for items in (1, 10, 100, 1000):
+        data = make_data(items)
+        before = measure(run, compiled, data)
+        after = measure(run, generated, data)
+        rows.append([items, before, after, "%.1fx" % (before / after)])
+    print_table(["items", "compiled", "generated", "speedup"], rows)
+
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cold = measure(load_plan, SCHEMA, False, None, number=20)
+        load_plan(SCHEMA, cache_dir=cache_dir)
+        warm = measure(load_plan, SCHEMA, False, cache_dir, number=20)
+    finally:
+        shutil.rmtree(cache_dir)
+    print_table(
+        ["startup", "time"],
+        [["generate and compile", cold], ["load from cache_dir", warm]],
+    )
+
+
+if __name__ == "__main__":
+    main()
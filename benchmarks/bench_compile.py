@@ -0,0 +1,57 @@
+"""
+Compiled plan of `Checker.validate` against interpretive `Validator` walk,
+which built checkers at every node of every call.
+
+    $ python benchmarks/bench_compile.py
+"""
+
+from common import measure, print_table
+
+from json_checker import And, Checker, OptionalKey, Or
+from json_checker.core.checkers import Validator
+from json_checker.core.reports import Report
+
+SCHEMA = {
+    "id": int,
+    "name": str,
+    "price": And(float, lambda x: x >= 0),
+    "tags": [str],
+    OptionalKey("parent"): Or(int, None),
+    "items": [{"sku": str, "count": int, "flags": [bool]}],
+}
+
+
+def make_data(items: int) -> dict:
+    return {
+        "id": 1,
+        "name": "order",
+        "price": 12.5,
+        "tags": ["a", "b", "c"],
+        "parent": None,
+        "items": [
+            {"sku": "sku-%d" % i, "count": i, "flags": [True, False]}
+            for i in range(items)
+        ],
+    }
+
+
+def interpretive(data):
+    report = Report(soft=False)
+    Validator(expected_data=SCHEMA, report=report).validate(data)
+    return data
+
+
+def main():
+    checker = Checker(SCHEMA)
+    checker.compile()
+    rows = []
+    for items in (1, 10, 100, 1000):
+        data = make_data(items)
+        before = measure(interpretive, data)
+        after = measure(checker.validate, data)
+        rows.append([items, before, after, "%.1fx" % (before / after)])
+    print_table(["items", "interpretive", "compiled", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
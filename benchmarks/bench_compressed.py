@@ -0,0 +1,101 @@
+"""
+Validation of compressed newline-delimited JSON files by validate_ndjson,
+file is decompressed by background thread and validated at once,
+inline decompression and validation by one thread is the baseline.
+Throughput of stages is taken from summary of validation.
+
+    $ python benchmarks/bench_compressed.py
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import tempfile
+import time
+
+from common import print_table
+
+from json_checker import Checker, validate_ndjson
+from json_checker.files import Summary, check_lines, iter_lines, open_source
+
+SIZE = 100000
+
+SCHEMA = {"id": int, "name": str, "price": float, "tags": [str]}
+
+COMPRESSIONS = {"": None, ".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+def write_files(tmp: str):
+    lines = []
+    for i in range(SIZE):
+        price = "1" if i % 100 == 0 else 1.5
+        record = {"id": i, "name": "item", "price": price, "tags": ["a"]}
+        lines.append(json.dumps(record) + "\n")
+    data = "".join(lines).encode()
+    paths = {}
+    for extension, module in COMPRESSIONS.items():
+        path = os.path.join(tmp, "data.ndjson" + extension)
+        with open(path, "wb") as f:
+            f.write(data if module is None else module.compress(data))
+        paths[extension] = path
+    return paths
+
+
+def inline(path: str):
+    with open_source(path) as f:
+        for _ in check_lines(Checker(SCHEMA), iter_lines(f), Summary()):
+            pass
+
+
+def prefetched(path: str) -> Summary:
+    validation = validate_ndjson(path, SCHEMA)
+    for _ in validation:
+        pass
+    return validation.summary
+
+
+def run(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension, path in write_files(tmp).items():
+            before, _ = run(inline, path)
+            after, summary = run(prefetched, path)
+            read = summary.stages["read"]
+            validate = summary.stages["validate"]
+            rows.append(
+                [
+                    extension or "none",
+                    "%.1f MB" % (os.path.getsize(path) / 1024 / 1024),
+                    before,
+                    after,
+                    "%.1f MB/s" % read.mb_per_second,
+                    "%.0f" % read.records_per_second,
+                    "%.1f MB/s" % validate.mb_per_second,
+                    "%.0f" % validate.records_per_second,
+                ]
+            )
+    print_table(
+        [
+            "compression",
+            "file",
+            "inline",
+            "prefetched",
+            "read",
+            "read records/s",
+            "validate",
+            "validate records/s",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Validation with time budget: Checker.validate without deadline against
+validate of a checker with budget which is not exceeded (cost of checks
+of time) and with budget of 5 ms which stops validation of big payload.
+
+    $ python benchmarks/bench_deadline.py
+"""
+
+from common import expect_error, measure, print_table
+
+from json_checker import Checker
+
+SIZES = (1000, 10000, 100000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item %s" % i, "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    plain = Checker(SCHEMA)
+    unlimited = Checker(SCHEMA, budget_ms=60000)
+    limited = expect_error(Checker(SCHEMA, budget_ms=5).validate)
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(plain.validate, data)
+        timed = measure(unlimited.validate, data)
+        stopped = measure(limited, data)
+        rows.append(
+            [
+                size,
+                full,
+                timed,
+                "%.1f%%" % (100.0 * (timed - full) / full),
+                stopped,
+            ]
+        )
+    print_table(
+        ["items", "validate", "budget 60 s", "cost", "budget 5 ms"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
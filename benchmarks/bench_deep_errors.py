@@ -0,0 +1,61 @@
+"""
+Errors of deep invalid payloads are kept as records with paths,
+messages are rendered once on demand instead of being joined
+on every level of nesting.
+
+    $ python benchmarks/bench_deep_errors.py
+"""
+
+from common import measure, print_table
+
+from json_checker.core.checkers import Validator
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+DEPTHS = (25, 50, 100, 200)
+
+
+def make_schema(depth: int) -> dict:
+    schema = {"value": int}
+    for _ in range(depth):
+        schema = {"next": schema, "value": int}
+    return schema
+
+
+def make_data(depth: int) -> dict:
+    data = {"value": "x"}
+    for _ in range(depth):
+        data = {"next": data, "value": "x"}
+    return data
+
+
+def interpretive(schema, data):
+    Validator(schema, Report(soft=True)).validate(data)
+
+
+def records(node, data):
+    node.validate(data, Report(soft=True))
+
+
+def rendered(node, data):
+    report = Report(soft=True)
+    node.validate(data, report)
+    str(report)
+
+
+def main():
+    rows = []
+    for depth in DEPTHS:
+        schema, data = make_schema(depth), make_data(depth)
+        node = compile_schema(schema)
+        before = measure(interpretive, schema, data)
+        after = measure(records, node, data)
+        with_message = measure(rendered, node, data)
+        rows.append([depth, before, after, with_message])
+    print_table(
+        ["depth", "interpretive", "records", "records + message"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Latency of hard validation of invalid payloads,
+with fail_fast validation stops on the first error
+instead of collecting errors of whole subtree.
+
+    $ python benchmarks/bench_fail_fast.py
+"""
+
+from common import expect_error, measure, print_table
+
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+SIZES = (10, 1000, 100000)
+
+SCHEMA = {"id": int, "items": [{"id": int, "price": float}]}
+
+
+def make_data(size: int) -> dict:
+    return {
+        "id": 1,
+        "items": [{"id": str(i), "price": i} for i in range(size)],
+    }
+
+
+@expect_error
+def collect_all(node, data):
+    node.validate(data, Report(soft=False, fail_fast=False))
+
+
+@expect_error
+def fail_fast(node, data):
+    node.validate(data, Report(soft=False))
+
+
+def main():
+    node = compile_schema(SCHEMA)
+    rows = []
+    for size in SIZES:
+        data = make_data(size)
+        before = measure(collect_all, node, data)
+        after = measure(fail_fast, node, data)
+        rows.append([size, before, after, "%.1fx" % (before / after)])
+    print_table(["items", "collect all", "fail fast", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Boolean check of payloads by Checker.is_valid
+against Checker.validate wrapped by try/except,
+is_valid builds no report, messages and exceptions.
+
+    $ python benchmarks/bench_is_valid.py
+"""
+
+from common import measure, print_table
+
+from json_checker import Checker, CheckerError
+
+SCHEMA = {"id": int, "name": str, "items": [{"id": int, "price": float}]}
+
+PAYLOADS = {
+    "valid": {
+        "id": 1,
+        "name": "order",
+        "items": [{"id": i, "price": 1.5} for i in range(10)],
+    },
+    "invalid": {
+        "id": 1,
+        "name": "order",
+        "items": [{"id": str(i), "price": 1.5} for i in range(10)],
+    },
+}
+
+
+def validate(checker, data):
+    try:
+        checker.validate(data)
+    except CheckerError:
+        return False
+    return True
+
+
+def main():
+    rows = []
+    for soft in (False, True):
+        checker = Checker(SCHEMA, soft=soft)
+        for name, data in PAYLOADS.items():
+            before = measure(validate, checker, data)
+            after = measure(checker.is_valid, data)
+            rows.append(
+                [
+                    "soft" if soft else "hard",
+                    name,
+                    before,
+                    after,
+                    "%.1fx" % (before / after),
+                ]
+            )
+    print_table(["mode", "payload", "validate", "is_valid", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Validation of huge JSON array document by validate_json_array
+against json.load of whole document and Checker.validate,
+peak memory depends on size of items, not on size of document.
+
+    $ python benchmarks/bench_json_array.py
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import print_table
+
+from json_checker import Checker, CheckerError, validate_json_array
+
+SIZES = (10000, 200000)
+
+SCHEMA = {"id": int, "name": str, "price": float, "tags": [str]}
+
+
+def write_file(path: str, size: int):
+    with open(path, "w") as f:
+        f.write('{"meta": {"count": %d}, "data": [' % size)
+        for i in range(size):
+            if i:
+                f.write(", ")
+            price = "1" if i % 100 == 0 else 1.5
+            record = {"id": i, "name": "item", "price": price, "tags": ["a"]}
+            f.write(json.dumps(record))
+        f.write("]}")
+
+
+def load_and_validate(path: str):
+    with open(path, "rb") as f:
+        data = json.load(f)
+    try:
+        Checker([SCHEMA], soft=True).validate(data["data"])
+    except CheckerError:
+        pass
+
+
+def stream(path: str):
+    for _ in validate_json_array(path, Checker(SCHEMA, soft=True), "/data"):
+        pass
+
+
+def run(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_size(size: int) -> str:
+    return "%.1f KiB" % (size / 1024)
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, "%d.json" % size)
+            write_file(path, size)
+            rows.append(
+                [
+                    size,
+                    "%.1f MB" % (os.path.getsize(path) / 1024 / 1024),
+                    run(load_and_validate, path),
+                    format_size(peak_memory(load_and_validate, path)),
+                    run(stream, path),
+                    format_size(peak_memory(stream, path)),
+                ]
+            )
+    print_table(
+        [
+            "items",
+            "file",
+            "load+validate",
+            "peak memory",
+            "validate_json_array",
+            "peak memory",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Validation of big payloads when only a few fields are read:
+Checker.validate of the whole payload against Checker.lazy with access
+of a few fields, and lazy access of every field with finalize.
+
+    $ python benchmarks/bench_lazy.py
+"""
+
+from common import measure, print_table
+
+from json_checker import Checker
+
+SIZES = (100, 1000, 10000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item", "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def read_fields(response):
+    return (
+        response["id"],
+        response["user"]["id"],
+        response["items"][0]["price"],
+    )
+
+
+def validate_and_read(checker, data):
+    return read_fields(checker.validate(data))
+
+
+def lazy_read(checker, data):
+    return read_fields(checker.lazy(data))
+
+
+def lazy_finalize(checker, data):
+    response = checker.lazy(data)
+    read_fields(response)
+    return response.finalize()
+
+
+def main():
+    checker = Checker(SCHEMA)
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(validate_and_read, checker, data)
+        partial = measure(lazy_read, checker, data)
+        finalized = measure(lazy_finalize, checker, data)
+        rows.append(
+            [
+                size,
+                full,
+                partial,
+                "%.1fx" % (full / partial),
+                finalized,
+                "%.1fx" % (finalized / full),
+            ]
+        )
+    print_table(
+        [
+            "items",
+            "validate",
+            "lazy 3 fields",
+            "speedup",
+            "lazy+finalize",
+            "finalize cost",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
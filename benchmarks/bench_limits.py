@@ -0,0 +1,64 @@
+"""
+Limits of untrusted payloads: Checker.validate without limits against
+validate with limits which are not exceeded (cost of checks) and
+rejection of payload with too long list of items by max_length.
+
+    $ python benchmarks/bench_limits.py
+"""
+
+from common import expect_error, measure, print_table
+
+from json_checker import Checker, LimitCheckerError, Limits
+
+SIZES = (1000, 10000, 100000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+LIMITS = Limits(max_depth=8, max_nodes=10**7, max_length=10**6, max_string=64)
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item %s" % i, "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    plain = Checker(SCHEMA)
+    limited = Checker(SCHEMA, limits=LIMITS)
+    rejecting = expect_error(
+        Checker(SCHEMA, limits=Limits(max_length=100)).validate,
+        LimitCheckerError,
+    )
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(plain.validate, data)
+        checked = measure(limited.validate, data)
+        rejected = measure(rejecting, data)
+        rows.append(
+            [
+                size,
+                full,
+                checked,
+                "%.1f%%" % (100.0 * (checked - full) / full),
+                rejected,
+                "%.1fx" % (full / rejected),
+            ]
+        )
+    print_table(
+        ["items", "validate", "limits", "cost", "rejected", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
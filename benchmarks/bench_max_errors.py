@@ -0,0 +1,64 @@
+"""
+Soft validation of invalid bulk payloads with and without max_errors,
+validation stops after max_errors and report keeps only them.
+
+    $ python benchmarks/bench_max_errors.py
+"""
+
+import time
+import tracemalloc
+
+from common import print_table
+
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+SIZES = (1000, 100000, 1000000)
+
+MAX_ERRORS = 100
+
+
+def run(node, data, max_errors):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        node.validate(data, Report(soft=True, max_errors=max_errors))
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_size(size: int) -> str:
+    return "%.1f KiB" % (size / 1024)
+
+
+def main():
+    node = compile_schema({"items": [{"id": int}]})
+    rows = []
+    for size in SIZES:
+        data = {"items": [{"id": str(i)} for i in range(size)]}
+        before, before_memory = run(node, data, None)
+        after, after_memory = run(node, data, MAX_ERRORS)
+        rows.append(
+            [
+                size,
+                before,
+                format_size(before_memory),
+                after,
+                format_size(after_memory),
+            ]
+        )
+    print_table(
+        [
+            "items",
+            "all errors",
+            "peak memory",
+            "max_errors=%d" % MAX_ERRORS,
+            "peak memory",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Validation of newline-delimited JSON file by validate_ndjson
+against json.loads of every line and Checker.validate,
+peak memory doesn't depend on size of file.
+
+    $ python benchmarks/bench_ndjson.py
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import print_table
+
+from json_checker import Checker, CheckerError, validate_ndjson
+
+SIZES = (10000, 200000)
+
+SCHEMA = {"id": int, "name": str, "price": float, "tags": [str]}
+
+
+def write_file(path: str, size: int):
+    with open(path, "w") as f:
+        for i in range(size):
+            price = "1" if i % 100 == 0 else 1.5
+            record = {"id": i, "name": "item", "price": price, "tags": ["a"]}
+            f.write(json.dumps(record) + "\n")
+
+
+def loads_and_validate(path: str):
+    checker = Checker(SCHEMA)
+    failures = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                checker.validate(json.loads(line))
+            except CheckerError:
+                failures += 1
+    return failures
+
+
+def ndjson(path: str, workers: int = 1):
+    return sum(1 for _ in validate_ndjson(path, SCHEMA, workers=workers))
+
+
+def run(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def format_size(size: int) -> str:
+    return "%.1f KiB" % (size / 1024)
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, "%d.ndjson" % size)
+            write_file(path, size)
+            megabytes = os.path.getsize(path) / 1024 / 1024
+            before = run(loads_and_validate, path)
+            after = run(ndjson, path)
+            parallel = run(ndjson, path, 4)
+            rows.append(
+                [
+                    size,
+                    "%.1f MB" % megabytes,
+                    before,
+                    after,
+                    format_size(peak_memory(ndjson, path)),
+                    "%.1f MB/s" % (megabytes / after),
+                    parallel,
+                ]
+            )
+    print_table(
+        [
+            "records",
+            "file",
+            "loads+validate",
+            "validate_ndjson",
+            "peak memory",
+            "throughput",
+            "4 workers",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Validation time of nested payloads must grow linearly with their size,
+types based subtrees are not compared with current data by equality.
+
+    $ python benchmarks/bench_nested.py
+"""
+
+from common import measure, print_table
+
+from json_checker.core.checkers import Validator
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+DEPTHS = (10, 50, 100, 200)
+
+
+def make_schema(depth: int) -> dict:
+    schema = {"value": int}
+    for _ in range(depth):
+        schema = {"next": schema, "items": [int], "value": int}
+    return schema
+
+
+def make_data(depth: int) -> dict:
+    data = {"value": 1}
+    for _ in range(depth):
+        data = {"next": data, "items": [1, 2, 3], "value": 1}
+    return data
+
+
+def interpretive(schema, data):
+    Validator(schema, Report(soft=False)).validate(data)
+
+
+def compiled(node, data):
+    node.validate(data, Report(soft=False))
+
+
+def main():
+    rows = []
+    for depth in DEPTHS:
+        schema, data = make_schema(depth), make_data(depth)
+        node = compile_schema(schema)
+        before = measure(interpretive, schema, data)
+        after = measure(compiled, node, data)
+        rows.append([depth, before, before / depth, after, after / depth])
+    print_table(
+        ["depth", "interpretive", "per level", "compiled", "per level"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
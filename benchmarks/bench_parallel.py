@@ -0,0 +1,73 @@
+"""
+Scaling of Checker.validate_many by count of worker processes,
+records are validated by chunks of adaptive size.
+
+    $ python benchmarks/bench_parallel.py
+"""
+
+import time
+
+from common import print_table
+
+from json_checker import And, Checker, Or, register
+
+SIZE = 200000
+
+WORKERS = (1, 2, 4, 8)
+
+positive = register(lambda x: x > 0, name="benchmarks.positive")
+
+SCHEMA = {
+    "id": And(int, positive),
+    "name": str,
+    "price": Or(float, None),
+    "tags": [str],
+    "owner": {"id": int, "email": str},
+}
+
+
+def make_records(size: int):
+    for i in range(size):
+        yield {
+            "id": i + 1,
+            "name": "record %d" % i,
+            "price": "1" if i % 10 == 0 else 1.5,
+            "tags": ["a", "b", "c"],
+            "owner": {"id": i, "email": "user@example.com"},
+        }
+
+
+def run(checker, workers, ordered):
+    start = time.perf_counter()
+    for _ in checker.validate_many(
+        make_records(SIZE), workers=workers, ordered=ordered
+    ):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    checker = Checker(SCHEMA, soft=True)
+    rows = []
+    base = None
+    for workers in WORKERS:
+        ordered = run(checker, workers, True)
+        unordered = run(checker, workers, False)
+        if base is None:
+            base = ordered
+        rows.append(
+            [
+                workers,
+                ordered,
+                unordered,
+                "%.0f" % (SIZE / ordered),
+                "%.1fx" % (base / ordered),
+            ]
+        )
+    print_table(
+        ["workers", "ordered", "unordered", "records/s", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Validation of one huge top level list by parts between workers:
+threads on free-threaded python builds, processes otherwise.
+
+    $ python benchmarks/bench_parallel_document.py
+"""
+
+import time
+
+from common import print_table
+
+from json_checker import Checker, CheckerError
+from json_checker.core.parallel import free_threading
+
+SIZE = 500000
+
+WORKERS = (1, 2, 4, 8)
+
+SCHEMA = [{"id": int, "name": str, "price": float, "tags": [str]}]
+
+
+def make_data(size: int) -> list:
+    return [
+        {"id": i, "name": "item", "price": 1.5, "tags": ["a", "b"]}
+        for i in range(size)
+    ]
+
+
+def run(checker, data):
+    start = time.perf_counter()
+    try:
+        checker.validate(data)
+    except CheckerError:
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    data = make_data(SIZE)
+    invalid = data[:]
+    invalid[-1] = {"id": "1", "name": "item", "price": 1.5, "tags": []}
+    rows = []
+    base = None
+    for workers in WORKERS:
+        with Checker(SCHEMA, soft=True, workers=workers) as checker:
+            # workers are started by the first document and kept
+            run(checker, data)
+            valid_time = run(checker, data)
+            invalid_time = run(checker, invalid)
+        if base is None:
+            base = valid_time
+        rows.append(
+            [workers, valid_time, invalid_time, "%.1fx" % (base / valid_time)]
+        )
+    print("workers are %s" % ("threads" if free_threading() else "processes"))
+    print_table(["workers", "valid", "invalid", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Validation of selected paths of big payloads:
+Checker.validate of the whole payload against validate with `only`
+of a few fields and of one field of every item.
+
+    $ python benchmarks/bench_partial.py
+"""
+
+from common import measure, print_table
+
+from json_checker import Checker
+
+SIZES = (100, 1000, 10000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+FIELDS = ["id", "user.id", "items[0].price"]
+
+PRICES = ["items[*].price"]
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item", "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    checker = Checker(SCHEMA)
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(checker.validate, data)
+        fields = measure(checker.validate, data, FIELDS)
+        prices = measure(checker.validate, data, PRICES)
+        rows.append(
+            [
+                size,
+                full,
+                fields,
+                "%.1fx" % (full / fields),
+                prices,
+                "%.1fx" % (full / prices),
+            ]
+        )
+    print_table(
+        [
+            "items",
+            "validate",
+            "3 fields",
+            "speedup",
+            "items[*].price",
+            "speedup",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Validation of big documents changed by small JSON Patches:
+Checker.validate of the whole patched document against
+Checker.revalidate of changed paths only.
+
+    $ python benchmarks/bench_patch.py
+"""
+
+from itertools import count
+
+from common import measure, print_table
+
+from json_checker import Checker
+from json_checker.core.patch import Changes, apply_patch
+
+SIZES = (100, 1000, 10000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+
+def document(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item", "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def operations(size: int, counter=count()):
+    index = next(counter) % size
+    return [
+        {"op": "replace", "path": "/items/%s/price" % index, "value": 2.5},
+        {"op": "add", "path": "/items/%s/tags/-" % index, "value": "c"},
+        {"op": "remove", "path": "/items/%s/tags/2" % index},
+    ]
+
+
+def patch_and_validate(checker, data):
+    patch = operations(len(data["items"]))
+    return checker.validate(apply_patch(data, patch, Changes([])))
+
+
+def revalidate(checker, data):
+    return checker.revalidate(data, operations(len(data["items"])), data)
+
+
+def main():
+    checker = Checker(SCHEMA, soft=True)
+    rows = []
+    for size in SIZES:
+        data = document(size)
+        full = measure(patch_and_validate, checker, data)
+        incremental = measure(revalidate, checker, data)
+        rows.append([size, full, incremental, "%.1fx" % (full / incremental)])
+    print_table(["items", "validate", "revalidate", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Peak memory of validation of invalid huge payloads,
+values into messages are cut by `repr_limits`
+and rendered only when message is read.
+
+    $ python benchmarks/bench_repr_memory.py
+"""
+
+import sys
+import tracemalloc
+
+from common import print_table
+
+from json_checker.core.base import repr_limits
+from json_checker.core.checkers import Validator
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+SIZES = (1000, 100000, 1048576)
+
+SCHEMA = {"id": int, "items": int, "tags": int}
+
+UNBOUNDED = ("max_length", "max_depth", "max_items")
+
+
+def make_data(size: int) -> dict:
+    return {
+        "id": "1",
+        "items": list(range(size)),
+        "tags": {str(i): i for i in range(size // 10)},
+    }
+
+
+def peak_memory(func, *args) -> int:
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def unbounded(schema, data):
+    """Eager messages with full repr of values"""
+    saved = {name: getattr(repr_limits, name) for name in UNBOUNDED}
+    for name in UNBOUNDED:
+        setattr(repr_limits, name, sys.maxsize)
+    try:
+        report = Report(soft=True)
+        Validator(schema, report).validate(data)
+        return str(report)
+    finally:
+        for name, value in saved.items():
+            setattr(repr_limits, name, value)
+
+
+def records(node, data):
+    node.validate(data, Report(soft=True))
+
+
+def rendered(node, data):
+    report = Report(soft=True)
+    node.validate(data, report)
+    return str(report)
+
+
+def format_size(size: int) -> str:
+    return "%.1f KiB" % (size / 1024)
+
+
+def main():
+    node = compile_schema(SCHEMA)
+    rows = []
+    for size in SIZES:
+        data = make_data(size)
+        rows.append(
+            [
+                size,
+                format_size(peak_memory(unbounded, SCHEMA, data)),
+                format_size(peak_memory(records, node, data)),
+                format_size(peak_memory(rendered, node, data)),
+            ]
+        )
+    print_table(["items", "full repr", "records", "records + message"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Shadow validation of big responses: Checker.validate of every item
+against validation of every 10th item, of 1% random items and of
+the first 10 plus 10 random items.
+
+    $ python benchmarks/bench_sampling.py
+"""
+
+from common import measure, print_table
+
+from json_checker import Checker, Sample
+
+SIZES = (1000, 10000, 100000)
+
+SCHEMA = {
+    "id": int,
+    "user": {"id": int, "name": str},
+    "items": [{"id": int, "name": str, "price": float, "tags": [str]}],
+}
+
+SAMPLES = (
+    ("every 10", lambda: Sample(every=10)),
+    ("fraction 0.01", lambda: Sample(fraction=0.01, seed=1)),
+    ("first+random 10", lambda: Sample(first=10, random=10, seed=1)),
+)
+
+
+def payload(size: int) -> dict:
+    return {
+        "id": 1,
+        "user": {"id": 2, "name": "user"},
+        "items": [
+            {"id": i, "name": "item %s" % i, "price": 1.5, "tags": ["a", "b"]}
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    plain = Checker(SCHEMA)
+    checkers = [
+        Checker(SCHEMA, sample={"items": sample()}) for _, sample in SAMPLES
+    ]
+    rows = []
+    for size in SIZES:
+        data = payload(size)
+        full = measure(plain.validate, data)
+        row = [size, full]
+        for checker in checkers:
+            sampled = measure(checker.validate, data)
+            row.extend([sampled, "%.1fx" % (full / sampled)])
+        rows.append(row)
+    headers = ["items", "validate"]
+    for name, _ in SAMPLES:
+        headers.extend([name, "speedup"])
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
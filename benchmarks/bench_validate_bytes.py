@@ -0,0 +1,68 @@
+"""
+Decoding and validation of JSON payloads by Checker.validate_bytes
+against json.loads then Checker.validate. Hard checker decodes items
+of top level list one by one and stops decoding on the first invalid item,
+soft checker validates decoded data in both cases.
+
+    $ python benchmarks/bench_validate_bytes.py
+"""
+
+import json
+
+from common import expect_error, measure, print_table
+
+from json_checker import Checker, CheckerError
+
+SCHEMA = [{"id": int, "name": str, "tags": [str], "price": float}]
+
+COUNT = 10000
+
+
+def payload(invalid_index=None):
+    items = [
+        {"id": i, "name": "item %s" % i, "tags": ["a", "b"], "price": 1.5}
+        for i in range(COUNT)
+    ]
+    if invalid_index is not None:
+        items[invalid_index]["price"] = "1.5"
+    return json.dumps(items).encode()
+
+
+PAYLOADS = {
+    "valid": payload(),
+    "invalid first": payload(0),
+    "invalid middle": payload(COUNT // 2),
+    "invalid last": payload(COUNT - 1),
+}
+
+
+def loads_validate(checker, data):
+    return checker.validate(json.loads(data))
+
+
+def main():
+    rows = []
+    for soft in (False, True):
+        checker = Checker(SCHEMA, soft=soft)
+        before_func = expect_error(loads_validate, CheckerError)
+        after_func = expect_error(checker.validate_bytes, CheckerError)
+        for name, data in PAYLOADS.items():
+            before = measure(before_func, checker, data, repeat=3)
+            after = measure(after_func, data, repeat=3)
+            rows.append(
+                [
+                    "soft" if soft else "hard",
+                    name,
+                    before,
+                    after,
+                    "%.1fx" % (before / after),
+                ]
+            )
+    print_table(
+        ["mode", "payload", "loads+validate", "validate_bytes", "speedup"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Validation of stream of records by Checker.validate_many
+against Checker.validate wrapped by try/except per record,
+every tenth record is invalid.
+
+    $ python benchmarks/bench_validate_many.py
+"""
+
+import time
+
+from common import print_table
+
+from json_checker import Checker, CheckerError
+
+SIZES = (1000, 100000)
+
+SCHEMA = {"id": int, "name": str, "price": float}
+
+
+def make_records(size: int):
+    for i in range(size):
+        price = "1" if i % 10 == 0 else 1.5
+        yield {"id": i, "name": "record", "price": price}
+
+
+def validate_each(checker, records):
+    failures = 0
+    for data in records:
+        try:
+            checker.validate(data)
+        except CheckerError:
+            failures += 1
+    return failures
+
+
+def validate_many(checker, records):
+    failures = 0
+    for _ in checker.validate_many(records, only_failures=True):
+        failures += 1
+    return failures
+
+
+def run(func, checker, size):
+    start = time.perf_counter()
+    func(checker, make_records(size))
+    return time.perf_counter() - start
+
+
+def main():
+    rows = []
+    for soft in (False, True):
+        checker = Checker(SCHEMA, soft=soft)
+        for size in SIZES:
+            before = run(validate_each, checker, size)
+            after = run(validate_many, checker, size)
+            rows.append(
+                [
+                    "soft" if soft else "hard",
+                    size,
+                    before,
+                    after,
+                    "%.1fx" % (before / after),
+                ]
+            )
+    print_table(
+        ["mode", "records", "validate", "validate_many", "speedup"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Validation time of wide dicts must grow linearly with number of keys.
+
+    $ python benchmarks/bench_wide_dict.py
+"""
+
+from common import measure, print_table
+
+from json_checker import OptionalKey
+from json_checker.core.checkers import Validator
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import Report
+
+SIZES = (10, 1000, 100000)
+
+
+def interpretive(schema, data, ignore_extra_keys):
+    report = Report(soft=False)
+    Validator(schema, report, ignore_extra_keys).validate(data)
+
+
+def compiled(node, data):
+    node.validate(data, Report(soft=False))
+
+
+def bench(title, schemas, ignore_extra_keys):
+    rows = []
+    for size, schema, data in schemas:
+        node = compile_schema(schema, ignore_extra_keys)
+        before = measure(interpretive, schema, data, ignore_extra_keys)
+        after = measure(compiled, node, data)
+        rows.append([size, before, after, after / size])
+    print(title)
+    print_table(["keys", "interpretive", "compiled", "compiled/key"], rows)
+
+
+def main():
+    full = []
+    sparse = []
+    for size in SIZES:
+        keys = ["key%d" % i for i in range(size)]
+        full.append([size, dict.fromkeys(keys, int), dict.fromkeys(keys, 1)])
+        schema = {OptionalKey(k): int for k in keys}
+        sparse.append([size, schema, dict.fromkeys(keys[:10], 1)])
+    bench("all keys are present", full, ignore_extra_keys=False)
+    bench("10 of optional keys are present", sparse, ignore_extra_keys=True)
+
+
+if __name__ == "__main__":
+    main()
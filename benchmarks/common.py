@@ -0,0 +1,66 @@
+"""
+Helpers shared by benchmark scripts.
+
+Run any benchmark from the repository root with installed package:
+
+    $ pip install -e .
+    $ python benchmarks/bench_compile.py
+"""
+
+import timeit
+from typing import Any, Callable, Iterable, Sequence
+
+
+def measure(func: Callable, *args: Any, number: int = 0, repeat: int = 5):
+    """
+    Best time of one call in seconds
+    :param callable func:
+    :param any args: arguments of func
+    :param int number: calls per repeat, autorange when 0
+    :param int repeat:
+    :return: float
+    """
+    timer = timeit.Timer(lambda: func(*args))
+    if not number:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def expect_error(func: Callable, exception: type = Exception) -> Callable:
+    """Wrap func to swallow expected exception of invalid payloads"""
+
+    def wrapper(*args):
+        try:
+            func(*args)
+        except exception:
+            pass
+
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def print_table(header: Sequence[str], rows: Iterable[Sequence[Any]]):
+    rows = [[format_cell(c) for c in row] for row in rows]
+    header = list(header)
+    widths = [
+        max([len(header[i])] + [len(row[i]) for row in rows])
+        for i in range(len(header))
+    ]
+    line = "  ".join("%%-%ds" % w for w in widths)
+    print(line % tuple(header))
+    print(line % tuple("-" * w for w in widths))
+    for row in rows:
+        print(line % tuple(row))
+    print()
+
+
+def format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        if value < 1e-6:
+            return "%.1f ns" % (value * 1e9)
+        if value < 1e-3:
+            return "%.2f us" % (value * 1e6)
+        if value < 1:
+            return "%.2f ms" % (value * 1e3)
+        return "%.2f s" % value
+    return str(value)
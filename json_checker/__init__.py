@@ -1,24 +1,36 @@
 from json_checker.app import Checker
+from json_checker.core.cache import ValidationCache
 from json_checker.core.checkers import And, Or, OptionalKey
+from json_checker.core.limits import Limits
+from json_checker.core.registry import register
+from json_checker.core.sampling import Sample
 from json_checker.core.exceptions import (
     CheckerError,
     DictCheckerError,
     FunctionCheckerError,
+    LimitCheckerError,
     ListCheckerError,
     MissKeyCheckerError,
     TypeCheckerError,
 )
-
+from json_checker.files import validate_json_array, validate_ndjson
 
 __all__ = [
     "Checker",
     "And",
     "Or",
     "OptionalKey",
+    "register",
+    "ValidationCache",
+    "Sample",
+    "Limits",
+    "validate_json_array",
+    "validate_ndjson",
     "CheckerError",
     "FunctionCheckerError",
     "TypeCheckerError",
     "ListCheckerError",
     "DictCheckerError",
     "MissKeyCheckerError",
+    "LimitCheckerError",
 ]
@@ -1,29 +1,769 @@
+import json
 import logging
+import time
 
-from typing import Any
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from json_checker.core import (
+    deadlines,
+    decoder,
+    lazy,
+    parallel,
+    patch,
+    paths,
+    sampling,
+)
+from json_checker.core.cache import ValidationCache, cached_plan
 from json_checker.core.base import Base
-from json_checker.core.exceptions import CheckerError
-from json_checker.core.checkers import Validator
-from json_checker.core.reports import Report
+from json_checker.core.codegen import GeneratedNode, load_plan
+from json_checker.core.compiler import Node, compile_schema
+from json_checker.core.limits import Limits, limited_plan
+from json_checker.core.exceptions import CheckerError, LimitCheckerError
+from json_checker.core.errors import iter_records
+from json_checker.core.reports import AggregatedReport, Report
+from json_checker.core.sampling import Sample
 
 
 log = logging.getLogger(__name__)
 
+# documents are validated by workers when they have so many items
+PARALLEL_THRESHOLD = 100000
+
+
+def check_cache(cache: Optional[ValidationCache], **options: Any) -> None:
+    """
+    Cached subtrees are skipped wholly, so they can't be sampled, timed
+    or counted by limits
+    :raises ValueError: cache is set with some of options
+    """
+    if cache is None:
+        return
+    names = sorted(
+        name for name, value in options.items() if value is not None
+    )
+    if names:
+        raise ValueError("cache can't be used with %s" % ", ".join(names))
+
 
 class Checker(Base):
-    def validate(self, data: Any) -> Any:
+    def __init__(
+        self,
+        expected_data: Any,
+        soft: bool = False,
+        ignore_extra_keys: bool = False,
+        max_errors: Optional[int] = None,
+        aggregate: bool = False,
+        workers: int = 1,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        cache: Optional[ValidationCache] = None,
+        sample: Optional[Union[Sample, Dict[str, Sample]]] = None,
+        budget_ms: Optional[float] = None,
+        limits: Optional[Limits] = None,
+    ):
+        """
+        :param any expected_data:
+        :param bool soft: False by default
+        :param bool ignore_extra_keys:
+        :param int max_errors: soft validation stops after so many errors,
+            report of CheckerError tells how many items were skipped,
+            ValueError is raised for values below 1
+        :param bool aggregate: soft report groups errors by path template
+            and kind, e.g. "items[*].price: 1000 type errors like ..."
+        :param int workers: huge top level list or dict is validated
+            by parts between threads on free-threaded python builds
+            and between processes otherwise, processes are kept
+            until close() and get parts only when pickling them
+            costs less than validation of them here
+        :param int parallel_threshold: count of items of top level list
+            (or of items of values of dict) which is validated by workers
+        :param ValidationCache cache: dicts and lists which were valid
+            are not validated again by validate, is_valid and
+            validate_many, it's faster for unchanged documents only,
+            documents validated by workers or with
+            deadline of validate don't use it. ValueError is raised
+            for cache with sample, budget_ms or limits
+        :param sample: only sampled items of lists are validated,
+            Sample of every list or dict of paths of lists to samples
+            like {"items": Sample(every=10), "items[*].tags": ...},
+            keys of dicts are checked wholly by validate, is_valid
+            and validate_many
+        :param float budget_ms: validate stops after so many milliseconds,
+            report of CheckerError is marked as expired with path of value
+            where validation was stopped
+        :param Limits limits: depth, count of values, lengths of lists
+            and of strings, data over them is rejected by LimitCheckerError
+            before its items are validated
+        """
+        # workers of huge documents, they are started by the first one
+        self._document_workers: Optional[parallel.DocumentWorkers] = None
+        # options of the last compile, workers compile plan by them
+        self._generate = False
+        self._cache_dir: Optional[str] = None
+        # cache is set the last, other options are checked against it
+        self._cache: Optional[ValidationCache] = None
+        super(Checker, self).__init__(
+            expected_data=expected_data,
+            soft=soft,
+            ignore_extra_keys=ignore_extra_keys,
+        )
+        self.max_errors = max_errors
+        self.aggregate = aggregate
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.sample = sample
+        self.budget_ms = budget_ms
+        self.limits = limits
+        self.cache = cache
+
+    def reset_plans(self) -> None:
+        """
+        Compiled plan and its copies are made again on the next call,
+        workers of documents are stopped with plan of old schema
+        """
+        self.close()
+        self._plan: Optional[Node] = None
+        self._cached_plan: Optional[Tuple[Node, Node]] = None
+        self._sampled_plan: Optional[Tuple[Node, Node]] = None
+        self._timed_plan: Optional[Tuple[Node, Node]] = None
+        self._limited_plan: Optional[Tuple[Node, Node]] = None
+
+    # plans depend on these attributes, they are made again
+    # when attributes are changed
+
+    @property
+    def expected_data(self) -> Any:
+        return self._expected_data
+
+    @expected_data.setter
+    def expected_data(self, expected_data: Any):
+        self._expected_data = expected_data
+        self.reset_plans()
+
+    @property
+    def ignore_extra_keys(self) -> bool:
+        return self._ignore_extra_keys
+
+    @ignore_extra_keys.setter
+    def ignore_extra_keys(self, ignore_extra_keys: bool):
+        self._ignore_extra_keys = ignore_extra_keys
+        self.reset_plans()
+
+    @property
+    def cache(self) -> Optional[ValidationCache]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Optional[ValidationCache]):
+        check_cache(
+            cache,
+            sample=self.sample,
+            budget_ms=self.budget_ms,
+            limits=self.limits,
+        )
+        self._cache = cache
+        self.reset_plans()
+
+    @property
+    def sample(self) -> Optional[Union[Sample, Dict[str, Sample]]]:
+        return self._sample
+
+    @sample.setter
+    def sample(self, sample: Optional[Union[Sample, Dict[str, Sample]]]):
+        check_cache(self.cache, sample=sample)
+        self._sample_paths = (
+            None if sample is None else sampling.sample_paths(sample)
+        )
+        self._sample = sample
+        self.reset_plans()
+
+    @property
+    def limits(self) -> Optional[Limits]:
+        return self._limits
+
+    @limits.setter
+    def limits(self, limits: Optional[Limits]):
+        check_cache(self.cache, limits=limits)
+        self._limits = limits
+        self.reset_plans()
+
+    @property
+    def max_errors(self) -> Optional[int]:
+        return self._max_errors
+
+    @max_errors.setter
+    def max_errors(self, max_errors: Optional[int]):
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(
+                "max_errors must be positive, got %r" % max_errors
+            )
+        self._max_errors = max_errors
+
+    @property
+    def budget_ms(self) -> Optional[float]:
+        return self._budget_ms
+
+    @budget_ms.setter
+    def budget_ms(self, budget_ms: Optional[float]):
+        check_cache(self.cache, budget_ms=budget_ms)
+        self._budget_ms = budget_ms
+
+    def __getstate__(self):
+        # plan is compiled again by processes which get the checker
+        # with options of compile, cache stays into this process
+        state = self.__dict__.copy()
+        state["_plan"] = None
+        state["_cached_plan"] = None
+        state["_sampled_plan"] = None
+        state["_timed_plan"] = None
+        state["_limited_plan"] = None
+        state["_cache"] = None
+        state["_document_workers"] = None
+        return state
+
+    def __enter__(self) -> "Checker":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stop workers of huge documents, they are kept between validations
+        and are started again by the next document which needs them
+        Examples:
+        >>> with Checker([{"id": int}], workers=4) as checker:
+        ...     checker.validate(huge_list)
+        ...     checker.validate(other_huge_list)  # by the same workers
+        """
+        if self._document_workers is not None:
+            self._document_workers.close()
+            self._document_workers = None
+
+    def document_workers(self) -> parallel.DocumentWorkers:
+        """Workers of huge documents, they are started once"""
+        if self._document_workers is None:
+            self._document_workers = parallel.DocumentWorkers(
+                self, self.workers
+            )
+        return self._document_workers
+
+    def compile(
+        self, generate: bool = False, cache_dir: Optional[str] = None
+    ) -> Node:
+        """
+        Compile expected schema to the validation plan,
+        validate compiles it on first call and reuses after that
+        Examples:
+        >>> checker = Checker({"id": int, "name": str})
+        >>> plan = checker.compile()
+        >>> checker.validate({"id": 1, "name": "#1"})
+
+        # generate python module once and import it in other processes
+        >>> checker.compile(generate=True, cache_dir="/tmp/json_checker")
+
+        Plan is dropped when `expected_data`, `ignore_extra_keys`,
+        `cache`, `sample` or `limits` are changed
+        :param bool generate: generate python code of plan
+        :param str cache_dir: directory of generated modules,
+            workers import the module from it instead of generating
+        :return: Node
+        """
+        self._generate = generate
+        self._cache_dir = cache_dir
+        if generate or cache_dir is not None:
+            self._plan = load_plan(
+                self.expected_data, self.ignore_extra_keys, cache_dir
+            )
+        else:
+            self._plan = compile_schema(
+                self.expected_data, self.ignore_extra_keys
+            )
+        return self._plan
+
+    def validate(
+        self,
+        data: Any,
+        only: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None,
+    ) -> Any:
+        """
+        Validate data, raises CheckerError with report of errors
+        Examples:
+        >>> checker = Checker({"user": {"id": int}, "items": [{"price": int}]})
+        >>> checker.validate(data)
+
+        # only "user.id" and prices of items, other keys are skipped
+        >>> checker.validate(data, only=["user.id", "items[*].price"])
+
+        # stops in 50 ms, CheckerError has incomplete report
+        >>> checker.validate(data, deadline=time.monotonic() + 0.05)
+
+        Paths are keys of dicts by dots and indexes of lists into brackets,
+        `[*]` is every item. Keys and items out of paths are skipped with
+        their extra keys, values at the end of paths are validated wholly.
+        Limits of checker are checked along selected paths too, paths
+        can't be used with deadline, `budget_ms` or `sample` of checker.
+        With deadline or `budget_ms` of checker time is checked
+        once per some visited values and every call of function.
+        With deadline or limits document is validated in this thread
+        without cache, LimitCheckerError is raised for data over limits
+        :param any data:
+        :param list only: paths of validated values, the whole data by default,
+            ValueError is raised for paths out of schema or with deadline
+            and sample, indexes out of lists are reported as missing keys
+        :param float deadline: time.monotonic() when validation stops,
+            the earliest of it and `budget_ms` is used
+        :return: data
+        """
+        if self.budget_ms is not None:
+            budget = time.monotonic() + self.budget_ms / 1000.0
+            deadline = budget if deadline is None else min(deadline, budget)
         log.debug(
-            "Checker settings: ignore_extra_keys=%s, soft=%s"
-            % (self.ignore_extra_keys, self.soft)
+            "Checker settings: ignore_extra_keys=%s, soft=%s",
+            self.ignore_extra_keys,
+            self.soft,
         )
-        report = Report(self.soft)
-        checker = Validator(
-            expected_data=self.expected_data,
-            report=report,
-            ignore_extra_keys=self.ignore_extra_keys,
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        report = self.create_report()
+        if only is not None:
+            if deadline is not None or self.sample is not None:
+                raise ValueError("deadline and sample can't be used with only")
+            tree = self.tree(plan)
+            selection = paths.select(only, tree)
+            if self.limits is not None:
+                self.validate_guarded(tree, data, report, None, selection)
+            else:
+                paths.validate_selected(tree, data, selection, report)
+        elif deadline is not None or self.limits is not None:
+            self.validate_guarded(plan, data, report, deadline)
+        elif self.sample is not None:
+            self.with_sample(plan).validate(data, report)
+        elif (
+            self.workers > 1
+            and parallel.document_size(plan, data) >= self.parallel_threshold
+        ):
+            parallel.validate_document(self, plan, data, report)
+        elif self.cache is not None:
+            self.with_cache(plan).validate(data, report)
+        else:
+            plan.validate(data, report)
+        if report.has_errors():
+            raise CheckerError(report)
+        return data
+
+    def validate_guarded(
+        self,
+        plan: Node,
+        data: Any,
+        report: Report,
+        deadline: Optional[float],
+        selection: paths.Selection = None,
+    ):
+        """
+        Validate data by plan with deadline and limits of checker,
+        errors are added to report
+        :param Node plan:
+        :param any data:
+        :param Report report:
+        :param float deadline: time.monotonic() when validation stops
+        :param dict selection: tree of selected paths by `paths.select`,
+            the whole data by default
+        :raises LimitCheckerError: data exceeds limits
+        """
+        if deadline is None:
+            guarded = self.with_limits(plan)
+        else:
+            guarded = self.with_deadline(plan)
+            deadlines.start(report, deadline)
+        try:
+            paths.validate_selected(guarded, data, selection, report)
+        except CheckerError as error:
+            if report.exceeded is None:
+                raise
+            raise LimitCheckerError(error.report)
+        if report.exceeded is not None:
+            raise LimitCheckerError(report)
+
+    def revalidate(
+        self,
+        document: Any,
+        operations: List[Dict[str, Any]],
+        previous_result: Any,
+    ) -> Any:
+        """
+        Apply JSON Patch (RFC 6902) to document in place and validate
+        only changed values: new and replaced values are validated,
+        dicts with added or removed keys check only their keys.
+        Errors of previous result for other paths are kept,
+        so cost depends on size of patch, not of document
+        Examples:
+        >>> checker = Checker({"items": [{"id": int}]}, soft=True)
+        >>> result = checker.validate(document)
+        >>> item = {"op": "add", "path": "/items/-", "value": {"id": 1}}
+        >>> result = checker.revalidate(document, [item], result)
+
+        >>> try:
+        ...     checker.revalidate(document, [item], result)
+        ... except CheckerError as e:
+        ...     result = e  # errors are kept for the next patch
+
+        Hard checker, aggregated and truncated reports have only a part of
+        errors, such documents are validated again wholly when they were
+        not valid, hard checker raises the first error of document
+        :param any document: previous document of dicts and lists
+        :param list operations: JSON Patch
+        :param any previous_result: document returned by previous validation
+            or CheckerError raised by it
+        :return: patched document
+        :raises ValueError: patch is not valid, document is not changed
+        """
+        previous = None
+        if not self.aggregate and self.max_errors is None:
+            if not isinstance(previous_result, CheckerError):
+                previous = Report(soft=self.soft)
+            elif (
+                type(previous_result.report) is Report
+                and not previous_result.report.fail_fast
+            ):
+                previous = previous_result.report
+
+        changes = patch.Changes([] if previous is None else previous.errors)
+        document = patch.apply_patch(document, operations, changes)
+        if previous is None:
+            return self.validate(document)
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        errors = patch.revalidate(self.tree(plan), document, changes)
+        if not errors:
+            return document
+        if not self.soft:
+            # the first error of document is raised as by validate
+            return self.validate(document)
+        report = self.create_report()
+        report.errors = errors
+        report.count = sum(1 for _ in iter_records(errors))
+        raise CheckerError(report)
+
+    def tree(self, plan: Node) -> Node:
+        """Tree of nodes of plan, generated plans are compiled again"""
+        if isinstance(plan, GeneratedNode):
+            return compile_schema(self.expected_data, self.ignore_extra_keys)
+        return plan
+
+    def is_valid(self, data: Any) -> bool:
+        """
+        Check data same as validate, but without report,
+        messages and exceptions, it stops on the first error
+        Examples:
+        >>> checker = Checker({"id": int})
+        >>> checker.is_valid({"id": 1})  # True
+        >>> checker.is_valid({"id": "1"})  # False
+
+        :param any data:
+        :return: bool
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        if self.limits is not None:
+            report = Report(soft=True, fail_fast=True)
+            return self.with_limits(plan).validate(data, report)
+        if self.sample is not None:
+            plan = self.with_sample(plan)
+        elif self.cache is not None:
+            plan = self.with_cache(plan)
+        return plan.is_valid(data)
+
+    def with_cache(self, plan: Node) -> Node:
+        """
+        Copy of plan which skips data found into cache of checker,
+        it's made once per compiled plan, checker without cache
+        returns plan as it is
+        :param Node plan:
+        :return: Node
+        """
+        cache = self.cache
+        if cache is None:
+            return plan
+        if self._cached_plan is not None and self._cached_plan[0] is plan:
+            return self._cached_plan[1]
+        cached, _ = cached_plan(self.tree(plan), cache)
+        self._cached_plan = (plan, cached)
+        return cached
+
+    def current_plan(self) -> Node:
+        """
+        Plan which validates data by report of checker: compiled or
+        generated one with sample and limits of checker, deadline needs
+        report started by validate. It's compiled on the first call
+        :return: Node
+        """
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        if self.limits is not None:
+            return self.with_limits(plan)
+        if self.sample is not None:
+            return self.with_sample(plan)
+        return plan
+
+    def with_sample(self, plan: Node) -> Node:
+        """
+        Copy of plan which validates sampled items of lists,
+        it's made once per compiled plan, checker without sample
+        returns plan as it is
+        :param Node plan:
+        :return: Node
+        """
+        sample_paths = self._sample_paths
+        if sample_paths is None:
+            return plan
+        if self._sampled_plan is not None and self._sampled_plan[0] is plan:
+            return self._sampled_plan[1]
+        sampled = sampling.sampled_plan(self.tree(plan), sample_paths)
+        self._sampled_plan = (plan, sampled)
+        return sampled
+
+    def with_deadline(self, plan: Node) -> Node:
+        """
+        Copy of plan which checks deadline of report,
+        it's made once per compiled plan
+        :param Node plan:
+        :return: Node
+        """
+        if self._timed_plan is not None and self._timed_plan[0] is plan:
+            return self._timed_plan[1]
+        if self.limits is not None:
+            timed = deadlines.timed_plan(self.with_limits(plan))
+        elif self.sample is not None:
+            timed = deadlines.timed_plan(self.with_sample(plan))
+        else:
+            timed = deadlines.timed_plan(self.tree(plan))
+        self._timed_plan = (plan, timed)
+        return timed
+
+    def with_limits(self, plan: Node) -> Node:
+        """
+        Copy of plan which checks limits of checker,
+        it's made once per compiled plan, checker without limits
+        returns plan as it is
+        :param Node plan:
+        :return: Node
+        """
+        limits = self.limits
+        if limits is None:
+            return plan
+        if self._limited_plan is not None and self._limited_plan[0] is plan:
+            return self._limited_plan[1]
+        if self.sample is not None:
+            limited = limited_plan(self.with_sample(plan), limits)
+        else:
+            limited = limited_plan(self.tree(plan), limits)
+        self._limited_plan = (plan, limited)
+        return limited
+
+    def lazy(self, data: Any) -> Any:
+        """
+        Read-only proxy of dict or list which validates values on the first
+        access and memoizes them, missing and extra keys of dicts are checked
+        when proxy is created. Hard checker raises errors on access, soft
+        checker collects them and `finalize` validates values which were
+        never accessed and raises all errors. Other data and data of checker
+        with `budget_ms`, limits, sample, aggregate or `max_errors` are
+        validated at once, so their errors are the same as of validate
+        Examples:
+        >>> checker = Checker({"id": int, "items": [{"price": float}]})
+        >>> response = checker.lazy(data)
+        >>> response["id"]  # only "id" is validated
+        >>> response["items"][0]["price"]  # only the first item is validated
+        >>> response.finalize()  # the rest is validated, data is returned
+
+        :param any data:
+        :return: LazyDict | LazyList | data
+        """
+        if (
+            self.budget_ms is not None
+            or self.limits is not None
+            or self.sample is not None
+            or self.aggregate
+            or self.max_errors is not None
+        ):
+            # proxies report errors in order of access, not of data
+            return self.validate(data)
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        proxy = lazy.wrap(plan, data, self.create_report())
+        if proxy is None:
+            return self.validate(data)
+        return proxy
+
+    def validate_str(self, text: str) -> Any:
+        """
+        Decode JSON text and validate it at once, hard checker decodes
+        values of top level list or dict one by one and stops decoding
+        on the first invalid value. Soft checker and checker with workers,
+        cache, sample, `budget_ms` or limits validate decoded data
+        as validate does
+        Examples:
+        >>> checker = Checker([{"id": int}])
+        >>> checker.validate_str('[{"id": 1}]')  # [{'id': 1}]
+        >>> checker.validate_str('[{"id": "1"}, {"id": 2}, ...]')
+        # ListCheckerError is raised, items after the first are not decoded
+
+        :param str text: JSON document
+        :return: decoded data
+        :raises JSONDecodeError: text is not valid JSON
+        """
+        if (
+            self.soft
+            or self.workers > 1
+            or self.cache is not None
+            or self.sample is not None
+            or self.budget_ms is not None
+            or self.limits is not None
+        ):
+            return self.validate(json.loads(text))
+        log.debug(
+            "Checker settings: ignore_extra_keys=%s, soft=%s",
+            self.ignore_extra_keys,
+            self.soft,
         )
-        checker.validate(data)
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        report = self.create_report()
+        data = decoder.decode(plan, text, report)
         if report.has_errors():
             raise CheckerError(report)
         return data
+
+    def validate_bytes(self, data: bytes) -> Any:
+        """
+        Same as validate_str, encoding is detected as by `json.loads`
+        :param bytes data: JSON document
+        :return: decoded data
+        """
+        return self.validate_str(
+            data.decode(json.detect_encoding(data), "surrogatepass")
+        )
+
+    def validate_many(
+        self,
+        items: Iterable[Any],
+        only_failures: bool = False,
+        only_valid: bool = False,
+        workers: int = 1,
+        ordered: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[Tuple[int, bool, Optional[Report]]]:
+        """
+        Validate items one by one, it never raises CheckerError.
+        Results are yielded lazily as (index, ok, report),
+        report is None for valid items, so unbounded iterators
+        are validated in constant memory
+        Examples:
+        >>> checker = Checker({"id": int})
+        >>> for index, ok, report in checker.validate_many(records):
+        ...     if not ok:
+        ...         print(index, report)
+
+        # only indexes of valid items, it works as is_valid
+        >>> list(checker.validate_many(records, only_valid=True))
+
+        # by 4 processes, results of chunks come as soon as they are ready
+        >>> checker.validate_many(records, workers=4, ordered=False)
+
+        Reports of hard checker have the first error only,
+        items over limits of checker fail with `report.exceeded` limit.
+        Every item has own `budget_ms` of checker, items which run out
+        of it fail with `report.expired`. Cache of checker is used
+        for items the same as by validate.
+        With workers checker is sent to processes once, they validate
+        without cache of this process. Functions of checker must be
+        registered by `json_checker.register` or be importable
+        by module path
+        :param iterable items:
+        :param bool only_failures: skip valid items
+        :param bool only_valid: skip invalid items
+        :param int workers: count of processes
+        :param bool ordered: keep order of items for workers
+        :param int chunk_size: items are sent to workers by chunks
+            of adaptive size by default
+        :return: iterator of (index, ok, report)
+        """
+        if only_failures and only_valid:
+            raise ValueError("only_failures and only_valid are exclusive")
+        if workers > 1:
+            yield from parallel.validate_many(
+                self,
+                items,
+                workers,
+                ordered=ordered,
+                chunk_size=chunk_size,
+                only_failures=only_failures,
+                only_valid=only_valid,
+            )
+            return
+        log.debug(
+            "Checker settings: ignore_extra_keys=%s, soft=%s",
+            self.ignore_extra_keys,
+            self.soft,
+        )
+        plan = self._plan
+        if plan is None:
+            plan = self.compile()
+        budget_ms = self.budget_ms
+        if budget_ms is not None:
+            plan = self.with_deadline(plan)
+        elif self.limits is not None:
+            plan = self.with_limits(plan)
+        elif self.sample is not None:
+            plan = self.with_sample(plan)
+        else:
+            plan = self.with_cache(plan)
+        if only_valid and self.limits is None and budget_ms is None:
+            is_valid = plan.is_valid
+            for index, data in enumerate(items):
+                if is_valid(data):
+                    yield index, True, None
+            return
+
+        validate = plan.validate
+        create_report = self.create_report
+        fail_fast = not self.soft
+        for index, data in enumerate(items):
+            report = create_report(soft=True, fail_fast=fail_fast)
+            if budget_ms is not None:
+                deadlines.start(report, time.monotonic() + budget_ms / 1000.0)
+            if validate(data, report):
+                if not only_failures:
+                    yield index, True, None
+            elif not only_valid:
+                yield index, False, report
+
+    def create_report(
+        self, soft: Optional[bool] = None, fail_fast: Optional[bool] = None
+    ) -> Report:
+        """
+        :param bool soft: soft of checker by default
+        :param bool fail_fast: not soft by default
+        :return: Report
+        """
+        if soft is None:
+            soft = self.soft
+        if self.aggregate:
+            return AggregatedReport(soft, fail_fast, self.max_errors)
+        return Report(soft, fail_fast, self.max_errors)
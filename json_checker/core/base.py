@@ -1,17 +1,177 @@
 import abc
+from collections.abc import Mapping, Sequence, Set
 from types import FunctionType
-from typing import Any, Iterable, Iterator, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
-from json_checker.core.reports import Report
 from json_checker.core.exceptions import CheckerError
 
+if TYPE_CHECKING:
+    # reports render errors by base formatting
+    from json_checker.core.reports import Report
+
+
+CONTAINER_BRACKETS: Dict[type, Tuple[str, str]] = {
+    list: ("[", "]"),
+    tuple: ("(", ")"),
+    set: ("{", "}"),
+    frozenset: ("frozenset({", "})"),
+    dict: ("{", "}"),
+}
+
+STRING_TYPES = (str, bytes, bytearray)
+
+# sequences which have short repr of their own
+PLAIN_SEQUENCES = (range, memoryview)
+
+
+def subclass_brackets(data: Any) -> Optional[Tuple[str, str]]:
+    """
+    Brackets of other containers with name of their type,
+    e.g. OrderedDict({'key': 1}) or Point(x=1, y=2) of namedtuple
+    """
+    name = type(data).__name__
+    if isinstance(data, Mapping):
+        return name + "({", "})"
+    if isinstance(data, tuple):
+        if hasattr(data, "_fields"):
+            return name + "(", ")"
+        return name + "((", "))"
+    if isinstance(data, Set):
+        return name + "({", "})"
+    if isinstance(data, Sequence):
+        return name + "([", "])"
+    return None
+
+
+class ReprLimits:
+    """
+    Limits of current values into error messages,
+    containers deeper than max_depth or with more than max_items
+    are shown as `<list len=1048576>`
+    Examples:
+    >>> from json_checker.core.base import repr_limits
+
+    >>> repr_limits.max_length = 200
+    >>> bounded_repr(list(range(1000)))  # '<list len=1000>'
+    """
+
+    __slots__ = ("max_length", "max_depth", "max_items")
+
+    def __init__(
+        self, max_length: int = 1000, max_depth: int = 5, max_items: int = 100
+    ):
+        """
+        :param int max_length: count of chars, longer reprs are cut by "..."
+        :param int max_depth: nesting of shown containers
+        :param int max_items: size of shown containers
+        """
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self.max_items = max_items
+
+
+repr_limits = ReprLimits()
+
+
+class BoundedRepr:
+    """Writes repr of data until it's longer than limits allow"""
+
+    def __init__(self, limits: ReprLimits):
+        self.limits = limits
+        self.parts: List[str] = []
+        self.size = 0
+
+    def __str__(self):
+        text = "".join(self.parts)
+        if len(text) > self.limits.max_length:
+            return text[: self.limits.max_length] + "..."
+        return text
+
+    def write(self, text: str):
+        self.parts.append(text)
+        self.size += len(text)
+
+    def value(self, data: Any, depth: int = 0):
+        if self.size > self.limits.max_length:
+            return
+        if isinstance(data, STRING_TYPES):
+            if len(data) > self.limits.max_length:
+                self.write(repr(data[: self.limits.max_length]))
+                self.write("...")
+            else:
+                self.write(repr(data))
+        elif isinstance(data, (Mapping, Sequence, Set)) and not isinstance(
+            data, PLAIN_SEQUENCES
+        ):
+            self.container(data, depth)
+        else:
+            self.write(repr(data))
+
+    def container(self, data: Any, depth: int):
+        data_type = type(data)
+        if len(data) > self.limits.max_items or depth >= self.limits.max_depth:
+            self.write("<%s len=%d>" % (data_type.__name__, len(data)))
+            return
+        brackets = CONTAINER_BRACKETS.get(data_type)
+        if brackets is None:
+            # subclasses are written item by item as builtin containers,
+            # their own repr could be of all items
+            brackets = subclass_brackets(data)
+            if brackets is None:
+                self.write("<%s len=%d>" % (data_type.__name__, len(data)))
+                return
+        elif not data:
+            self.write(repr(data))
+            return
+        start, end = brackets
+        is_dict = isinstance(data, Mapping)
+        fields = getattr(data, "_fields", None)
+        self.write(start)
+        for index, item in enumerate(data):
+            if index:
+                self.write(", ")
+            if self.size > self.limits.max_length:
+                break
+            if fields is not None:
+                self.write("%s=" % fields[index])
+            self.value(item, depth + 1)
+            if is_dict:
+                self.write(": ")
+                self.value(data[item], depth + 1)
+        if isinstance(data, tuple) and fields is None and len(data) == 1:
+            self.write(",")
+        self.write(end)
+
+
+def bounded_repr(data: Any, limits: Optional[ReprLimits] = None) -> str:
+    """
+    repr of data cut by limits, items of large containers
+    are not visited at all
+    :param any data:
+    :param ReprLimits limits: repr_limits by default
+    :return: str
+    """
+    writer = BoundedRepr(limits or repr_limits)
+    writer.value(data)
+    return str(writer)
+
 
 def format_data(data: Any) -> str:
     if callable(data):
         return data.__name__
     elif data is None:
         return repr(data)
-    return "{} ({})".format(repr(data), type(data).__name__)
+    return "{} ({})".format(bounded_repr(data), type(data).__name__)
 
 
 def format_error_message(expected_data: Any, current_data: Any) -> str:
@@ -21,9 +181,13 @@ def format_error_message(expected_data: Any, current_data: Any) -> str:
     )
 
 
+def is_type_of(data: Any, _type: Type) -> bool:
+    return isinstance(data, (_type, FunctionType)) or data is _type
+
+
 def filtered_by_type(expected_data: Iterable, _type: Type) -> Iterator:
     for data in expected_data:
-        if isinstance(data, (_type, FunctionType)) or data is _type:
+        if is_type_of(data, _type):
             yield data
 
 
@@ -83,7 +247,7 @@ class BaseValidator(Base):
     def __init__(
         self,
         expected_data: Any,
-        report: Report,
+        report: "Report",
         ignore_extra_keys: bool = False,
     ):
         super(BaseValidator, self).__init__(
@@ -93,7 +257,7 @@ class BaseValidator(Base):
         )
         self.report = report
 
-    def add_or_raise(self, message: str) -> Report:
+    def add_or_raise(self, message: str) -> "Report":
         self.report.add_or_raise(message, self.exception)
         return self.report
 
@@ -0,0 +1,368 @@
+import marshal
+import sys
+from collections import OrderedDict
+from hashlib import sha256
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_checker.core.compiler import (
+    AndNode,
+    DictNode,
+    Field,
+    MISSING,
+    LiteralNode,
+    ListNode,
+    Node,
+    OrNode,
+    TypeNode,
+)
+from json_checker.core.reports import Report
+
+# tokens of cached nodes, ids of nodes could be reused by other schemas
+_tokens = count()
+
+# references of marshal depend on reference counts of values, so equal data
+# could be encoded differently, but equal encoding is always of equal data
+MARSHAL_VERSION = 4
+
+# longer encodings are kept by sha256 digest, shorter ones as they are
+DIGEST_THRESHOLD = 256
+
+# values of nested cached nodes which are replaced by their digests
+NESTED_TYPES = (dict, list)
+
+# prefix of encodings with digests, marshal has no such type code,
+# so they differ from encodings of data as it is
+COMPOSITE = b"\x00"
+
+# nested cached nodes with so many levels of cached nodes under them
+# encode values of their cached children by digests, lower ones encode
+# data as it is, so every value is encoded by a few cached nodes at most
+# and small subtrees are encoded at once by C code
+COMPOSITE_HEIGHT = 3
+
+# memory of entry without encoding or digest: key tuple, token, bytes
+# object header and slot of OrderedDict
+ENTRY_OVERHEAD = (
+    sys.getsizeof((0, 0, b""))
+    + sys.getsizeof(2**40)
+    + sys.getsizeof(b"")
+    + 3 * sys.getsizeof(0)
+)
+
+
+class ValidationCache:
+    """
+    LRU cache of structural hashes of valid data by compiled schema nodes,
+    unchanged dicts and lists are not validated again by later calls.
+    Data is encoded by marshal and hashed by sha256, both are C code
+    which is faster than validation of the same data, short encodings
+    are kept as they are without hashing and data shorter than
+    `min_size` bytes is validated without cache.
+    Only dicts and lists of types, literals and operators are cached,
+    schemas with functions or custom checkers are validated every time.
+    Every call encodes the whole data again, unchanged children of
+    changed data are found by the cache but are encoded too, so only
+    unchanged documents are validated faster than without cache,
+    new documents are validated slower
+    Examples:
+    >>> cache = ValidationCache(max_entries=1024, max_bytes=1024 * 1024)
+    >>> checker = Checker({"items": [{"price": float}]}, cache=cache)
+    >>> checker.validate(data)
+    >>> checker.validate(data)  # unchanged data is found into cache
+    >>> cache  # <ValidationCache entries=2 bytes=... hits=1 misses=2 ...>
+
+    :param int max_entries: the least recently used entries are evicted
+    :param int max_bytes: limit of memory of entries
+    :param int min_size: data with shorter encoding is validated every time
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 16 * 1024 * 1024,
+        min_size: int = 48,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.entries: "OrderedDict[Tuple[Any, ...], int]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return "<%s entries=%s bytes=%s hits=%s misses=%s evictions=%s>" % (
+            self.__class__.__name__,
+            len(self.entries),
+            self.bytes,
+            self.hits,
+            self.misses,
+            self.evictions,
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, token: int, data: Any) -> Optional[Tuple[Any, ...]]:
+        """
+        :param int token: cached node
+        :param any data:
+        :return: key of entry or None when data is small or not encoded,
+            e.g. it has subclasses of dict or other objects
+        """
+        try:
+            encoded = marshal.dumps(data, MARSHAL_VERSION)
+        except ValueError:
+            return None
+        size = len(encoded)
+        if size < self.min_size:
+            return None
+        if size > DIGEST_THRESHOLD:
+            return token, size, sha256(encoded).digest()
+        return token, encoded
+
+    def find(self, key: Tuple[Any, ...]) -> bool:
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, key: Tuple[Any, ...]):
+        entries = self.entries
+        if key in entries:
+            return
+        size = ENTRY_OVERHEAD + len(key[-1])
+        entries[key] = size
+        self.bytes += size
+        while len(entries) > self.max_entries or (
+            self.bytes > self.max_bytes and entries
+        ):
+            _, size = entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = self.hits = self.misses = self.evictions = 0
+
+
+class CachedNode(Node):
+    """
+    Container node which skips data found into cache.
+    The outermost cached node encodes data at once, so unchanged data
+    is found by one call of marshal. When it's not found, nested cached
+    nodes encode dicts and lists with digests of their cached items
+    instead of the items, so every subtree is encoded once by validation
+    """
+
+    __slots__ = (
+        "node",
+        "cache",
+        "token",
+        "height",
+        "by_digest",
+        "fields",
+        "items",
+    )
+
+    def __init__(self, node: Node, cache: ValidationCache):
+        super(CachedNode, self).__init__(node.expected_data)
+        self.node = node
+        self.cache = cache
+        self.token = next(_tokens)
+        children: List[CachedNode] = []
+        if isinstance(node, DictNode):
+            children = [
+                field.node
+                for field in node.fields
+                if isinstance(field.node, CachedNode)
+            ]
+        elif isinstance(node, ListNode):
+            children = [
+                item for item in node.items if isinstance(item, CachedNode)
+            ]
+        # count of levels of cached nodes under this one
+        self.height: int = max([child.height + 1 for child in children] or [0])
+        # key of nested node is made of digest when it encodes data
+        # with digests or when its parent does it, others encode data
+        # as the outermost node
+        self.by_digest = self.height >= COMPOSITE_HEIGHT
+        # cached children which give digests of their values
+        self.fields: Tuple[Tuple[Any, "CachedNode"], ...] = ()
+        self.items: Tuple[Node, ...] = ()
+        if not self.by_digest:
+            return
+        for child in children:
+            child.by_digest = True
+        if isinstance(node, DictNode):
+            self.fields = tuple(
+                (field.key, field.node)
+                for field in node.fields
+                if isinstance(field.node, CachedNode)
+            )
+        elif isinstance(node, ListNode):
+            self.items = node.items
+
+    @property
+    def exception(self):
+        return self.node.exception
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        cache = self.cache
+        digests = report.digests
+        if digests is None or not self.by_digest:
+            key = cache.key(self.token, current_data)
+        else:
+            key = self.key(current_data, digests)
+        if key is not None and cache.find(key):
+            return True
+        if digests is None and self.by_digest:
+            # digests are kept by ids of values only while data is validated
+            report.digests = {}
+            try:
+                is_valid = self.node.validate(current_data, report)
+            finally:
+                report.digests = None
+        else:
+            is_valid = self.node.validate(current_data, report)
+        if is_valid and key is not None:
+            cache.add(key)
+        return is_valid
+
+    def is_valid(self, current_data: Any) -> bool:
+        if self.by_digest:
+            return self.validate(
+                current_data, Report(soft=True, fail_fast=True)
+            )
+        cache = self.cache
+        key = cache.key(self.token, current_data)
+        if key is None:
+            return self.node.is_valid(current_data)
+        if cache.find(key):
+            return True
+        if not self.node.is_valid(current_data):
+            return False
+        cache.add(key)
+        return True
+
+    def key(
+        self, current_data: Any, digests: Dict[int, Any]
+    ) -> Optional[Tuple[Any, ...]]:
+        """Key of nested node by digest of data"""
+        digest = self.digest(current_data, digests)
+        if digest is None or digest[0] < self.cache.min_size:
+            return None
+        return self.token, digest[0], digest[1]
+
+    def digest(
+        self, current_data: Any, digests: Dict[int, Any]
+    ) -> Optional[Tuple[int, bytes]]:
+        """
+        :param any current_data:
+        :param dict digests: digests of values by their ids
+        :return: size of encoding and its sha256 digest or short encoding
+            as it is, None when data is not encoded
+        """
+        digest = digests.get(id(current_data), MISSING)
+        if digest is not MISSING:
+            return digest
+        data_type = type(current_data)
+        try:
+            if self.fields and data_type is dict:
+                encoded = self.encode_dict(current_data, digests)
+            elif self.items and data_type is list:
+                encoded = self.encode_list(current_data, digests)
+            else:
+                encoded = marshal.dumps(current_data, MARSHAL_VERSION)
+        except ValueError:
+            digest = None
+        else:
+            size = len(encoded)
+            if size > DIGEST_THRESHOLD:
+                encoded = sha256(encoded).digest()
+            digest = size, encoded
+        digests[id(current_data)] = digest
+        return digest
+
+    def encode_dict(self, current_data: dict, digests: Dict[int, Any]):
+        """Dict with digests of its cached values and their keys"""
+        shallow = current_data.copy()
+        replaced = []
+        for key, node in self.fields:
+            value = shallow.get(key)
+            if type(value) in NESTED_TYPES:
+                digest = node.digest(value, digests)
+                if digest is None:
+                    raise ValueError("value of %r is not encoded" % key)
+                shallow[key] = digest
+                replaced.append(key)
+        return COMPOSITE + marshal.dumps((replaced, shallow), MARSHAL_VERSION)
+
+    def encode_list(self, current_data: list, digests: Dict[int, Any]):
+        """List with digests of its cached items and their indexes"""
+        items = self.items
+        positional = len(items) == len(current_data)
+        parts = []
+        replaced = []
+        for index, item in enumerate(current_data):
+            node = items[index] if positional else items[0]
+            if type(item) in NESTED_TYPES and type(node) is CachedNode:
+                digest = node.digest(item, digests)
+                if digest is None:
+                    raise ValueError("item %s is not encoded" % index)
+                parts.append(digest)
+                replaced.append(index)
+            else:
+                parts.append(item)
+        return COMPOSITE + marshal.dumps((replaced, parts), MARSHAL_VERSION)
+
+
+def cached_plan(node: Node, cache: ValidationCache) -> Tuple[Node, bool]:
+    """
+    Copy of compiled plan where dicts and lists without functions
+    are wrapped by CachedNode, the original plan is not changed
+    :param Node node: compiled schema
+    :param ValidationCache cache:
+    :return: node and whether it is pure
+    """
+    if isinstance(node, DictNode):
+        fields = []
+        pure = True
+        for field in node.fields:
+            child, child_pure = cached_plan(field.node, cache)
+            fields.append(Field(field.key, child, field.optional))
+            pure = pure and child_pure
+        node = DictNode(
+            node.expected_data,
+            tuple(fields),
+            node.ignore_extra_keys,
+            node.literal,
+        )
+    elif isinstance(node, ListNode):
+        pairs = [cached_plan(item, cache) for item in node.items]
+        pure = all(child_pure for _, child_pure in pairs)
+        node = ListNode(
+            node.expected_data,
+            tuple(child for child, _ in pairs),
+            node.literal,
+        )
+    elif isinstance(node, OrNode):
+        pairs = [cached_plan(child, cache) for child in node.alternatives]
+        children = tuple(child for child, _ in pairs)
+        return OrNode(node.expected_data, children), all(p for _, p in pairs)
+    elif isinstance(node, AndNode):
+        pairs = [cached_plan(child, cache) for child in node.conditions]
+        children = tuple(child for child, _ in pairs)
+        return AndNode(node.expected_data, children), all(p for _, p in pairs)
+    else:
+        return node, type(node) in (TypeNode, LiteralNode)
+
+    # literals are compared by equality faster than hashed
+    if pure and not node.literal:
+        return CachedNode(node, cache), True
+    return node, pure
@@ -1,6 +1,6 @@
 import logging
 from types import FunctionType
-from typing import Any, Iterable, Iterator
+from typing import Any, Container, Iterable, Iterator
 
 from collections import OrderedDict
 
@@ -24,7 +24,7 @@ from json_checker.core.reports import Report
 log = logging.getLogger(__name__)
 
 
-def filtered_items(expected_data: dict, current_keys: list) -> Iterator:
+def filtered_items(expected_data: dict, current_keys: Container) -> Iterator:
     for k, v in expected_data.items():
         if isinstance(k, OptionalKey) and k.expected_data not in current_keys:
             log.debug("Skip %s" % k)
@@ -149,9 +149,6 @@ class ListChecker(BaseValidator):
         :param list | tuple | set | frozenset current_data:
         :return: Report
         """
-        if self.expected_data == current_data:
-            return self.report
-
         if (
             # expected [int], current 123
             (not isinstance(current_data, (list, tuple, set, frozenset)))
@@ -220,15 +217,12 @@ class DictChecker(BaseValidator):
         :param dict | OrderedDict current_data:
         :return: Report
         """
-        if current_data == self.expected_data:
-            return self.report
-
         if not isinstance(current_data, dict):
             message = format_error_message(dict, current_data)
             return self.add_or_raise(message)
 
-        validated_keys = []
-        current_keys = list(current_data.keys())
+        validated_keys = set()
+        current_keys = current_data.keys()
         for ex_key, value in filtered_items(self.expected_data, current_keys):
             if ex_key not in current_keys:
                 message = "Missing keys in current response: %s" % ex_key
@@ -242,12 +236,12 @@ class DictChecker(BaseValidator):
                 ignore_extra_keys=self.ignore_extra_keys,
             )
             checker.validate(current_data[ex_key])
-            validated_keys.append(ex_key)
+            validated_keys.add(ex_key)
             if report.has_errors():
                 self.add_or_raise('From key="%s": \n\t%s' % (ex_key, report))
 
         if not self.ignore_extra_keys:
-            miss_expected_keys = list(set(current_keys) - set(validated_keys))
+            miss_expected_keys = list(current_keys - validated_keys)
             if miss_expected_keys:
                 message = "Missing keys in expected schema: " "%s" % ", ".join(
                     miss_expected_keys
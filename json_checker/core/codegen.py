@@ -0,0 +1,661 @@
+import hashlib
+import importlib.util
+import math
+import os
+import tempfile
+from collections import OrderedDict
+from types import FunctionType
+from typing import Any, Callable, Dict, List, Optional
+
+from json_checker.core.base import format_data
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.compiler import (
+    AndNode,
+    DictNode,
+    Field,
+    FunctionNode,
+    ListNode,
+    LiteralNode,
+    Node,
+    OrNode,
+    TypeNode,
+    compile_schema,
+)
+from json_checker.core.registry import registry
+from json_checker.core.reports import Report
+
+
+# bump on every change of generated code, it invalidates cached modules
+CODEGEN_VERSION = 6
+
+LITERAL_TYPES = (type(None), bool, int, float, str)
+
+BUILTIN_TYPES = {
+    t: t.__name__
+    for t in (
+        bool,
+        bytes,
+        dict,
+        float,
+        frozenset,
+        int,
+        list,
+        object,
+        set,
+        str,
+        tuple,
+        type,
+    )
+}
+BUILTIN_TYPES[type(None)] = "type(None)"
+
+HEADER = """\
+# Generated by json_checker.core.codegen, do not edit
+# fingerprint: %s
+from collections import OrderedDict
+
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.compiler import MISSING
+from json_checker.core.errors import (
+    EXTRA_KEYS,
+    FUNCTION,
+    MISSING_KEY,
+    NOT_VALID,
+    TYPE,
+    ErrorRecord,
+    Key,
+)
+from json_checker.core.exceptions import (
+    DictCheckerError,
+    FunctionCheckerError,
+    ListCheckerError,
+    MissKeyCheckerError,
+    TypeCheckerError,
+)
+from json_checker.core.registry import resolve
+"""
+
+
+def describe(expected_data: Any) -> str:
+    """
+    Stable description of schema, the same in all processes
+    :param any expected_data:
+    :return: str
+    """
+    data_type = type(expected_data)
+    if data_type in (dict, OrderedDict):
+        return "{%s}" % ", ".join(
+            "%s: %s" % (describe_key(k), describe(v))
+            for k, v in expected_data.items()
+        )
+    if data_type in (list, tuple, set, frozenset):
+        if data_type in (set, frozenset) and len(expected_data) > 1:
+            raise ValueError(
+                "positions of %s are not stable" % format_data(expected_data)
+            )
+        return "%s[%s]" % (
+            data_type.__name__,
+            ", ".join(describe(e) for e in expected_data),
+        )
+    if data_type in (Or, And):
+        return "%s(%s)" % (
+            data_type.__name__,
+            ", ".join(describe(e) for e in expected_data.expected_data),
+        )
+    if isinstance(expected_data, type):
+        return "type %s" % type_name(expected_data)
+    if data_type is FunctionType:
+        return "function %s %s" % (
+            registry.name_of(expected_data),
+            expected_data.__name__,
+        )
+    return "%s %s" % (data_type.__name__, literal(expected_data))
+
+
+def describe_key(key: Any) -> str:
+    if isinstance(key, OptionalKey):
+        return "OptionalKey(%s)" % literal(key.expected_data)
+    return literal(key)
+
+
+def literal(value: Any) -> str:
+    """
+    :param any value:
+    :return: python source of value
+    """
+    if type(value) not in LITERAL_TYPES or (
+        type(value) is float and not math.isfinite(value)
+    ):
+        raise ValueError("can't generate code for %s" % format_data(value))
+    return repr(value)
+
+
+def type_name(expected_type: type) -> str:
+    if expected_type in BUILTIN_TYPES:
+        return BUILTIN_TYPES[expected_type]
+    return registry.name_of(expected_type)
+
+
+def fingerprint(expected_data: Any, ignore_extra_keys: bool = False) -> str:
+    """
+    :param any expected_data:
+    :param bool ignore_extra_keys:
+    :return: sha256 hex digest of schema and generator version
+    """
+    text = "codegen=%s ignore_extra_keys=%s %s" % (
+        CODEGEN_VERSION,
+        ignore_extra_keys,
+        describe(expected_data),
+    )
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+        self.indent = 0
+
+    def __call__(self, line: str = "", *args: Any):
+        if args:
+            line = line % args
+        self.lines.append("    " * self.indent + line if line else "")
+
+    def block(self, line: str, *args: Any) -> "Writer":
+        self(line, *args)
+        return self
+
+    def __enter__(self):
+        self.indent += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.indent -= 1
+
+
+class SourceGenerator:
+    """
+    Writes straight line python module from compiled plan:
+    checks of types and literals are inlined, keys of dicts are unrolled,
+    loops are used for items of lists only.
+    Module has `validate(current_data, report) -> bool` function,
+    which works as `Node.validate`
+    """
+
+    def __init__(self, plan: Node, fingerprint: str = ""):
+        self.plan = plan
+        self.fingerprint = fingerprint
+        self.constants: List[str] = []
+        self.names: Dict[str, str] = {}
+        self.functions: List[List[str]] = []
+
+    def generate(self) -> str:
+        root = self.function(self.plan)
+        lines = [HEADER % self.fingerprint]
+        lines.extend(self.constants)
+        for function in self.functions:
+            lines.append("\n")
+            lines.extend(function)
+        lines.append("\n")
+        lines.append("validate = %s\n" % root)
+        return "\n".join(lines)
+
+    def define(self, source: str) -> str:
+        if source not in self.names:
+            self.names[source] = "_c%d" % len(self.names)
+            self.constants.append("%s = %s" % (self.names[source], source))
+        return self.names[source]
+
+    def constant(self, obj: Any) -> str:
+        if isinstance(obj, type) and obj in BUILTIN_TYPES:
+            return BUILTIN_TYPES[obj]
+        return self.define("resolve(%r)" % registry.name_of(obj))
+
+    def expected(self, expected_data: Any) -> str:
+        """Name of constant equal to expected_data, it's kept by errors"""
+        if isinstance(expected_data, (type, FunctionType)):
+            return self.constant(expected_data)
+        if type(expected_data) in LITERAL_TYPES:
+            return literal(expected_data)
+        return self.define(self.schema(expected_data))
+
+    def schema(self, expected_data: Any) -> str:
+        """Python source which builds expected_data again"""
+        data_type = type(expected_data)
+        if isinstance(expected_data, (type, FunctionType)):
+            return self.constant(expected_data)
+        if data_type in (dict, OrderedDict):
+            items = [
+                (
+                    (
+                        "OptionalKey(%s)" % literal(k.expected_data)
+                        if isinstance(k, OptionalKey)
+                        else literal(k)
+                    ),
+                    self.schema(v),
+                )
+                for k, v in expected_data.items()
+            ]
+            if data_type is OrderedDict:
+                return "OrderedDict([%s])" % ", ".join(
+                    "(%s, %s)" % item for item in items
+                )
+            return "{%s}" % ", ".join("%s: %s" % item for item in items)
+        if data_type in (list, tuple, set, frozenset):
+            elements = ", ".join(self.schema(e) for e in expected_data)
+            if data_type is list:
+                return "[%s]" % elements
+            return "%s([%s])" % (data_type.__name__, elements)
+        if data_type in (Or, And):
+            return "%s(%s)" % (
+                data_type.__name__,
+                ", ".join(self.schema(e) for e in expected_data.expected_data),
+            )
+        return literal(expected_data)
+
+    def key(self, field: Field) -> str:
+        return self.define("Key(%s)" % literal(field.key))
+
+    def inline(self, node: Node, var: str) -> Optional[str]:
+        """
+        :return: condition of valid data for types and literals
+        """
+        if isinstance(node, TypeNode):
+            name = self.constant(node.expected_data)
+            condition = "%s is %s or isinstance(%s, %s)" % (
+                var,
+                name,
+                var,
+                name,
+            )
+        elif isinstance(node, LiteralNode):
+            condition = "%s == %s" % (var, literal(node.expected_data))
+        else:
+            return None
+        return condition
+
+    def function(self, node: Node) -> str:
+        name = "_n%d" % len(self.functions)
+        w = Writer()
+        self.functions.append(w.lines)
+        w("def %s(data, report):", name)
+        with w:
+            if isinstance(node, DictNode):
+                self.write_dict(w, node, name)
+            elif isinstance(node, ListNode):
+                self.write_list(w, node, name)
+            elif isinstance(node, OrNode):
+                self.write_or(w, node)
+            elif isinstance(node, AndNode):
+                self.write_and(w, node)
+            elif isinstance(node, FunctionNode):
+                self.write_function(w, node)
+            elif isinstance(node, (TypeNode, LiteralNode)):
+                with w.block("if %s:", self.inline(node, "data")):
+                    w("return True")
+                w(
+                    "report.add_or_raise(ErrorRecord(TYPE, %s, data), "
+                    "TypeCheckerError)",
+                    self.expected(node.expected_data),
+                )
+                w("return False")
+            else:
+                raise ValueError(
+                    "can't generate code for %s"
+                    % format_data(node.expected_data)
+                )
+        return name
+
+    def write_stop(self, w: Writer, remaining: str):
+        """
+        Error of container item stops validation with fail_fast
+        :param str remaining: count of items which are not visited
+        """
+        with w.block("if report.fail_fast:"):
+            w("report.skip(%s)", remaining)
+            w("return False")
+        w("report.soft = True")
+        w("is_valid = False")
+
+    def write_child(
+        self,
+        w: Writer,
+        node: Node,
+        var: str,
+        step: str,
+        exception: str,
+        remaining: str,
+        owner: str,
+    ):
+        """
+        Check of container item, errors are collected same as in nodes
+        :param str owner: name of function of container
+        """
+        condition = self.inline(node, var)
+        if condition:
+            with w.block("if not (%s):", condition):
+                w("mark = len(errors)")
+                w(
+                    "report.add(ErrorRecord(TYPE, %s, %s))",
+                    self.expected(node.expected_data),
+                    var,
+                )
+                w("report.soft = soft")
+                w("report.add_group(mark, %s, %s, %s)", step, exception, owner)
+                self.write_stop(w, remaining)
+            return
+
+        function = self.function(node)
+        w("mark = len(errors)")
+        with w.block("if not %s(%s, report):", function, var):
+            w("report.soft = soft")
+            w("report.add_group(mark, %s, %s, %s)", step, exception, owner)
+            self.write_stop(w, remaining)
+
+    def write_dict(self, w: Writer, node: DictNode, name: str):
+        with w.block("if not isinstance(data, dict):"):
+            w(
+                "report.add_or_raise(ErrorRecord(TYPE, dict, data), "
+                "DictCheckerError)"
+            )
+            w("return False")
+        w("soft = report.soft")
+        w("report.soft = True")
+        w("errors = report.errors")
+        w("is_valid = True")
+        w("found = 0")
+        for index, field in enumerate(node.fields):
+            remaining = str(len(node.fields) - index - 1)
+            w("value = data.get(%s, MISSING)", literal(field.key))
+            with w.block("if value is not MISSING:"):
+                w("found += 1")
+                self.write_child(
+                    w,
+                    field.node,
+                    "value",
+                    self.key(field),
+                    "DictCheckerError",
+                    remaining,
+                    name,
+                )
+            if not field.optional:
+                with w.block("else:"):
+                    w("report.soft = soft")
+                    w(
+                        "report.add_or_raise(ErrorRecord(MISSING_KEY, %s, "
+                        "data), MissKeyCheckerError)",
+                        literal(field.key),
+                    )
+                    self.write_stop(w, remaining)
+        w("report.soft = soft")
+        if not node.ignore_extra_keys:
+            keys = self.define(
+                "frozenset([%s])"
+                % ", ".join(literal(field.key) for field in node.fields)
+            )
+            with w.block("if found != len(data):"):
+                w("extra_keys = [k for k in data if k not in %s]", keys)
+                w(
+                    "report.add_or_raise(ErrorRecord(EXTRA_KEYS, %s, data, "
+                    "extra_keys), MissKeyCheckerError)",
+                    self.expected(node.expected_data),
+                )
+                w("return False")
+        w("return is_valid")
+
+    def write_list(self, w: Writer, node: ListNode, name: str):
+        if isinstance(node.expected_data, (set, frozenset)) and (
+            len(node.items) > 1
+        ):
+            raise ValueError(
+                "positions of %s are not stable"
+                % format_data(node.expected_data)
+            )
+        condition = "data" if not node.items else "not data"
+        with w.block(
+            "if not isinstance(data, (list, tuple, set, frozenset)) or %s:",
+            condition,
+        ):
+            w(
+                "report.add_or_raise(ErrorRecord(TYPE, %s, data), "
+                "ListCheckerError)",
+                self.expected(node.expected_data),
+            )
+            w("return False")
+        if not node.items:
+            w("return True")
+            return
+
+        w("soft = report.soft")
+        w("report.soft = True")
+        w("errors = report.errors")
+        w("is_valid = True")
+        items = node.items
+        remaining = "len(data) - index - 1"
+        if len(items) == 1:
+            with w.block("for index, item in enumerate(data):"):
+                self.write_child(
+                    w,
+                    items[0],
+                    "item",
+                    "index",
+                    "ListCheckerError",
+                    remaining,
+                    name,
+                )
+        else:
+            names = ["item_%d" % i for i in range(len(items))]
+            with w.block("if len(data) == %d:", len(items)):
+                w("%s = data", ", ".join(names))
+                for index, (item, var) in enumerate(zip(items, names)):
+                    self.write_child(
+                        w,
+                        item,
+                        var,
+                        str(index),
+                        "ListCheckerError",
+                        str(len(items) - index - 1),
+                        name,
+                    )
+            with w.block("else:"):
+                with w.block("for index, item in enumerate(data):"):
+                    self.write_child(
+                        w,
+                        items[0],
+                        "item",
+                        "index",
+                        "ListCheckerError",
+                        remaining,
+                        name,
+                    )
+        w("report.soft = soft")
+        w("return is_valid")
+
+    def write_or(self, w: Writer, node: OrNode):
+        w("data_type = type(data)")
+        w("soft = report.soft")
+        w("report.soft = True")
+        w("errors = report.errors")
+        w("mark = len(errors)")
+        w("snapshot = report.snapshot()")
+        w("fail_fast = report.fail_fast")
+        w("closest = None")
+        for alternative in node.alternatives:
+            expected = alternative.expected_data
+            if isinstance(expected, FunctionType):
+                condition = "True"
+            elif isinstance(expected, type):
+                name = self.constant(expected)
+                condition = "isinstance(%s, data_type) or %s is data_type" % (
+                    name,
+                    name,
+                )
+            else:
+                condition = "issubclass(%s, data_type)" % self.constant(
+                    type(expected)
+                )
+            function = self.function(alternative)
+            with w.block("if %s:", condition):
+                # candidates are compared by all their errors
+                w("report.fail_fast = False")
+                with w.block("if %s(data, report):", function):
+                    w("report.soft = soft")
+                    w("report.fail_fast = fail_fast")
+                    w("return True")
+                with w.block(
+                    "if closest is None or "
+                    "len(errors) - mark <= len(closest):"
+                ):
+                    w("closest = errors[mark:]")
+                    w("closest_snapshot = report.snapshot()")
+                w("del errors[mark:]")
+                w("report.restore(snapshot)")
+        w("report.soft = soft")
+        with w.block("if closest is None:"):
+            w(
+                "report.add(ErrorRecord(NOT_VALID, %s, data))",
+                self.expected(node.expected_data),
+            )
+            w("return False")
+        w("errors.extend(closest)")
+        w("report.restore(closest_snapshot)")
+        w("report.fail_fast = report.fail_fast or fail_fast")
+        w("return False")
+
+    def write_and(self, w: Writer, node: AndNode):
+        conditions = []
+        for condition in node.conditions:
+            inline = self.inline(condition, "data")
+            if inline:
+                conditions.append("not (%s)" % inline)
+            else:
+                conditions.append(
+                    "not %s(data, report)" % self.function(condition)
+                )
+        if not conditions:
+            w("return True")
+            return
+        w("soft = report.soft")
+        w("report.soft = True")
+        w("errors = report.errors")
+        w("mark = len(errors)")
+        w("snapshot = report.snapshot()")
+        with w.block("if %s:", " or ".join(conditions)):
+            w("del errors[mark:]")
+            w("report.restore(snapshot)")
+            w("report.soft = soft")
+            w(
+                "report.add(ErrorRecord(NOT_VALID, %s, data))",
+                self.expected(node.expected_data),
+            )
+            w("return False")
+        w("report.soft = soft")
+        w("return True")
+
+    def write_function(self, w: Writer, node: FunctionNode):
+        func = self.constant(node.expected_data)
+        with w.block("if data is %s:", func):
+            w("return True")
+        with w.block("try:"):
+            with w.block("if %s(data):", func):
+                w("return True")
+            w("detail = None")
+        with w.block("except (TypeError, ValueError) as e:"):
+            w("detail = str(e)")
+        w(
+            "report.add_or_raise(ErrorRecord(FUNCTION, %s, data, detail), "
+            "FunctionCheckerError)",
+            func,
+        )
+        w("return False")
+
+
+def generate_source(
+    expected_data: Any,
+    ignore_extra_keys: bool = False,
+    plan: Optional[Node] = None,
+) -> str:
+    """
+    Generate python module with validate function for expected schema
+    Examples:
+    >>> from json_checker import register
+
+    >>> positive = register(lambda x: x > 0, name="positive")
+    >>> source = generate_source({"id": And(int, positive), "tags": [str]})
+
+    Functions and not builtin types must be registered
+    or importable by `module:qualname`
+    :param any expected_data:
+    :param bool ignore_extra_keys:
+    :param Node plan: compiled expected_data
+    :return: str
+    """
+    if plan is None:
+        plan = compile_schema(expected_data, ignore_extra_keys)
+    generator = SourceGenerator(
+        plan, fingerprint(expected_data, ignore_extra_keys)
+    )
+    return generator.generate()
+
+
+class GeneratedNode(Node):
+    """Plan which runs validate function of generated module"""
+
+    __slots__ = ("function", "source", "fingerprint", "path")
+
+    def __init__(
+        self,
+        expected_data: Any,
+        function: Callable[[Any, Report], bool],
+        source: str,
+        fingerprint: str,
+        path: Optional[str] = None,
+    ):
+        super(GeneratedNode, self).__init__(expected_data)
+        self.function = function
+        self.source = source
+        self.fingerprint = fingerprint
+        self.path = path
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        return self.function(current_data, report)
+
+
+def load_plan(
+    expected_data: Any,
+    ignore_extra_keys: bool = False,
+    cache_dir: Optional[str] = None,
+) -> GeneratedNode:
+    """
+    Load generated plan of expected schema,
+    with cache_dir module is generated once and is imported
+    by other processes from `<cache_dir>/<fingerprint>.py`
+    :param any expected_data:
+    :param bool ignore_extra_keys:
+    :param str cache_dir:
+    :return: GeneratedNode
+    """
+    key = fingerprint(expected_data, ignore_extra_keys)
+    module_name = "json_checker_generated_%s" % key[:16]
+    if cache_dir is None:
+        source = generate_source(expected_data, ignore_extra_keys)
+        namespace: Dict[str, Any] = {"__name__": module_name}
+        exec(compile(source, "<%s>" % module_name, "exec"), namespace)
+        return GeneratedNode(expected_data, namespace["validate"], source, key)
+
+    path = os.path.join(cache_dir, "%s.py" % key)
+    if not os.path.exists(path):
+        source = generate_source(expected_data, ignore_extra_keys)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(tmp_path, path)
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError("generated plan %s can't be imported" % path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    return GeneratedNode(expected_data, module.validate, source, key, path)
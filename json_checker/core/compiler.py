@@ -0,0 +1,686 @@
+import logging
+from collections import OrderedDict
+from itertools import repeat
+from types import FunctionType
+from typing import Any, Callable, Dict, List, Tuple
+
+from json_checker.core.base import format_data, is_type_of
+from json_checker.core.checkers import And, OptionalKey, Or, Validator
+from json_checker.core.exceptions import (
+    CheckerError,
+    DictCheckerError,
+    FunctionCheckerError,
+    ListCheckerError,
+    MissKeyCheckerError,
+    TypeCheckerError,
+)
+from json_checker.core.errors import (
+    EXTRA_KEYS,
+    FUNCTION,
+    MESSAGE,
+    MISSING_KEY,
+    NOT_VALID,
+    TYPE,
+    ErrorRecord,
+    Key,
+)
+from json_checker.core.reports import Report
+
+
+log = logging.getLogger(__name__)
+
+SEQUENCE_TYPES = (list, tuple, set, frozenset)
+
+# schemas with so many keys are checked by keys of smaller current data
+WIDE_DICT_SIZE = 64
+
+MISSING = object()
+
+
+class Node:
+    """
+    Compiled schema node.
+
+    Nodes are built once by `compile_schema` and shared between calls,
+    all per call state lives into the Report passed to `validate`.
+    `validate` returns True when current data is valid,
+    otherwise error records were added to the report,
+    containers add own steps to paths of records of their items.
+    `is_valid` returns the same result without report and stops
+    on the first error.
+    `literal` nodes have no types, functions or operators inside,
+    only them are compared with current data by equality.
+    """
+
+    __slots__ = ("expected_data",)
+
+    exception = CheckerError
+
+    literal = False
+
+    def __init__(self, expected_data: Any):
+        self.expected_data = expected_data
+
+    def __repr__(self):
+        return "<%s expected=%s>" % (
+            self.__class__.__name__,
+            format_data(self.expected_data),
+        )
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        raise NotImplementedError
+
+    def is_valid(self, current_data: Any) -> bool:
+        return self.validate(current_data, Report(soft=True, fail_fast=True))
+
+
+def validate_node(node: Node, current_data: Any, report: Report) -> bool:
+    return node.validate(current_data, report)
+
+
+# validates alternatives of Or and conditions of And, e.g. by selected paths
+NodeValidator = Callable[[Node, Any, Report], bool]
+
+
+class TypeNode(Node):
+
+    __slots__ = ()
+
+    exception = TypeCheckerError
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        expected = self.expected_data
+        if current_data is expected or isinstance(current_data, expected):
+            return True
+        report.add_or_raise(
+            ErrorRecord(TYPE, expected, current_data), self.exception
+        )
+        return False
+
+    def is_valid(self, current_data: Any) -> bool:
+        expected = self.expected_data
+        return current_data is expected or isinstance(current_data, expected)
+
+
+class LiteralNode(Node):
+
+    __slots__ = ()
+
+    exception = TypeCheckerError
+
+    literal = True
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        if current_data == self.expected_data:
+            return True
+        report.add_or_raise(
+            ErrorRecord(TYPE, self.expected_data, current_data),
+            self.exception,
+        )
+        return False
+
+    def is_valid(self, current_data: Any) -> bool:
+        return current_data == self.expected_data
+
+
+class FunctionNode(Node):
+
+    __slots__ = ()
+
+    exception = FunctionCheckerError
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        func = self.expected_data
+        if current_data is func:
+            return True
+        try:
+            if func(current_data):
+                return True
+            detail = None
+        except (TypeError, ValueError) as e:
+            detail = str(e)
+        report.add_or_raise(
+            ErrorRecord(FUNCTION, func, current_data, detail), self.exception
+        )
+        return False
+
+    def is_valid(self, current_data: Any) -> bool:
+        func = self.expected_data
+        if current_data is func:
+            return True
+        try:
+            return bool(func(current_data))
+        except (TypeError, ValueError):
+            return False
+
+
+class ListNode(Node):
+    """
+    Items are checked one to one by position when lengths are equal,
+    otherwise every current item is checked by the first expected item
+    """
+
+    __slots__ = ("items", "literal")
+
+    exception = ListCheckerError
+
+    def __init__(
+        self,
+        expected_data: Any,
+        items: Tuple[Node, ...],
+        literal: bool = False,
+    ):
+        super(ListNode, self).__init__(expected_data)
+        self.items = items
+        self.literal = literal
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        expected = self.expected_data
+        if self.literal and expected == current_data:
+            return True
+
+        if (
+            not isinstance(current_data, SEQUENCE_TYPES)
+            or (not current_data and expected)
+            or (not expected and current_data)
+        ):
+            report.add_or_raise(
+                ErrorRecord(TYPE, expected, current_data), self.exception
+            )
+            return False
+
+        items = self.items
+        if len(items) == len(current_data):
+            pairs = zip(items, current_data)
+        else:
+            pairs = zip(repeat(items[0]), current_data)
+
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        is_valid = True
+        for index, (node, data) in enumerate(pairs):
+            mark = len(errors)
+            if node.validate(data, report):
+                continue
+            is_valid = False
+            report.soft = soft
+            report.add_group(mark, index, self.exception, self)
+            if report.fail_fast:
+                report.skip(len(current_data) - index - 1)
+                return False
+            report.soft = True
+        report.soft = soft
+        return is_valid
+
+    def is_valid(self, current_data: Any) -> bool:
+        expected = self.expected_data
+        if self.literal and expected == current_data:
+            return True
+        if (
+            not isinstance(current_data, SEQUENCE_TYPES)
+            or (not current_data and expected)
+            or (not expected and current_data)
+        ):
+            return False
+        items = self.items
+        if len(items) == len(current_data):
+            for node, data in zip(items, current_data):
+                if not node.is_valid(data):
+                    return False
+            return True
+        is_valid = items[0].is_valid
+        for data in current_data:
+            if not is_valid(data):
+                return False
+        return True
+
+
+class Field(Key):
+    """Key of dict with compiled node of value, it's the step of paths"""
+
+    __slots__ = ("node", "optional")
+
+    def __init__(self, key: Any, node: Node, optional: bool = False):
+        super(Field, self).__init__(key)
+        self.node = node
+        self.optional = optional
+
+    def __reduce__(self):
+        # steps of errors sent to other processes keep no nodes
+        return Key, (self.key,)
+
+    def __repr__(self):
+        if self.optional:
+            return "<Field OptionalKey(%s)>" % self.key
+        return "<Field %s>" % self.key
+
+
+class DictNode(Node):
+    """
+    Keys are checked by one hash lookup per key:
+    expected keys are looked up into current data,
+    extra keys are searched only when count of found keys
+    differs from size of current data.
+    Wide schemas are checked by keys of current data
+    when it has fewer keys, then errors follow order of current data.
+    With `report.fail_fast` the first error stops validation,
+    keys which were not visited are counted by `report.skip`
+    """
+
+    __slots__ = ("fields", "index", "required", "ignore_extra_keys", "literal")
+
+    exception = DictCheckerError
+
+    def __init__(
+        self,
+        expected_data: Any,
+        fields: Tuple[Field, ...],
+        ignore_extra_keys: bool = False,
+        literal: bool = False,
+    ):
+        super(DictNode, self).__init__(expected_data)
+        self.fields = fields
+        self.index = {field.key: field for field in fields}
+        self.required = sum(1 for field in fields if not field.optional)
+        self.ignore_extra_keys = ignore_extra_keys
+        self.literal = literal
+
+    def validate(
+        self, current_data: Any, report: Report, start: int = 0
+    ) -> bool:
+        """
+        :param any current_data:
+        :param Report report:
+        :param int start: fields before start were found and checked,
+            it lets decoder check fields while dict is decoded
+        :return: bool
+        """
+        if self.literal and current_data == self.expected_data:
+            return True
+
+        if not isinstance(current_data, dict):
+            report.add_or_raise(
+                ErrorRecord(TYPE, dict, current_data), self.exception
+            )
+            return False
+
+        fields = self.fields
+        if len(fields) >= WIDE_DICT_SIZE and len(current_data) < len(fields):
+            return self.validate_current_keys(current_data, report)
+
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        is_valid = True
+        found = start
+        for index, field in enumerate(fields[start:], start):
+            value = current_data.get(field.key, MISSING)
+            if value is MISSING:
+                if field.optional:
+                    continue
+                self.add_missing_key(report, soft, field, current_data)
+            else:
+                found += 1
+                mark = len(errors)
+                if field.node.validate(value, report):
+                    continue
+                report.soft = soft
+                report.add_group(mark, field, self.exception, self)
+            if report.fail_fast:
+                report.skip(len(fields) - index - 1)
+                return False
+            report.soft = True
+            is_valid = False
+        report.soft = soft
+
+        if found != len(current_data) and not self.ignore_extra_keys:
+            field_index = self.index
+            self.add_extra_keys(
+                report,
+                current_data,
+                [k for k in current_data if k not in field_index],
+            )
+            return False
+        return is_valid
+
+    def validate_current_keys(
+        self, current_data: dict, report: Report
+    ) -> bool:
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        is_valid = True
+        index = self.index
+        extra_keys = []
+        found = 0
+        for position, (key, value) in enumerate(current_data.items()):
+            field = index.get(key)
+            if field is None:
+                extra_keys.append(key)
+                continue
+            if not field.optional:
+                found += 1
+            mark = len(errors)
+            if field.node.validate(value, report):
+                continue
+            report.soft = soft
+            report.add_group(mark, field, self.exception, self)
+            if report.fail_fast:
+                report.skip(len(current_data) - position - 1)
+                return False
+            report.soft = True
+            is_valid = False
+
+        if found != self.required:
+            is_valid = False
+            for position, field in enumerate(self.fields):
+                if not field.optional and field.key not in current_data:
+                    self.add_missing_key(report, soft, field, current_data)
+                    if report.fail_fast:
+                        report.skip(len(self.fields) - position - 1)
+                        return False
+                    report.soft = True
+        report.soft = soft
+
+        if extra_keys and not self.ignore_extra_keys:
+            self.add_extra_keys(report, current_data, extra_keys)
+            return False
+        return is_valid
+
+    def is_valid(self, current_data: Any) -> bool:
+        if self.literal and current_data == self.expected_data:
+            return True
+        if not isinstance(current_data, dict):
+            return False
+
+        fields = self.fields
+        if len(fields) >= WIDE_DICT_SIZE and len(current_data) < len(fields):
+            if len(current_data) < self.required:
+                return False
+            index = self.index
+            found = 0
+            for key, value in current_data.items():
+                field = index.get(key)
+                if field is None:
+                    if self.ignore_extra_keys:
+                        continue
+                    return False
+                if not field.node.is_valid(value):
+                    return False
+                if not field.optional:
+                    found += 1
+            return found == self.required
+
+        found = 0
+        for field in fields:
+            value = current_data.get(field.key, MISSING)
+            if value is MISSING:
+                if field.optional:
+                    continue
+                return False
+            if not field.node.is_valid(value):
+                return False
+            found += 1
+        return found == len(current_data) or self.ignore_extra_keys
+
+    def add_missing_key(
+        self, report: Report, soft: bool, field: Field, current_data: dict
+    ):
+        report.soft = soft
+        report.add_or_raise(
+            ErrorRecord(MISSING_KEY, field.key, current_data),
+            MissKeyCheckerError,
+        )
+
+    def add_extra_keys(
+        self, report: Report, current_data: dict, keys: List[Any]
+    ):
+        report.add_or_raise(
+            ErrorRecord(EXTRA_KEYS, self.expected_data, current_data, keys),
+            MissKeyCheckerError,
+        )
+
+
+class OrNode(Node):
+    """
+    Candidates are picked by type of current data once per type,
+    if none of them is valid, errors of the closest one are reported,
+    counters of report are restored for errors of other candidates.
+    Candidate stopped by deadline or limit is reported as it is
+    """
+
+    __slots__ = ("alternatives", "candidates")
+
+    def __init__(self, expected_data: Or, alternatives: Tuple[Node, ...]):
+        super(OrNode, self).__init__(expected_data)
+        self.alternatives = alternatives
+        self.candidates: Dict[type, Tuple[Node, ...]] = {}
+
+    def get_candidates(self, data_type: type) -> Tuple[Node, ...]:
+        candidates = self.candidates.get(data_type)
+        if candidates is None:
+            candidates = tuple(
+                node
+                for node in self.alternatives
+                if is_type_of(node.expected_data, data_type)
+            )
+            self.candidates[data_type] = candidates
+        return candidates
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        return self.validate_by(current_data, report, validate_node)
+
+    def validate_by(
+        self, current_data: Any, report: Report, validate: NodeValidator
+    ) -> bool:
+        """Same as validate, candidates are validated by function"""
+        candidates = self.get_candidates(type(current_data))
+        if not candidates:
+            report.add(
+                ErrorRecord(NOT_VALID, self.expected_data, current_data)
+            )
+            return False
+
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        mark = len(errors)
+        snapshot = report.snapshot()
+        fail_fast = report.fail_fast
+        closest: List[Any] = []
+        closest_snapshot = snapshot
+        for index, node in enumerate(candidates):
+            # candidates are compared by all their errors, also by hard report
+            report.fail_fast = False
+            if validate(node, current_data, report):
+                report.soft = soft
+                report.fail_fast = fail_fast
+                return True
+            if report.stopped:
+                # record of deadline or limit keeps path of the reached value
+                report.soft = soft
+                return False
+            if not index or len(errors) - mark <= len(closest):
+                closest, closest_snapshot = errors[mark:], report.snapshot()
+            del errors[mark:]
+            report.restore(snapshot)
+        report.soft = soft
+        errors.extend(closest)
+        report.restore(closest_snapshot)
+        report.fail_fast = report.fail_fast or fail_fast
+        return False
+
+    def is_valid(self, current_data: Any) -> bool:
+        for node in self.get_candidates(type(current_data)):
+            if node.is_valid(current_data):
+                return True
+        return False
+
+
+class AndNode(Node):
+    """
+    Conditions are checked in order until the first failed,
+    errors of conditions are replaced by one error of And
+    unless validation was stopped by deadline or limit
+    """
+
+    __slots__ = ("conditions",)
+
+    def __init__(self, expected_data: And, conditions: Tuple[Node, ...]):
+        super(AndNode, self).__init__(expected_data)
+        self.conditions = conditions
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        return self.validate_by(current_data, report, validate_node)
+
+    def validate_by(
+        self, current_data: Any, report: Report, validate: NodeValidator
+    ) -> bool:
+        """Same as validate, conditions are validated by function"""
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        mark = len(errors)
+        snapshot = report.snapshot()
+        nodes = most = report.nodes
+        for node in self.conditions:
+            if not validate(node, current_data, report):
+                if report.stopped:
+                    report.soft = soft
+                    return False
+                del errors[mark:]
+                report.restore(snapshot)
+                report.soft = soft
+                report.add(
+                    ErrorRecord(NOT_VALID, self.expected_data, current_data)
+                )
+                return False
+            # limits count the same values once for all conditions
+            most = max(most, report.nodes)
+            report.nodes = nodes
+        report.nodes = most
+        report.soft = soft
+        return True
+
+    def is_valid(self, current_data: Any) -> bool:
+        for node in self.conditions:
+            if not node.is_valid(current_data):
+                return False
+        return True
+
+
+class CustomNode(Node):
+    """Falls back to `Validator` for data without compiled node"""
+
+    __slots__ = ("ignore_extra_keys",)
+
+    def __init__(self, expected_data: Any, ignore_extra_keys: bool = False):
+        super(CustomNode, self).__init__(expected_data)
+        self.ignore_extra_keys = ignore_extra_keys
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        soft_report = Report(soft=True)
+        checker = Validator(
+            expected_data=self.expected_data,
+            report=soft_report,
+            ignore_extra_keys=self.ignore_extra_keys,
+        )
+        checker.validate(current_data)
+        if soft_report.has_errors():
+            for message in soft_report.errors:
+                report.add(
+                    ErrorRecord(
+                        MESSAGE, self.expected_data, current_data, message
+                    )
+                )
+            return False
+        return True
+
+
+def compile_type(expected_data: type, ignore_extra_keys: bool) -> Node:
+    return TypeNode(expected_data)
+
+
+def compile_literal(expected_data: Any, ignore_extra_keys: bool) -> Node:
+    return LiteralNode(expected_data)
+
+
+def compile_function(expected_data: Callable, ignore_extra_keys: bool) -> Node:
+    return FunctionNode(expected_data)
+
+
+def compile_list(expected_data: Any, ignore_extra_keys: bool) -> Node:
+    items = tuple(compile_schema(item) for item in expected_data)
+    literal = all(item.literal for item in items)
+    return ListNode(expected_data, items, literal)
+
+
+def compile_dict(expected_data: dict, ignore_extra_keys: bool) -> Node:
+    fields = []
+    for key, value in expected_data.items():
+        optional = isinstance(key, OptionalKey)
+        if optional:
+            key = key.expected_data
+        node = compile_schema(value, ignore_extra_keys)
+        fields.append(Field(key, node, optional))
+    literal = all(f.node.literal and not f.optional for f in fields)
+    return DictNode(expected_data, tuple(fields), ignore_extra_keys, literal)
+
+
+def compile_or(expected_data: Or, ignore_extra_keys: bool) -> Node:
+    alternatives = tuple(
+        compile_schema(e) for e in expected_data.expected_data
+    )
+    return OrNode(expected_data, alternatives)
+
+
+def compile_and(expected_data: And, ignore_extra_keys: bool) -> Node:
+    conditions = tuple(compile_schema(e) for e in expected_data.expected_data)
+    return AndNode(expected_data, conditions)
+
+
+def compile_custom(expected_data: Any, ignore_extra_keys: bool) -> Node:
+    return CustomNode(expected_data, ignore_extra_keys)
+
+
+_compilers: Dict[type, Callable[[Any, bool], Node]] = {
+    type: compile_type,
+    object: compile_literal,
+    type(None): compile_literal,
+    int: compile_literal,
+    bool: compile_literal,
+    float: compile_literal,
+    str: compile_literal,
+    list: compile_list,
+    tuple: compile_list,
+    set: compile_list,
+    frozenset: compile_list,
+    dict: compile_dict,
+    OrderedDict: compile_dict,
+    FunctionType: compile_function,
+    Or: compile_or,
+    And: compile_and,
+}
+
+
+def compile_schema(
+    expected_data: Any, ignore_extra_keys: bool = False
+) -> Node:
+    """
+    Compile expected schema to the tree of nodes
+    Examples:
+    >>> from json_checker.core.reports import Report
+
+    >>> plan = compile_schema({"id": int, "items": [int]})
+    >>> plan.validate({"id": 1, "items": [1, 2]}, Report(soft=True))  # True
+    >>> plan.validate({"id": "1", "items": []}, Report(soft=True))  # False
+
+    Nested operators and containers (except dicts) are compiled without
+    `ignore_extra_keys` same as `Validator` does
+    :param any expected_data:
+    :param bool ignore_extra_keys:
+    :return: Node
+    """
+    compiler = _compilers.get(type(expected_data), compile_custom)
+    return compiler(expected_data, ignore_extra_keys)
@@ -0,0 +1,133 @@
+from time import monotonic
+from typing import Any
+
+from json_checker.core.compiler import (
+    AndNode,
+    CustomNode,
+    DictNode,
+    Field,
+    FunctionNode,
+    ListNode,
+    LiteralNode,
+    Node,
+    OrNode,
+    TypeNode,
+)
+from json_checker.core.errors import DEADLINE, ErrorRecord
+from json_checker.core.limits import LimitedNode
+from json_checker.core.reports import Report
+from json_checker.core.sampling import SampledListNode
+
+# time is checked once per so many visited nodes,
+# functions and custom checkers are checked every visit
+CHECK_INTERVAL = 256
+
+
+def start(report: Report, deadline: float):
+    """
+    :param Report report: report of one validation
+    :param float deadline: time.monotonic() when validation stops
+    """
+    report.deadline = deadline
+    report.countdown = CHECK_INTERVAL
+    report.expired = False
+
+
+def is_expired(report: Report) -> bool:
+    """
+    Check time when countdown is over, once deadline is exceeded
+    every next visited node fails without validation
+    """
+    if not report.expired:
+        report.countdown = CHECK_INTERVAL
+        deadline = report.deadline
+        report.expired = deadline is not None and monotonic() >= deadline
+        if report.expired:
+            report.truncated = True
+    return report.expired
+
+
+class TimedNode(Node):
+    """
+    Node which stops validation when deadline of report is exceeded,
+    it adds the deadline record and makes report fail fast, so containers
+    wrap the record by steps of path and skip the rest of their items
+    """
+
+    __slots__ = ("node", "weight")
+
+    def __init__(self, node: Node, weight: int = 1):
+        super(TimedNode, self).__init__(node.expected_data)
+        self.node = node
+        self.weight = weight
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.node)
+
+    @property
+    def exception(self):
+        return self.node.exception
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        report.countdown -= self.weight
+        if report.countdown <= 0 and is_expired(report):
+            report.fail_fast = True
+            report.add_or_raise(
+                ErrorRecord(DEADLINE, None, current_data), self.node.exception
+            )
+            return False
+        return self.node.validate(current_data, report)
+
+    def is_valid(self, current_data: Any) -> bool:
+        return self.node.is_valid(current_data)
+
+
+def timed_plan(node: Node) -> Node:
+    """
+    Copy of compiled plan where nodes are wrapped by TimedNode,
+    types and literals of dicts are counted by the dict, other nodes
+    are wrapped, plan without deadline has no checks of time
+    Examples:
+    >>> plan = timed_plan(compile_schema({"items": [{"id": int}]}))
+    >>> report = Report(soft=True)
+    >>> start(report, time.monotonic() + 0.05)
+    >>> plan.validate(data, report)
+    >>> report.expired  # True when data was not validated in 50 ms
+    >>> report.reached.path  # ('items', 5120)
+
+    :param Node node: compiled schema, it could be sampled or limited
+    :return: Node
+    """
+    weight = 1
+    if isinstance(node, LimitedNode):
+        return node.copy(timed_plan(node.node))
+    if isinstance(node, DictNode) and not node.literal:
+        fields = []
+        for field in node.fields:
+            if type(field.node) in (TypeNode, LiteralNode):
+                child = field.node
+                weight += 1
+            else:
+                child = timed_plan(field.node)
+            fields.append(Field(field.key, child, field.optional))
+        node = DictNode(
+            node.expected_data,
+            tuple(fields),
+            node.ignore_extra_keys,
+            node.literal,
+        )
+    elif isinstance(node, SampledListNode):
+        items = tuple(timed_plan(item) for item in node.items)
+        node = SampledListNode(node.expected_data, items, node.sample)
+    elif isinstance(node, ListNode) and not node.literal:
+        items = tuple(timed_plan(item) for item in node.items)
+        node = ListNode(node.expected_data, items, node.literal)
+    elif isinstance(node, OrNode):
+        alternatives = tuple(timed_plan(n) for n in node.alternatives)
+        node = OrNode(node.expected_data, alternatives)
+    elif isinstance(node, AndNode):
+        conditions = tuple(timed_plan(n) for n in node.conditions)
+        node = AndNode(node.expected_data, conditions)
+    elif isinstance(node, (FunctionNode, CustomNode)):
+        weight = CHECK_INTERVAL
+    return TimedNode(node, weight)
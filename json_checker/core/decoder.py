@@ -0,0 +1,212 @@
+import json
+import re
+from json.decoder import (  # type: ignore[attr-defined]
+    JSONDecodeError,
+    scanstring,
+)
+from typing import Any, Callable, Dict, List, Tuple, cast
+
+from json_checker.core.compiler import (
+    WIDE_DICT_SIZE,
+    DictNode,
+    Field,
+    ListNode,
+    Node,
+)
+from json_checker.core.reports import Report
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# whitespace matches empty string too, so its match is never None
+match_space = cast("Callable[[str, int], re.Match[str]]", WHITESPACE.match)
+
+DECODER = json.JSONDecoder()
+
+
+def decode(
+    plan: Node, text: str, report: Report, decoder: json.JSONDecoder = DECODER
+) -> Any:
+    """
+    Decode JSON text and check it by compiled plan at once:
+    values of top level list or dict are decoded one by one
+    by the C scanner and checked as soon as they are decoded,
+    so hard report stops decoding on the first invalid value.
+    Soft report and other schemas check the whole decoded document
+    Examples:
+    >>> from json_checker.core.compiler import compile_schema
+
+    >>> plan = compile_schema([{"id": int}])
+    >>> decode(plan, '[{"id": 1}]', Report(soft=False))  # [{'id': 1}]
+    >>> decode(plan, '[{"id": "1"}, {"id": 2}, ...]', Report(soft=False))
+    # ListCheckerError is raised, items after the first are not decoded
+
+    :param Node plan: compiled schema
+    :param str text: JSON document
+    :param Report report: errors of soft report are added to it
+    :param json.JSONDecoder decoder: decoder of values
+    :return: decoded document
+    :raises JSONDecodeError: text is not valid JSON
+    """
+    if text.startswith("\ufeff"):
+        raise JSONDecodeError(
+            "Unexpected UTF-8 BOM (decode using utf-8-sig)", text, 0
+        )
+    pos = match_space(text, 0).end()
+    if report.soft:
+        data = decoder.decode(text)
+        plan.validate(data, report)
+        return data
+
+    scan_once = decoder.scan_once  # type: ignore[attr-defined]
+    if (
+        text.startswith("{", pos)
+        and isinstance(plan, DictNode)
+        and not plan.literal
+        and len(plan.fields) < WIDE_DICT_SIZE
+    ):
+        data, pos = decode_dict(plan, text, pos + 1, report, scan_once)
+    elif (
+        text.startswith("[", pos)
+        and isinstance(plan, ListNode)
+        and not plan.literal
+    ):
+        data, pos = decode_list(plan, text, pos + 1, report, scan_once)
+    else:
+        data = decoder.decode(text)
+        plan.validate(data, report)
+        return data
+
+    pos = match_space(text, pos).end()
+    if pos != len(text):
+        raise JSONDecodeError("Extra data", text, pos)
+    return data
+
+
+def decode_value(text: str, pos: int, scan_once: Callable) -> Tuple[Any, int]:
+    try:
+        return scan_once(text, pos)
+    except StopIteration as e:
+        raise JSONDecodeError("Expecting value", text, e.value) from None
+
+
+def decode_dict(
+    plan: DictNode, text: str, pos: int, report: Report, scan_once: Callable
+) -> Tuple[dict, int]:
+    """
+    Fields are checked in order of schema when all previous fields
+    were decoded, missing and extra keys are checked after the end of dict,
+    so the raised error is the same as of decoded document,
+    but every value of duplicated key must be valid
+    :param DictNode plan:
+    :param str text:
+    :param int pos: position after "{"
+    :param Report report: hard report
+    :param callable scan_once:
+    :return: dict and position after "}"
+    """
+    fields = plan.fields
+    data: Dict[str, Any] = {}
+    checked = 0
+    incremental = True
+    pos = match_space(text, pos).end()
+    if text.startswith("}", pos):
+        plan.validate(data, report)
+        return data, pos + 1
+
+    while True:
+        if not text.startswith('"', pos):
+            raise JSONDecodeError(
+                "Expecting property name enclosed in double quotes", text, pos
+            )
+        key, pos = scanstring(text, pos + 1)
+        pos = match_space(text, pos).end()
+        if not text.startswith(":", pos):
+            raise JSONDecodeError("Expecting ':' delimiter", text, pos)
+        pos = match_space(text, pos + 1).end()
+        if key in data:
+            # the last value of duplicated key wins, it's checked at the end
+            # and previous values could be checked and raised already
+            incremental = False
+            checked = 0
+        data[key], pos = decode_value(text, pos, scan_once)
+        while (
+            incremental
+            and checked < len(fields)
+            and fields[checked].key in data
+        ):
+            check_field(plan, fields[checked], data, report)
+            checked += 1
+
+        pos = match_space(text, pos).end()
+        if text.startswith("}", pos):
+            break
+        if not text.startswith(",", pos):
+            raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = match_space(text, pos + 1).end()
+
+    plan.validate(data, report, checked)
+    return data, pos + 1
+
+
+def check_field(plan: DictNode, field: Field, data: dict, report: Report):
+    """Same as step of DictNode.validate for hard report"""
+    mark = len(report.errors)
+    report.soft = True
+    if not field.node.validate(data[field.key], report):
+        report.soft = False
+        report.add_group(mark, field, plan.exception, plan)
+    report.soft = False
+
+
+def decode_list(
+    plan: ListNode, text: str, pos: int, report: Report, scan_once: Callable
+) -> Tuple[List[Any], int]:
+    """
+    Items are checked as soon as they are decoded when schema has one item,
+    positional schemas are checked after the end of list,
+    because they depend on its length
+    :param ListNode plan:
+    :param str text:
+    :param int pos: position after "["
+    :param Report report: hard report
+    :param callable scan_once:
+    :return: list and position after "]"
+    """
+    node = plan.items[0] if len(plan.items) == 1 else None
+    errors = report.errors
+    match = match_space
+    data: List[Any] = []
+    append = data.append
+    pos = match(text, pos).end()
+    if not text.startswith("]", pos):
+        while True:
+            try:
+                value, pos = scan_once(text, pos)
+            except StopIteration as e:
+                raise JSONDecodeError(
+                    "Expecting value", text, e.value
+                ) from None
+            if node is not None:
+                mark = len(errors)
+                report.soft = True
+                if not node.validate(value, report):
+                    report.soft = False
+                    report.add_group(mark, len(data), plan.exception, plan)
+                report.soft = False
+            append(value)
+
+            # separators of json.dumps are checked without regex
+            if not text.startswith(",", pos):
+                pos = match(text, pos).end()
+                if text.startswith("]", pos):
+                    break
+                if not text.startswith(",", pos):
+                    raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+            pos += 1
+            if text.startswith(" ", pos):
+                pos += 1
+            pos = match(text, pos).end()
+
+    if node is None or not data:
+        plan.validate(data, report)
+    return data, pos + 1
@@ -0,0 +1,270 @@
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from json_checker.core.base import format_data, format_error_message
+
+# kinds of errors
+TYPE = "type"
+FUNCTION = "function"
+MISSING_KEY = "missing_key"
+EXTRA_KEYS = "extra_keys"
+NOT_VALID = "not_valid"
+MESSAGE = "message"
+DEADLINE = "deadline"
+LIMIT = "limit"
+
+
+class Key:
+    """Step of path into dict, other steps are indexes of lists"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __repr__(self):
+        return "<Key %s>" % self.key
+
+
+class ErrorRecord:
+    """
+    Compact error of validation, message is rendered on demand.
+    `path` is filled by `Report.records`
+    Examples:
+    >>> from json_checker.core.compiler import compile_schema
+    >>> from json_checker.core.reports import Report
+
+    >>> report = Report(soft=True)
+    >>> compile_schema({"items": [int]}).validate({"items": ["1"]}, report)
+    >>> error = next(report.records())
+    >>> error.kind  # 'type'
+    >>> error.path  # ('items', 0)
+    >>> error.pointer  # '/items/0'
+    >>> error.message()  # "current value '1' (str) is not int"
+    """
+
+    __slots__ = ("kind", "expected", "value", "detail", "path")
+
+    def __init__(self, kind: str, expected: Any, value: Any, detail=None):
+        """
+        :param str kind: one of error kinds
+        :param any expected: expected schema of value or missing key
+        :param any value: current data
+        :param any detail: extra keys, text of function error or message
+        """
+        self.kind = kind
+        self.expected = expected
+        self.value = value
+        self.detail = detail
+        self.path: Tuple[Any, ...] = ()
+
+    def __repr__(self):
+        return "<ErrorRecord %s %s>" % (self.kind, self.pointer or "/")
+
+    def __str__(self):
+        return self.message()
+
+    @property
+    def pointer(self) -> str:
+        """Path as JSON Pointer (RFC 6901)"""
+        return "".join(
+            "/" + str(step).replace("~", "~0").replace("/", "~1")
+            for step in self.path
+        )
+
+    def message(self) -> str:
+        kind = self.kind
+        if kind == TYPE:
+            return format_error_message(self.expected, self.value)
+        if kind == FUNCTION:
+            if self.detail is None:
+                data = format_data(self.value)
+            else:
+                data = self.detail
+            return "function error: %s with data %s" % (
+                format_data(self.expected),
+                data,
+            )
+        if kind == MISSING_KEY:
+            return "Missing keys in current response: %s" % self.expected
+        if kind == EXTRA_KEYS:
+            return "Missing keys in expected schema: %s" % ", ".join(
+                str(k) for k in self.detail
+            )
+        if kind == NOT_VALID:
+            return "Not valid data: %s" % format_error_message(
+                self.expected, self.value
+            )
+        if kind == DEADLINE:
+            return "Deadline of validation is exceeded"
+        if kind == LIMIT:
+            return "Limit %s is exceeded: %s" % (self.expected, self.detail)
+        return str(self.detail)
+
+
+class ErrorGroup:
+    """
+    Errors of one item of container, it's one message
+    prefixed by 'From key="key":' for items of dicts
+    """
+
+    __slots__ = ("step", "errors")
+
+    def __init__(self, step: Any, errors: List[Any]):
+        """
+        :param any step: Key of dict or index of list
+        :param list errors: records, groups or messages
+        """
+        self.step = step
+        self.errors = errors
+
+    def __repr__(self):
+        return "<ErrorGroup %s %s>" % (self.step, self.errors)
+
+    def __str__(self):
+        parts: List[str] = []
+        write(self, parts)
+        return "".join(parts)
+
+
+def write(error: Any, parts: List[str]):
+    if not isinstance(error, ErrorGroup):
+        parts.append(str(error))
+        return
+    if isinstance(error.step, Key):
+        parts.append('From key="%s": \n\t' % error.step.key)
+    for index, item in enumerate(error.errors):
+        if index:
+            parts.append("\n")
+        write(item, parts)
+
+
+def iter_records(errors: Sequence[Any]) -> Iterator[ErrorRecord]:
+    """Records of errors and nested groups with filled paths"""
+    path: List[Any] = []
+    stack = [iter(errors)]
+    while stack:
+        error = next(stack[-1], None)
+        if error is None:
+            stack.pop()
+            if path:
+                path.pop()
+        elif isinstance(error, ErrorGroup):
+            step = error.step
+            path.append(step.key if isinstance(step, Key) else step)
+            stack.append(iter(error.errors))
+        elif isinstance(error, ErrorRecord):
+            error.path = tuple(path)
+            if error.kind == MISSING_KEY:
+                error.path += (error.expected,)
+            yield error
+
+
+class Items:
+    """Step of path template for all items of list"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "[*]"
+
+    def __reduce__(self):
+        # the same sentinel after pickling
+        return "ITEMS"
+
+
+ITEMS = Items()
+
+
+def format_template(template: Sequence[Any]) -> str:
+    """
+    :param list template: keys of dicts and ITEMS for indexes of lists
+    :return: path template, e.g. `items[*].price`
+    """
+    parts = []
+    for step in template:
+        if step is ITEMS:
+            parts.append("[*]")
+        elif parts:
+            parts.append(".%s" % step)
+        else:
+            parts.append(str(step))
+    return "".join(parts)
+
+
+def record_template(record: ErrorRecord) -> str:
+    """
+    Path template of error record, indexes of lists are replaced by `[*]`,
+    the same as of ErrorAggregate of this error
+    """
+    return format_template(
+        [ITEMS if type(step) is int else step for step in record.path]
+    )
+
+
+class ErrorAggregate:
+    """
+    Errors of the same kind at the same path template,
+    indexes of lists are replaced by `[*]`, e.g. `items[*].price`.
+    Only the first `max_samples` paths and values are kept
+    """
+
+    __slots__ = ("kind", "template", "count", "first", "samples", "owner")
+
+    def __init__(self, record: ErrorRecord):
+        """
+        :param ErrorRecord record: the first error
+        """
+        self.kind = record.kind
+        self.first = record
+        self.count = 1
+        # reversed steps of sample paths are completed on the way up
+        if record.kind == MISSING_KEY:
+            self.template: Tuple[Any, ...] = (record.expected,)
+            self.samples = [([record.expected], record.value)]
+        else:
+            self.template = ()
+            self.samples = [([], record.value)]
+        self.owner: Any = None
+
+    def __repr__(self):
+        return "<ErrorAggregate %s %s %s>" % (
+            self.kind,
+            self.path_template or "/",
+            self.count,
+        )
+
+    def __str__(self):
+        return "%s: %s %s errors like %s at %s" % (
+            self.path_template,
+            self.count,
+            self.kind,
+            self.first.message(),
+            ", ".join(
+                "".join(
+                    "/" + str(step).replace("~", "~0").replace("/", "~1")
+                    for step in path
+                )
+                for path, _ in self.sample_paths()
+            ),
+        )
+
+    @property
+    def path_template(self) -> str:
+        return format_template(self.template)
+
+    def sample_paths(self) -> List[Tuple[Tuple[Any, ...], Any]]:
+        """Paths and values of samples"""
+        return [
+            (tuple(reversed(steps)), value) for steps, value in self.samples
+        ]
+
+    def add_step(self, step: Any, template_step: Any):
+        self.template = (template_step,) + self.template
+        for steps, _ in self.samples:
+            steps.append(step)
+
+    def merge(self, other: "ErrorAggregate", max_samples: int):
+        self.count += other.count
+        free = max_samples - len(self.samples)
+        if free > 0:
+            self.samples.extend(other.samples[:free])
@@ -1,5 +1,10 @@
 class CheckerError(Exception):
-    pass
+    @property
+    def report(self):
+        """Report with error records of failed validation or None"""
+        if self.args and hasattr(self.args[0], "records"):
+            return self.args[0]
+        return None
 
 
 class FunctionCheckerError(CheckerError):
@@ -20,3 +25,7 @@ class DictCheckerError(CheckerError):
 
 class MissKeyCheckerError(CheckerError):
     pass
+
+
+class LimitCheckerError(CheckerError):
+    """Data exceeds limits of checker, it was not validated wholly"""
@@ -0,0 +1,235 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from json_checker.core.compiler import DictNode, ListNode, Node
+from json_checker.core.errors import ErrorGroup, Key
+from json_checker.core.exceptions import CheckerError, MissKeyCheckerError
+from json_checker.core.reports import Report
+
+
+def wrap(
+    node: Node,
+    data: Any,
+    report: Report,
+    path: Tuple[Any, ...] = (),
+    exception: Optional[type] = None,
+) -> Any:
+    """
+    Lazy proxy of dict or list, None when data is checked at once
+    :param Node node: compiled schema of data
+    :param any data:
+    :param Report report: errors of soft checker are collected by it
+    :param tuple path: steps of errors from the root
+    :param type exception: raised by hard report for errors of values
+    :return: LazyDict | LazyList | None
+    """
+    if isinstance(node, DictNode) and isinstance(data, dict):
+        if node.literal and data == node.expected_data:
+            return None
+        return LazyDict(node, data, report, path, exception or node.exception)
+    # empty lists and sets are checked at once
+    if isinstance(node, ListNode) and isinstance(data, (list, tuple)):
+        if (node.literal and data == node.expected_data) or (
+            not data or not node.items
+        ):
+            return None
+        return LazyList(node, data, report, path, exception or node.exception)
+    return None
+
+
+def fail(
+    report: Report,
+    part: Report,
+    path: Tuple[Any, ...],
+    exception: type,
+):
+    """
+    Errors of part are grouped by steps of path the same as by
+    containers on the way up, hard report raises them
+    """
+    errors = part.errors
+    for step in reversed(path):
+        errors = [ErrorGroup(step, errors)]
+    if not report.soft:
+        report.raise_errors(errors, exception)
+    report.errors.extend(errors)
+    report.count += part.count
+
+
+class LazyNode:
+    """Values are checked on the first access and memoized"""
+
+    __slots__ = ("_node", "_data", "_report", "_path", "_exception", "_cache")
+
+    def __init__(
+        self,
+        node: Node,
+        data: Any,
+        report: Report,
+        path: Tuple[Any, ...],
+        exception: type,
+    ):
+        self._node = node
+        self._data = data
+        self._report = report
+        self._path = path
+        self._exception = exception
+        self._cache: Dict[Any, Any] = {}
+
+    def __repr__(self):
+        return "<%s %s checked=%s>" % (
+            type(self).__name__,
+            "".join(
+                "/%s" % (step.key if isinstance(step, Key) else step)
+                for step in self._path
+            )
+            or "/",
+            len(self._cache),
+        )
+
+    def __len__(self):
+        return len(self._data)
+
+    def _check(self, node: Node, value: Any, step: Any) -> Any:
+        """
+        :return: proxy of container or checked value
+        """
+        path = self._path + (step,)
+        proxy = wrap(node, value, self._report, path, self._exception)
+        if proxy is not None:
+            return proxy
+        self._validate(node, value, step)
+        return value
+
+    def _validate(self, node: Node, value: Any, step: Any) -> bool:
+        """Check the whole value without proxies"""
+        part = Report(soft=True, fail_fast=not self._report.soft)
+        if node.validate(value, part):
+            return True
+        fail(self._report, part, self._path + (step,), self._exception)
+        return False
+
+    def _visit(self):
+        """Check values which were never accessed"""
+        raise NotImplementedError
+
+    def finalize(self) -> Any:
+        """
+        Check values which were never accessed,
+        soft checker raises errors of all accessed values
+        :return: raw data
+        """
+        self._visit()
+        if self._report.has_errors():
+            raise CheckerError(self._report)
+        return self._data
+
+
+class LazyDict(LazyNode, Mapping):
+    """
+    Read-only proxy of dict, missing and extra keys are checked
+    on creation, values are checked on the first access
+    """
+
+    __slots__ = ()
+
+    _node: DictNode
+
+    def __init__(
+        self,
+        node: DictNode,
+        data: dict,
+        report: Report,
+        path: Tuple[Any, ...],
+        exception: type,
+    ):
+        super(LazyDict, self).__init__(node, data, report, path, exception)
+        part = Report(soft=True)
+        for field in node.fields:
+            if not field.optional and field.key not in data:
+                node.add_missing_key(part, True, field, data)
+                if not report.soft:
+                    break
+        if not node.ignore_extra_keys and not (
+            part.errors and not report.soft
+        ):
+            index = node.index
+            extra_keys = [k for k in data if k not in index]
+            if extra_keys:
+                node.add_extra_keys(part, data, extra_keys)
+        if part.errors:
+            fail(
+                report, part, path, exception if path else MissKeyCheckerError
+            )
+
+    def __getitem__(self, key: Any) -> Any:
+        cache = self._cache
+        if key in cache:
+            return cache[key]
+        value = self._data[key]
+        field = self._node.index.get(key)
+        if field is not None:
+            value = self._check(field.node, value, field)
+        cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def _visit(self):
+        data = self._data
+        cache = self._cache
+        for field in self._node.fields:
+            key = field.key
+            if key in cache:
+                value = cache[key]
+                if isinstance(value, LazyNode):
+                    value._visit()
+            elif key in data:
+                value = data[key]
+                self._validate(field.node, value, field)
+                cache[key] = value
+
+
+class LazyList(LazyNode, Sequence):
+    """
+    Read-only proxy of list, items are checked on the first access
+    by position or by the first expected item
+    """
+
+    __slots__ = ()
+
+    _node: ListNode
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+        data = self._data
+        # negative and out of range indexes are resolved by range
+        position = range(len(data))[index]
+        cache = self._cache
+        if position in cache:
+            return cache[position]
+        items = self._node.items
+        node = items[position] if len(items) == len(data) else items[0]
+        value = self._check(node, data[position], position)
+        cache[position] = value
+        return value
+
+    def _visit(self):
+        data = self._data
+        cache = self._cache
+        items = self._node.items
+        positional = len(items) == len(data)
+        for position, value in enumerate(data):
+            if position in cache:
+                value = cache[position]
+                if isinstance(value, LazyNode):
+                    value._visit()
+                continue
+            node = items[position] if positional else items[0]
+            self._validate(node, value, position)
+            cache[position] = value
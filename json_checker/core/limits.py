@@ -0,0 +1,286 @@
+import sys
+from typing import Any, Optional
+
+from json_checker.core.compiler import (
+    SEQUENCE_TYPES,
+    AndNode,
+    DictNode,
+    Field,
+    ListNode,
+    LiteralNode,
+    Node,
+    NodeValidator,
+    OrNode,
+    TypeNode,
+    validate_node,
+)
+from json_checker.core.errors import LIMIT, ErrorRecord
+from json_checker.core.reports import Report
+from json_checker.core.sampling import SampledListNode
+
+CONTAINER_TYPES = (dict,) + SEQUENCE_TYPES
+
+STRING_TYPES = (str, bytes, bytearray)
+
+
+class Limits:
+    """
+    Limits of untrusted data, they are checked before items of container
+    are visited, so data over limits is rejected by LimitCheckerError
+    without validation of its items
+    Examples:
+    >>> limits = Limits(max_depth=32, max_nodes=100000, max_length=10000)
+    >>> checker = Checker({"items": [{"name": str}]}, limits=limits)
+    >>> checker.validate({"items": [{"name": "item"}] * 20000})
+    # LimitCheckerError: Limit max_length is exceeded: 20000 items > 10000
+
+    :param int max_depth: nesting of dicts and lists validated by schema,
+        values of types like `dict` are not visited
+    :param int max_nodes: count of items of dicts and lists
+    :param int max_length: count of items of every list
+    :param int max_string: length of every str or bytes value
+    """
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        max_length: Optional[int] = None,
+        max_string: Optional[int] = None,
+    ):
+        for name, value in (
+            ("max_depth", max_depth),
+            ("max_nodes", max_nodes),
+            ("max_length", max_length),
+            ("max_string", max_string),
+        ):
+            if value is not None and value < 0:
+                raise ValueError(
+                    "%s can't be negative, got %r" % (name, value)
+                )
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_length = max_length
+        self.max_string = max_string
+
+    def __repr__(self):
+        return "<%s max_depth=%s max_nodes=%s max_length=%s max_string=%s>" % (
+            self.__class__.__name__,
+            self.max_depth,
+            self.max_nodes,
+            self.max_length,
+            self.max_string,
+        )
+
+    @property
+    def has_container_limits(self) -> bool:
+        return (
+            self.max_depth is not None
+            or self.max_nodes is not None
+            or self.max_length is not None
+        )
+
+
+def exceed(
+    report: Report, name: str, detail: str, current_data: Any, exception: type
+) -> bool:
+    """
+    Add record of exceeded limit and stop validation,
+    containers add steps of path to it the same as to other errors
+    """
+    report.exceeded = name
+    report.fail_fast = True
+    report.add_or_raise(
+        ErrorRecord(LIMIT, name, current_data, detail), exception
+    )
+    return False
+
+
+class LimitedNode(Node):
+    """Node which checks limits of data before its validation"""
+
+    __slots__ = ("node",)
+
+    def __init__(self, node: Node):
+        super(LimitedNode, self).__init__(node.expected_data)
+        self.node = node
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.node)
+
+    @property
+    def exception(self):
+        return self.node.exception
+
+    def copy(self, node: Node) -> "LimitedNode":
+        """The same limits of other node, e.g. of timed one"""
+        raise NotImplementedError
+
+
+class LimitedContainer(LimitedNode):
+    """
+    Dict or list which counts its items before they are visited,
+    values of other types are validated by node as they are.
+    Nodes of dicts and lists go one level deeper into data every one,
+    so depth of data is depth of node into plan
+    """
+
+    __slots__ = ("limits", "depth", "too_deep", "max_nodes", "max_length")
+
+    def __init__(self, node: Node, limits: Limits, depth: int = 1):
+        super(LimitedContainer, self).__init__(node)
+        self.limits = limits
+        self.depth = depth
+        self.too_deep = (
+            limits.max_depth is not None and depth > limits.max_depth
+        )
+        # limits which are not set are never exceeded
+        maxsize = sys.maxsize
+        self.max_nodes = (
+            maxsize if limits.max_nodes is None else limits.max_nodes
+        )
+        self.max_length = (
+            maxsize if limits.max_length is None else limits.max_length
+        )
+        if self.too_deep:
+            self.max_length = -1
+        elif isinstance(node, DictNode):
+            # other data than dict is rejected by type of dict node
+            self.max_length = maxsize
+
+    def copy(self, node: Node) -> LimitedNode:
+        return LimitedContainer(node, self.limits, self.depth)
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        return self.validate_by(current_data, report, validate_node)
+
+    def validate_by(
+        self, current_data: Any, report: Report, validate: NodeValidator
+    ) -> bool:
+        """Same as validate, data within limits is validated by function"""
+        if report.exceeded is None and isinstance(
+            current_data, CONTAINER_TYPES
+        ):
+            size = len(current_data)
+            nodes = report.nodes + size
+            if size <= self.max_length and nodes <= self.max_nodes:
+                report.nodes = nodes
+                return validate(self.node, current_data, report)
+            if self.too_deep:
+                name = "max_depth"
+                detail = "%s > %s" % (self.depth, self.limits.max_depth)
+            elif size > self.max_length:
+                name = "max_length"
+                detail = "%s items > %s" % (size, self.max_length)
+            else:
+                name = "max_nodes"
+                detail = "%s values > %s" % (nodes, self.max_nodes)
+        elif report.exceeded is not None:
+            name = report.exceeded
+            detail = "validation was stopped"
+        else:
+            return validate(self.node, current_data, report)
+        return exceed(report, name, detail, current_data, self.node.exception)
+
+
+class LimitedString(LimitedNode):
+    """Leaf which checks length of str and bytes values"""
+
+    __slots__ = ("max_string",)
+
+    def __init__(self, node: Node, max_string: int):
+        super(LimitedString, self).__init__(node)
+        self.max_string = max_string
+
+    def copy(self, node: Node) -> LimitedNode:
+        return LimitedString(node, self.max_string)
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        if (
+            isinstance(current_data, STRING_TYPES)
+            and len(current_data) > self.max_string
+        ):
+            return exceed(
+                report,
+                "max_string",
+                "%s > %s" % (len(current_data), self.max_string),
+                current_data,
+                self.node.exception,
+            )
+        return self.node.validate(current_data, report)
+
+
+def accepts_strings(node: Node) -> bool:
+    """
+    Types and literals which are not strings reject strings by themselves,
+    other leaves, e.g. functions, could spend time on long strings
+    """
+    if type(node) is TypeNode:
+        return any(issubclass(t, node.expected_data) for t in STRING_TYPES)
+    return type(node) is not LiteralNode
+
+
+def limited_plan(node: Node, limits: Limits, depth: int = 1) -> Node:
+    """
+    Copy of compiled plan where dicts and lists are wrapped
+    by LimitedContainer and leaves which accept strings by LimitedString,
+    operators are not wrapped, their alternatives are.
+    Count of values is kept by report, depth and lengths are checked
+    by every container
+    Examples:
+    >>> plan = compile_schema({"items": [{"name": str}]})
+    >>> plan = limited_plan(plan, Limits(max_nodes=1000, max_string=100))
+    >>> report = Report(soft=True)
+    >>> plan.validate(data, report)
+    >>> report.exceeded  # 'max_nodes' when data has too many values
+
+    :param Node node: compiled schema, it could be sampled
+    :param Limits limits:
+    :param int depth: nesting of data of node
+    :return: Node
+    """
+    if isinstance(node, DictNode):
+        if not node.literal:
+            fields = tuple(
+                Field(
+                    field.key,
+                    limited_plan(field.node, limits, depth + 1),
+                    field.optional,
+                )
+                for field in node.fields
+            )
+            node = DictNode(
+                node.expected_data,
+                fields,
+                node.ignore_extra_keys,
+                node.literal,
+            )
+    elif isinstance(node, ListNode):
+        if isinstance(node, SampledListNode):
+            items = tuple(
+                limited_plan(item, limits, depth + 1) for item in node.items
+            )
+            node = SampledListNode(node.expected_data, items, node.sample)
+        elif not node.literal:
+            items = tuple(
+                limited_plan(item, limits, depth + 1) for item in node.items
+            )
+            node = ListNode(node.expected_data, items, node.literal)
+    elif isinstance(node, OrNode):
+        alternatives = tuple(
+            limited_plan(child, limits, depth) for child in node.alternatives
+        )
+        return OrNode(node.expected_data, alternatives)
+    elif isinstance(node, AndNode):
+        conditions = tuple(
+            limited_plan(child, limits, depth) for child in node.conditions
+        )
+        return AndNode(node.expected_data, conditions)
+    else:
+        if limits.max_string is None or not accepts_strings(node):
+            return node
+        return LimitedString(node, limits.max_string)
+
+    if limits.has_container_limits:
+        return LimitedContainer(node, limits, depth)
+    return node
@@ -0,0 +1,674 @@
+import io
+import multiprocessing
+import multiprocessing.pool
+import pickle
+import queue
+import sys
+import threading
+import time
+from functools import partial
+from itertools import islice, repeat
+from multiprocessing.pool import ThreadPool
+from types import FunctionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from json_checker.core.compiler import (
+    SEQUENCE_TYPES,
+    WIDE_DICT_SIZE,
+    DictNode,
+    ListNode,
+    Node,
+)
+from json_checker.core.errors import ErrorAggregate
+from json_checker.core.registry import registry
+from json_checker.core.reports import Report
+
+# chunks grow or shrink until validation of one chunk takes so long
+TARGET_CHUNK_TIME = 0.05
+
+MIN_CHUNK_SIZE = 16
+
+MAX_CHUNK_SIZE = 4096
+
+# chunks sent to workers and not returned yet, per worker
+PENDING_CHUNKS = 2
+
+Result = Tuple[int, bool, Optional[Report]]
+
+SIZED_TYPES = SEQUENCE_TYPES + (dict,)
+
+
+class RegistryPickler(pickle.Pickler):
+    """Registered functions and types are pickled by registry names"""
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if isinstance(obj, (FunctionType, type)) and obj in registry:
+            return registry.name_of(obj)
+        return None
+
+
+class RegistryUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: str) -> Any:
+        return registry.resolve(pid)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Pickle obj with functions of schemas by registry names,
+    so registered lambdas can be sent to other processes
+    :param any obj:
+    :return: bytes
+    """
+    f = io.BytesIO()
+    try:
+        RegistryPickler(f, pickle.HIGHEST_PROTOCOL).dump(obj)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError(
+            "schema can't be sent to worker processes, "
+            "register its functions by json_checker.register: %s" % e
+        )
+    return f.getvalue()
+
+
+def loads(data: bytes) -> Any:
+    return RegistryUnpickler(io.BytesIO(data)).load()
+
+
+# checker of worker process, it's set once by init_worker
+_checker: Any = None
+
+# flag of cancelled parts of document, it's set once by init_worker
+_cancelled: Any = None
+
+
+def init_worker(payload: bytes, cancelled: Optional["SharedFlag"] = None):
+    global _checker, _cancelled
+    _checker = loads(payload)
+    _checker.compile(
+        generate=_checker._generate, cache_dir=_checker._cache_dir
+    )
+    _cancelled = cancelled
+
+
+def validate_chunk(
+    start: int, items: List[Any], only_failures: bool, only_valid: bool
+) -> Tuple[float, List[Tuple[int, bool, Optional[bytes]]]]:
+    """
+    :param int start: index of the first item
+    :param list items:
+    :param bool only_failures:
+    :param bool only_valid:
+    :return: time of validation and results with pickled reports
+    """
+    started = time.perf_counter()
+    results = []
+    for index, ok, report in _checker.validate_many(
+        items, only_failures=only_failures, only_valid=only_valid
+    ):
+        if report is not None:
+            detach(report)
+            report = dumps(report)
+        results.append((start + index, ok, report))
+    return time.perf_counter() - started, results
+
+
+def detach(report: Report):
+    """Aggregates of root container keep no compiled nodes"""
+    for error in report.errors:
+        if isinstance(error, ErrorAggregate):
+            error.owner = None
+
+
+def iter_chunks(
+    items: Iterable[Any], sizes: Iterator[int]
+) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    :param iterable items:
+    :param iterator sizes: size of every next chunk
+    :return: iterator of (index of the first item, chunk)
+    """
+    iterator = iter(items)
+    start = 0
+    while True:
+        chunk: List[Any] = []
+        append = chunk.append
+        for _ in range(next(sizes)):
+            try:
+                append(next(iterator))
+            except StopIteration:
+                break
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+class ChunkSizes:
+    """
+    Adaptive sizes of chunks: chunks grow while they are validated faster
+    than TARGET_CHUNK_TIME and shrink when they are slower
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        """
+        :param int chunk_size: fixed size of chunks
+        """
+        self.fixed = chunk_size is not None
+        self.size = chunk_size or MIN_CHUNK_SIZE
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        return self.size
+
+    def update(self, count: int, elapsed: float):
+        """
+        :param int count: size of validated chunk
+        :param float elapsed: time of its validation
+        """
+        if self.fixed or not count:
+            return
+        per_item = max(elapsed, 1e-6) / count
+        size = int(TARGET_CHUNK_TIME / per_item)
+        self.size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, size))
+
+
+def validate_many(
+    checker: Any,
+    items: Iterable[Any],
+    workers: int,
+    ordered: bool = True,
+    chunk_size: Optional[int] = None,
+    only_failures: bool = False,
+    only_valid: bool = False,
+) -> Iterator[Result]:
+    """
+    Validate items by pool of processes, checker is sent
+    to every worker once, items are sent by chunks.
+    Only `workers * PENDING_CHUNKS` chunks are in flight,
+    so unbounded iterators are validated in constant memory
+    :param Checker checker:
+    :param iterable items:
+    :param int workers: count of processes
+    :param bool ordered: results in order of items,
+        otherwise in order of validated chunks
+    :param int chunk_size: fixed size of chunks, adaptive by default
+    :param bool only_failures:
+    :param bool only_valid:
+    :return: iterator of (index, ok, report)
+    """
+    payload = dumps(checker)
+    sizes = ChunkSizes(chunk_size)
+    collector = Collector(sizes, ordered)
+    limit = workers * PENDING_CHUNKS
+    pool = multiprocessing.Pool(workers, init_worker, (payload,))
+    try:
+        # chunks sent and not yielded yet, ordered ones wait into buffer
+        in_flight = 0
+        chunks = iter_chunks(items, sizes)
+        for number, (start, chunk) in enumerate(chunks):
+            pool.apply_async(
+                validate_chunk,
+                (start, chunk, only_failures, only_valid),
+                callback=collector.callback(number, len(chunk)),
+                error_callback=collector.callback(number, len(chunk)),
+            )
+            in_flight += 1
+            while in_flight >= limit:
+                for results in collector.wait():
+                    in_flight -= 1
+                    yield from results
+        while in_flight:
+            for results in collector.wait():
+                in_flight -= 1
+                yield from results
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+class Collector:
+    """Results of chunks, ordered ones wait until previous chunks are done"""
+
+    def __init__(self, sizes: ChunkSizes, ordered: bool):
+        self.sizes = sizes
+        self.ordered = ordered
+        self.done: "queue.Queue[Tuple[int, int, Any]]" = queue.Queue()
+        self.buffer: Dict[int, List[Result]] = {}
+        self.next_number = 0
+
+    def callback(self, number: int, size: int) -> Callable[[Any], None]:
+        return lambda result: self.done.put((number, size, result))
+
+    def wait(self) -> Iterator[List[Result]]:
+        """Wait for the next validated chunk and yield ready results"""
+        number, size, result = self.done.get()
+        if isinstance(result, BaseException):
+            raise result
+        elapsed, results = result
+        self.sizes.update(size, elapsed)
+        results = [
+            (index, ok, report if report is None else loads(report))
+            for index, ok, report in results
+        ]
+        if not self.ordered:
+            yield results
+            return
+        buffer = self.buffer
+        buffer[number] = results
+        while self.next_number in buffer:
+            yield buffer.pop(self.next_number)
+            self.next_number += 1
+
+
+# parts of huge document per worker, more parts balance load better
+PARTS_PER_WORKER = 4
+
+# document is sent to worker processes only when they are expected
+# to be so many times faster than this process, time of validation
+# is measured on a part of document and time of sending on other one
+MIN_SPEEDUP = 1.5
+
+# failure of item of document part: index, errors, count and skipped
+Failure = Tuple[int, List[Any], int, int]
+
+# failures of part of document, validated by workers or by this thread
+Part = Callable[[], List[Failure]]
+
+
+def free_threading() -> bool:
+    """Threads run python code in parallel on free-threaded builds only"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def document_size(plan: Node, data: Any) -> int:
+    """
+    Count of items of top level list or sum of sizes of values of dict,
+    0 when document can't be split between workers
+    :param Node plan: compiled schema of document
+    :param any data:
+    :return: int
+    """
+    if isinstance(plan, ListNode):
+        if plan.literal or not plan.items or type(data) not in (list, tuple):
+            return 0
+        return len(data)
+    if isinstance(plan, DictNode):
+        fields = plan.fields
+        if (
+            plan.literal
+            or not isinstance(data, dict)
+            or len(data) < 2
+            or (len(fields) >= WIDE_DICT_SIZE and len(data) < len(fields))
+        ):
+            return 0
+        return sum(value_size(value) for value in data.values())
+    return 0
+
+
+def value_size(value: Any) -> int:
+    return len(value) if isinstance(value, SIZED_TYPES) else 1
+
+
+def validate_part(
+    nodes: Iterable[Node],
+    items: Iterable[Any],
+    offset: int,
+    report: Report,
+    cancelled: Any = None,
+) -> List[Failure]:
+    """
+    Validate part of container, errors of every failed item are kept
+    apart and are grouped when the part is merged into report of document
+    :param iterable nodes: node of every item
+    :param iterable items:
+    :param int offset: index of the first item
+    :param Report report: empty soft report of part
+    :param cancelled: event or SharedFlag, stop validation when it's set
+    :return: list of failures
+    """
+    errors = report.errors
+    failures = []
+    for index, (node, data) in enumerate(zip(nodes, items), offset):
+        if cancelled is not None and cancelled.is_set():
+            break
+        count, skipped = report.count, report.skipped
+        if node.validate(data, report):
+            continue
+        failures.append(
+            (index, errors[:], report.count - count, report.skipped - skipped)
+        )
+        del errors[:]
+        if report.fail_fast:
+            break
+    return failures
+
+
+def item_nodes(plan: ListNode, positional: bool, start: int) -> Iterable[Node]:
+    """Nodes of items of list from start"""
+    if positional:
+        return plan.items[start:]
+    return repeat(plan.items[0])
+
+
+def dumps_failures(failures: List[Failure]) -> bytes:
+    """Failures sent from worker process, aggregates keep no nodes"""
+    for _, errors, _, _ in failures:
+        for error in errors:
+            if isinstance(error, ErrorAggregate):
+                error.owner = None
+    return dumps(failures)
+
+
+def validate_items_part(
+    offset: int, items: bytes, report: Report, positional: bool
+) -> bytes:
+    """Task of worker process for pickled part of top level list"""
+    nodes = item_nodes(_checker._plan, positional, offset)
+    return dumps_failures(
+        validate_part(nodes, pickle.loads(items), offset, report, _cancelled)
+    )
+
+
+def validate_value(position: int, value: bytes, report: Report) -> bytes:
+    """Task of worker process for pickled value of top level dict"""
+    node = _checker._plan.fields[position].node
+    return dumps_failures(
+        validate_part((node,), (pickle.loads(value),), 0, report, _cancelled)
+    )
+
+
+class SharedFlag:
+    """Flag of cancellation shared with worker processes"""
+
+    def __init__(self):
+        self.flag = multiprocessing.RawValue("b", 0)
+
+    def is_set(self) -> bool:
+        return bool(self.flag.value)
+
+    def set(self):
+        self.flag.value = 1
+
+    def clear(self):
+        self.flag.value = 0
+
+
+class DocumentWorkers:
+    """
+    Threads on free-threaded builds, processes otherwise.
+    Threads share compiled plan of document, processes get checker once.
+    Checker keeps workers for next documents until it's closed
+    """
+
+    def __init__(self, checker: Any, workers: int):
+        self.workers = workers
+        self.threads = free_threading()
+        # parts sent to workers by validation of current document
+        self.sent: List[Any] = []
+        self.pool: multiprocessing.pool.Pool
+        if self.threads:
+            self.cancelled: Any = threading.Event()
+            self.pool = ThreadPool(workers)
+        else:
+            self.cancelled = SharedFlag()
+            self.pool = multiprocessing.Pool(
+                workers, init_worker, (dumps(checker), self.cancelled)
+            )
+
+    def close(self):
+        """Stop workers, validation of sent parts is cancelled"""
+        self.cancelled.set()
+        self.pool.terminate()
+        self.pool.join()
+
+    def finish(self):
+        """
+        Cancel validation of parts which are not merged yet
+        and wait for workers, so they are free for the next document
+        """
+        if not self.sent:
+            return
+        self.cancelled.set()
+        for result in self.sent:
+            result.wait()
+        self.sent = []
+        self.cancelled.clear()
+
+    def send(self, func: Callable, args: Tuple[Any, ...]) -> Part:
+        result = self.pool.apply_async(func, args)
+        self.sent.append(result)
+        if self.threads:
+            return result.get
+        return lambda: loads(result.get())
+
+    def pickled(self, value: Any, validated: float) -> Optional[bytes]:
+        """
+        Value pickled for worker processes, None when this process
+        validates it faster than workers do with time of its sending
+        :param any value: part of document
+        :param float validated: seconds of its validation by this process
+        :return: bytes or None
+        """
+        started = time.perf_counter()
+        try:
+            pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return None
+        sent = time.perf_counter() - started
+        if validated < MIN_SPEEDUP * (sent + validated / self.workers):
+            return None
+        return pickled
+
+
+def validate_document(
+    checker: Any, plan: Node, data: Any, report: Report
+) -> bool:
+    """
+    Validate huge top level list by parts or dict by values between workers
+    of checker. Failures of parts are merged into report in order of items
+    same as `ListNode` and `DictNode` do, so report is the same as
+    of sequential validation. With fail_fast the first error
+    cancels validation of next parts.
+    Worker processes get only parts which they validate faster than
+    this process does with time of sending of part, it's measured
+    by the first part or value of document
+    :param Checker checker:
+    :param Node plan: ListNode or DictNode, see document_size
+    :param any data:
+    :param Report report:
+    :return: bool
+    """
+    pool = checker.document_workers()
+    try:
+        if isinstance(plan, ListNode):
+            return merge_items(pool, plan, data, report)
+        if isinstance(plan, DictNode):
+            return merge_values(pool, plan, data, report)
+        return plan.validate(data, report)
+    finally:
+        pool.finish()
+
+
+def validated_part(
+    nodes: Iterable[Node], items: Iterable[Any], offset: int, report: Report
+) -> Tuple[Part, float]:
+    """Part validated by this thread and seconds of its validation"""
+    started = time.perf_counter()
+    failures = validate_part(nodes, items, offset, report)
+    return (lambda: failures), time.perf_counter() - started
+
+
+def merge_failure(
+    report: Report,
+    failure: Failure,
+    soft: bool,
+    step: Any,
+    plan: Node,
+):
+    _, errors, count, skipped = failure
+    mark = len(report.errors)
+    report.errors.extend(errors)
+    report.count += count
+    if report.max_errors is not None and report.count >= report.max_errors:
+        report.fail_fast = True
+    report.skip(skipped)
+    report.soft = soft
+    report.add_group(mark, step, plan.exception, plan)
+
+
+def merge_items(
+    pool: DocumentWorkers, plan: ListNode, data: Any, report: Report
+) -> bool:
+    size = len(data)
+    step = -(-size // (pool.workers * PARTS_PER_WORKER))
+    positional = len(plan.items) == size
+    if pool.threads:
+        parts = [
+            pool.send(
+                validate_part,
+                (
+                    item_nodes(plan, positional, start),
+                    data[start:end],
+                    start,
+                    report.create_part(),
+                    pool.cancelled,
+                ),
+            )
+            for start, end in zip(
+                range(0, size, step), range(step, size + step, step)
+            )
+        ]
+    else:
+        parts = send_items(pool, plan, data, step, report)
+
+    soft = report.soft
+    report.soft = True
+    is_valid = True
+    for get in parts:
+        for failure in get():
+            index = failure[0]
+            merge_failure(report, failure, soft, index, plan)
+            is_valid = False
+            if report.fail_fast:
+                report.skip(size - index - 1)
+                return False
+            report.soft = True
+    report.soft = soft
+    return is_valid
+
+
+def send_items(
+    pool: DocumentWorkers, plan: ListNode, data: Any, step: int, report: Report
+) -> List[Part]:
+    """
+    Parts of list for worker processes, the first part is validated
+    by this process, the rest is validated by it too when it's faster
+    """
+    size = len(data)
+    positional = len(plan.items) == size
+    # the first part measures time of validation by this process
+    part = report.create_part()
+    first, elapsed = validated_part(
+        item_nodes(plan, positional, 0), islice(data, step), 0, part
+    )
+    parts = [first]
+    if part.fail_fast and first():
+        return parts
+    rate = elapsed / min(step, size)
+    for start in range(step, size, step):
+        stop = min(start + step, size)
+        items = pool.pickled(data[start:stop], rate * (stop - start))
+        if items is None:
+            parts.append(
+                partial(
+                    validate_part,
+                    item_nodes(plan, positional, start),
+                    islice(data, start, None),
+                    start,
+                    report.create_part(),
+                )
+            )
+            break
+        parts.append(
+            pool.send(
+                validate_items_part,
+                (start, items, report.create_part(), positional),
+            )
+        )
+    return parts
+
+
+def merge_values(
+    pool: DocumentWorkers, plan: DictNode, data: dict, report: Report
+) -> bool:
+    fields = plan.fields
+    values: Dict[int, Part] = {}
+    rate: Optional[float] = None
+    for position, field in enumerate(fields):
+        if field.key not in data:
+            continue
+        value = data[field.key]
+        part = report.create_part()
+        if pool.threads:
+            values[position] = pool.send(
+                validate_part,
+                ((field.node,), (value,), 0, part, pool.cancelled),
+            )
+        elif rate is None:
+            # the first value measures time of validation by this process
+            values[position], elapsed = validated_part(
+                (field.node,), (value,), 0, part
+            )
+            rate = elapsed / value_size(value)
+        else:
+            pickled = pool.pickled(value, rate * value_size(value))
+            if pickled is None:
+                values[position] = partial(
+                    validate_part, (field.node,), (value,), 0, part
+                )
+            else:
+                values[position] = pool.send(
+                    validate_value, (position, pickled, part)
+                )
+
+    soft = report.soft
+    report.soft = True
+    is_valid = True
+    for position, field in enumerate(fields):
+        get = values.get(position)
+        if get is None:
+            if field.optional:
+                continue
+            plan.add_missing_key(report, soft, field, data)
+        else:
+            failures = get()
+            if not failures:
+                continue
+            merge_failure(report, failures[0], soft, field, plan)
+        if report.fail_fast:
+            report.skip(len(fields) - position - 1)
+            return False
+        report.soft = True
+        is_valid = False
+    report.soft = soft
+
+    if len(values) != len(data) and not plan.ignore_extra_keys:
+        index = plan.index
+        plan.add_extra_keys(report, data, [k for k in data if k not in index])
+        return False
+    return is_valid
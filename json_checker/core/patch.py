@@ -0,0 +1,572 @@
+from copy import deepcopy
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from json_checker.core.compiler import DictNode, ListNode, Node
+from json_checker.core.errors import (
+    EXTRA_KEYS,
+    MISSING_KEY,
+    ErrorGroup,
+    ErrorRecord,
+    Key,
+)
+from json_checker.core.reports import Report
+
+# kinds of changes: value by path, keys of dict, length of list
+VALUE = "value"
+KEYS = "keys"
+LENGTH = "length"
+
+# results of walk by path of changed value
+FOUND = "found"
+GONE = "gone"
+UNCHECKED = "unchecked"
+
+
+def parse_pointer(pointer: Any) -> List[str]:
+    """
+    Tokens of JSON Pointer (RFC 6901)
+    Examples:
+    >>> parse_pointer("/items/0/a~1b")  # ['items', '0', 'a/b']
+    >>> parse_pointer("")  # []
+
+    :param str pointer:
+    :return: list of str
+    """
+    if not isinstance(pointer, str) or not (
+        pointer == "" or pointer.startswith("/")
+    ):
+        raise ValueError("not valid JSON pointer %r" % (pointer,))
+    return [
+        token.replace("~1", "/").replace("~0", "~")
+        for token in pointer.split("/")[1:]
+    ]
+
+
+def list_index(token: str, size: int, append: bool = False) -> int:
+    """
+    :param str token: index or "-" after the last item
+    :param int size: count of valid indexes
+    :param bool append: "-" is accepted, it's index of added item
+    :return: int
+    """
+    if token == "-" and append:
+        index = size - 1
+    elif token.isdigit() and (token == "0" or not token.startswith("0")):
+        index = int(token)
+    else:
+        raise ValueError("not valid index %r of list" % token)
+    if index >= size or index < 0:
+        raise ValueError("index %s is out of range" % token)
+    return index
+
+
+class Changes:
+    """
+    Changed paths of patched document, paths are kept with indexes
+    of patched document: items of lists after inserted or removed items
+    are shifted, so are errors of previous report
+    """
+
+    def __init__(self, errors: List[Any]):
+        """
+        :param list errors: errors of previous report, they are not changed
+        """
+        self.paths: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.tree = ErrorTree(errors)
+
+    def add(self, kind: str, path: Tuple[Any, ...]):
+        self.paths.append((kind, path))
+
+    def shift(self, path: Tuple[Any, ...], index: int, delta: int):
+        """
+        Item was inserted into list (delta=1) or removed from it (delta=-1)
+        :param tuple path: path of list
+        :param int index: index of item
+        :param int delta:
+        """
+        depth = len(path)
+        rest = depth + 1
+        paths = []
+        for kind, steps in self.paths:
+            if (
+                len(steps) > depth
+                and steps[:depth] == path
+                and type(steps[depth]) is int
+                and steps[depth] >= index
+            ):
+                if delta < 0 and steps[depth] == index:
+                    continue
+                steps = path + (steps[depth] + delta,) + steps[rest:]
+            paths.append((kind, steps))
+        self.paths = paths
+        self.tree.shift(path, index, delta)
+
+
+def apply_patch(
+    document: Any, patch: List[Dict[str, Any]], changes: Changes
+) -> Any:
+    """
+    Apply operations of JSON Patch (RFC 6902) to document in place,
+    document is restored when any operation fails
+    Examples:
+    >>> document = {"items": [1]}
+    >>> apply_patch(document, [{"op": "add", "path": "/items/-", "value": 2}])
+    # {'items': [1, 2]}
+
+    :param any document: dicts and lists
+    :param list patch: operations
+    :param Changes changes: changed paths are added to it
+    :return: patched document, it's a new value when root is replaced
+    :raises ValueError: patch is not valid or its test failed
+    """
+    undo: List[Callable[[], Any]] = []
+    try:
+        for operation in patch:
+            document = apply_operation(document, operation, changes, undo)
+    except (ValueError, KeyError, TypeError) as e:
+        for restore in reversed(undo):
+            restore()
+        if isinstance(e, ValueError):
+            raise
+        raise ValueError("not valid patch operation: %r" % (e,)) from None
+    return document
+
+
+def resolve(document: Any, tokens: List[str]) -> Tuple[Any, Tuple[Any, ...]]:
+    """
+    :return: value by tokens and its path with indexes of lists
+    """
+    path: List[Any] = []
+    for token in tokens:
+        if isinstance(document, dict) and token in document:
+            path.append(token)
+            document = document[token]
+        elif isinstance(document, list):
+            index = list_index(token, len(document))
+            path.append(index)
+            document = document[index]
+        else:
+            raise ValueError("path /%s is not found" % "/".join(tokens))
+    return document, tuple(path)
+
+
+def apply_operation(
+    document: Any,
+    operation: Dict[str, Any],
+    changes: Changes,
+    undo: List[Callable[[], Any]],
+) -> Any:
+    op = operation.get("op")
+    tokens = parse_pointer(operation.get("path"))
+    if op == "add":
+        return add(document, tokens, operation["value"], changes, undo)
+    if op == "remove":
+        return remove(document, tokens, changes, undo)
+    if op == "replace":
+        _, path = resolve(document, tokens)
+        if not path:
+            changes.add(VALUE, ())
+            return operation["value"]
+        container, _ = resolve(document, tokens[:-1])
+        step = path[-1]
+        undo.append(partial(container.__setitem__, step, container[step]))
+        container[step] = operation["value"]
+        changes.add(VALUE, path)
+        return document
+    if op in ("move", "copy"):
+        source = parse_pointer(operation.get("from"))
+        value, _ = resolve(document, source)
+        size = len(source)
+        if op == "copy":
+            value = deepcopy(value)
+        elif source == tokens:
+            return document
+        elif tokens[:size] == source:
+            raise ValueError("value can't be moved into itself")
+        else:
+            document = remove(document, source, changes, undo)
+        return add(document, tokens, value, changes, undo)
+    if op == "test":
+        value, _ = resolve(document, tokens)
+        if value != operation["value"]:
+            raise ValueError("test of %s failed" % operation["path"])
+        return document
+    raise ValueError("not valid patch operation %r" % (op,))
+
+
+def add(
+    document: Any,
+    tokens: List[str],
+    value: Any,
+    changes: Changes,
+    undo: List[Callable[[], Any]],
+) -> Any:
+    if not tokens:
+        changes.add(VALUE, ())
+        return value
+    container, path = resolve(document, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(container, dict):
+        if token in container:
+            undo.append(
+                partial(container.__setitem__, token, container[token])
+            )
+        else:
+            undo.append(lambda: container.__delitem__(token))
+            changes.add(KEYS, path)
+        container[token] = value
+        changes.add(VALUE, path + (token,))
+    elif isinstance(container, list):
+        index = list_index(token, len(container) + 1, append=True)
+        container.insert(index, value)
+        undo.append(lambda: container.__delitem__(index))
+        changes.shift(path, index, 1)
+        changes.add(LENGTH, path)
+        changes.add(VALUE, path + (index,))
+    else:
+        raise ValueError("path /%s is not found" % "/".join(tokens))
+    return document
+
+
+def remove(
+    document: Any,
+    tokens: List[str],
+    changes: Changes,
+    undo: List[Callable[[], Any]],
+) -> Any:
+    if not tokens:
+        raise ValueError("root of document can't be removed")
+    container, path = resolve(document, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(container, dict) and token in container:
+        keys = list(container)
+        undo.append(
+            partial(restore, container, keys, token, container.pop(token))
+        )
+        changes.add(KEYS, path)
+        changes.add(VALUE, path + (token,))
+    elif isinstance(container, list):
+        index = list_index(token, len(container))
+        undo.append(partial(container.insert, index, container.pop(index)))
+        changes.shift(path, index, -1)
+        changes.add(LENGTH, path)
+    else:
+        raise ValueError("path /%s is not found" % "/".join(tokens))
+    return document
+
+
+def restore(container: dict, keys: List[Any], key: Any, value: Any):
+    """Put removed key back, keys after it are moved to keep order"""
+    container[key] = value
+    start = keys.index(key) + 1
+    for other in keys[start:]:
+        container[other] = container.pop(other)
+
+
+def revalidate(node: Node, document: Any, changes: Changes) -> List[Any]:
+    """
+    Validate changed values of patched document and keys of changed dicts,
+    their errors replace errors of the same paths of previous report.
+    Values are validated by the first node on the way from root
+    which is not a container: operators and functions validate
+    the whole value of own path
+    :param Node node: compiled schema
+    :param any document: patched document
+    :param Changes changes:
+    :return: errors of patched document
+    """
+    tree = changes.tree
+    done: Set[Tuple[Any, ...]] = set()
+
+    def is_done(path: Tuple[Any, ...]) -> bool:
+        return any(path[:depth] in done for depth in range(len(path) + 1))
+
+    # values from root, then keys and lengths of containers
+    paths = sorted(
+        dict.fromkeys(changes.paths), key=lambda p: (p[0] != VALUE, len(p[1]))
+    )
+    for kind, path in paths:
+        if is_done(path):
+            continue
+        trail, current, data, status = walk(node, document, path)
+        depth = len(trail)
+        if status == GONE:
+            tree.remove(path[:depth] + (path[depth],))
+        elif status == UNCHECKED:
+            continue
+        elif (
+            depth == len(path)
+            and kind == KEYS
+            and isinstance(current, DictNode)
+            and is_container(current, data, dict)
+        ):
+            tree.replace_keys(trail, path, current, data)
+        elif (
+            depth == len(path)
+            and kind == LENGTH
+            and isinstance(current, ListNode)
+            and is_container(current, data, list)
+            and len(current.items) == 1
+            and len(data) > 1
+        ):
+            # items are checked by the same node for any length
+            tree.replace_own(trail, path, current, [])
+        elif not is_done(path[:depth]):
+            tree.replace(trail, current, data)
+            done.add(path[:depth])
+    return tree.errors
+
+
+def is_container(node: Node, data: Any, data_type: type) -> bool:
+    return not node.literal and isinstance(data, data_type)
+
+
+def walk(
+    node: Node, data: Any, path: Tuple[Any, ...]
+) -> Tuple[List[Tuple[Node, Any]], Node, Any, str]:
+    """
+    Follow path by containers of schema until the first node
+    which is not a container
+    :return: trail of containers and steps, node and data
+        at the end of trail, status of path
+    """
+    trail: List[Tuple[Node, Any]] = []
+    for step in path:
+        if (
+            isinstance(node, DictNode)
+            and not node.literal
+            and isinstance(data, dict)
+        ):
+            field = node.index.get(step)
+            if field is None:
+                # values of extra keys are not validated
+                return trail, node, data, UNCHECKED
+            if step not in data:
+                return trail, node, data, GONE
+            trail.append((node, field))
+            node, data = field.node, data[step]
+        elif (
+            isinstance(node, ListNode)
+            and not node.literal
+            and node.items
+            and isinstance(data, (list, tuple))
+            and type(step) is int
+        ):
+            if step >= len(data):
+                return trail, node, data, GONE
+            items = node.items
+            trail.append((node, step))
+            node = items[step] if len(items) == len(data) else items[0]
+            data = data[step]
+        else:
+            break
+    return trail, node, data, FOUND
+
+
+class ErrorTree:
+    """
+    Errors of previous report which are changed by copy on write,
+    groups keep order of schema the same as by validation
+    """
+
+    def __init__(self, errors: List[Any]):
+        self.errors = list(errors)
+        # groups which were copied or created, their errors can be changed
+        self.own: Set[ErrorGroup] = set()
+
+    def find(self, path: Tuple[Any, ...]) -> Optional[List[Any]]:
+        """
+        :return: errors of group by path or None when it has no errors
+        """
+        errors = self.errors
+        for step in path:
+            position = find_group(errors, step)
+            if position is None:
+                return None
+            errors = self.copy(errors, position)
+        return errors
+
+    def copy(self, errors: List[Any], position: int) -> List[Any]:
+        group = errors[position]
+        if group not in self.own:
+            group = ErrorGroup(group.step, list(group.errors))
+            errors[position] = group
+            self.own.add(group)
+        return group.errors
+
+    def create(self, trail: List[Tuple[Node, Any]]) -> List[Any]:
+        """
+        :param list trail: container and step for every step of path
+        :return: errors of group by path, missing groups are created
+        """
+        errors = self.errors
+        for node, step in trail:
+            position = find_group(
+                errors, step.key if isinstance(step, Key) else step
+            )
+            if position is None:
+                group = ErrorGroup(step, [])
+                self.own.add(group)
+                insert(node, errors, group)
+                errors = group.errors
+            else:
+                errors = self.copy(errors, position)
+        return errors
+
+    def remove(self, path: Tuple[Any, ...]):
+        """Remove errors of value by path"""
+        if not path:
+            self.errors = []
+            return
+        parent = self.find(path[:-1])
+        if parent is None:
+            return
+        position = find_group(parent, path[-1])
+        if position is not None:
+            del parent[position]
+            self.prune(path[:-1])
+
+    def prune(self, path: Tuple[Any, ...]):
+        """Remove empty groups up from path"""
+        while path:
+            parent = self.find(path[:-1])
+            if parent is None:
+                return
+            position = find_group(parent, path[-1])
+            if position is None or parent[position].errors:
+                return
+            del parent[position]
+            path = path[:-1]
+
+    def shift(self, path: Tuple[Any, ...], index: int, delta: int):
+        """Indexes of items of list after index are shifted by delta"""
+        errors = self.find(path)
+        if errors is None:
+            return
+        for position in range(len(errors) - 1, -1, -1):
+            group = errors[position]
+            if (
+                not isinstance(group, ErrorGroup)
+                or isinstance(group.step, Key)
+                or group.step < index
+            ):
+                continue
+            if delta < 0 and group.step == index:
+                del errors[position]
+                continue
+            shifted = ErrorGroup(group.step + delta, group.errors)
+            if group in self.own:
+                self.own.add(shifted)
+            errors[position] = shifted
+        self.prune(path)
+
+    def replace(self, trail: List[Tuple[Node, Any]], node: Node, data: Any):
+        """Validate value at the end of trail instead of previous errors"""
+        path = tuple(
+            step.key if isinstance(step, Key) else step for _, step in trail
+        )
+        self.remove(path)
+        part = Report(soft=True)
+        if node.validate(data, part):
+            return
+        if not trail:
+            self.errors = part.errors
+            return
+        container, step = trail[-1]
+        group = ErrorGroup(step, part.errors)
+        self.own.add(group)
+        insert(container, self.create(trail[:-1]), group)
+
+    def replace_keys(
+        self,
+        trail: List[Tuple[Node, Any]],
+        path: Tuple[Any, ...],
+        node: DictNode,
+        data: dict,
+    ):
+        """Check missing and extra keys of dict instead of previous errors"""
+        errors = [
+            ErrorRecord(MISSING_KEY, field.key, data)
+            for field in node.fields
+            if not field.optional and field.key not in data
+        ]
+        if not node.ignore_extra_keys:
+            index = node.index
+            extra_keys = [k for k in data if k not in index]
+            if extra_keys:
+                errors.append(
+                    ErrorRecord(
+                        EXTRA_KEYS, node.expected_data, data, extra_keys
+                    )
+                )
+        self.replace_own(trail, path, node, errors)
+
+    def replace_own(
+        self,
+        trail: List[Tuple[Node, Any]],
+        path: Tuple[Any, ...],
+        node: Node,
+        errors: List[ErrorRecord],
+    ):
+        """
+        Replace errors of container itself, e.g. missing keys,
+        errors of its items are kept
+        """
+        current = self.find(path)
+        if current is not None:
+            current[:] = [e for e in current if isinstance(e, ErrorGroup)]
+        if errors:
+            current = self.create(trail)
+            for error in errors:
+                insert(node, current, error)
+        elif current is not None:
+            self.prune(path)
+
+
+def find_group(errors: List[Any], step: Any) -> Optional[int]:
+    """
+    :param list errors:
+    :param any step: key of dict or index of list
+    :return: position of group of step
+    """
+    by_index = type(step) is int
+    for position, error in enumerate(errors):
+        if not isinstance(error, ErrorGroup):
+            continue
+        if isinstance(error.step, Key):
+            if not by_index and error.step.key == step:
+                return position
+        elif by_index and error.step == step:
+            return position
+    return None
+
+
+def order(node: Node, error: Any) -> float:
+    """Position of error by validation of container"""
+    if isinstance(error, ErrorGroup):
+        if not isinstance(error.step, Key):
+            return error.step
+        key = error.step.key
+    elif isinstance(error, ErrorRecord) and error.kind == MISSING_KEY:
+        key = error.expected
+    elif isinstance(error, ErrorRecord) and error.kind == EXTRA_KEYS:
+        return float("inf")
+    else:
+        return -1
+    if not isinstance(node, DictNode):
+        return float("inf")
+    field = node.index.get(key)
+    if field is None:
+        return float("inf")
+    return node.fields.index(field)
+
+
+def insert(node: Node, errors: List[Any], error: Any):
+    """Insert error of container before errors of the next items"""
+    position = order(node, error)
+    for index, current in enumerate(errors):
+        if order(node, current) > position:
+            errors.insert(index, error)
+            return
+    errors.append(error)
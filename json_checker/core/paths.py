@@ -0,0 +1,274 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from json_checker.core.compiler import (
+    MISSING,
+    SEQUENCE_TYPES,
+    AndNode,
+    DictNode,
+    ListNode,
+    Node,
+    OrNode,
+)
+from json_checker.core.errors import (
+    ITEMS,
+    MISSING_KEY,
+    TYPE,
+    ErrorRecord,
+)
+from json_checker.core.exceptions import MissKeyCheckerError
+from json_checker.core.reports import Report
+
+# key after dot or index of list into brackets
+PATH_STEP = re.compile(r"\[(\*|\d+)\]|(\.)?([^.\[\]]+)")
+
+# steps of selected paths, None selects the whole subtree
+Selection = Optional[Dict[Any, Any]]
+
+
+@lru_cache(maxsize=256)
+def parse_path(path: str) -> Tuple[Any, ...]:
+    """
+    Steps of path template, `[*]` is every item of list
+    Examples:
+    >>> parse_path("user.id")  # ('user', 'id')
+    >>> parse_path("items[*].price")  # ('items', ITEMS, 'price')
+    >>> parse_path("[0].id")  # (0, 'id')
+
+    :param str path: keys of dicts by dots and indexes of lists
+    :return: tuple of keys, indexes and ITEMS
+    """
+    steps: List[Any] = []
+    pos = 0
+    while pos < len(path):
+        match = PATH_STEP.match(path, pos)
+        if match is None:
+            raise ValueError("not valid path %r at char %s" % (path, pos))
+        index, dot, key = match.groups()
+        if key is None:
+            steps.append(ITEMS if index == "*" else int(index))
+        elif (dot is None) == bool(pos):
+            raise ValueError("not valid path %r at char %s" % (path, pos))
+        else:
+            steps.append(key)
+        pos = match.end()
+    return tuple(steps)
+
+
+def select(paths: Iterable[str], plan: Optional[Node] = None) -> Selection:
+    """
+    Tree of steps of paths, path which is a prefix of others
+    selects the whole subtree
+    Examples:
+    >>> select(["user.id", "items[*].price"])
+    # {'user': {'id': None}, 'items': {ITEMS: {'price': None}}}
+    >>> select(["user.login"], compile_schema({"user": {"id": int}}))
+    # ValueError: path 'user.login' is not in schema
+
+    :param list paths:
+    :param Node plan: compiled schema, paths which leave its dicts
+        and lists raise ValueError
+    :return: dict of steps, None for the whole document
+    """
+    if isinstance(paths, str):
+        raise TypeError("paths must be a list of strings")
+    tree: Dict[Any, Any] = {}
+    for path in paths:
+        steps = parse_path(path)
+        if plan is not None and not in_schema(plan, steps):
+            raise ValueError("path %r is not in schema" % path)
+        if not steps:
+            return None
+        node = tree
+        for step in steps[:-1]:
+            child = node.setdefault(step, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[steps[-1]] = None
+    return tree
+
+
+def in_schema(node: Node, steps: Tuple[Any, ...]) -> bool:
+    """
+    Steps are keys of dicts and indexes of lists of schema, one of
+    alternatives of Or and conditions of And has to lead by them,
+    other schemas validate the whole value, so any steps go deeper
+    """
+    if not steps:
+        return True
+    step, rest = steps[0], steps[1:]
+    if isinstance(node, DictNode):
+        field = node.index.get(step)
+        return field is not None and in_schema(field.node, rest)
+    if isinstance(node, ListNode):
+        return type(step) is not str and any(
+            in_schema(item, rest) for item in node.items
+        )
+    if isinstance(node, OrNode):
+        return any(in_schema(n, steps) for n in node.alternatives)
+    if isinstance(node, AndNode):
+        return any(in_schema(n, steps) for n in node.conditions)
+    return True
+
+
+def merge(first: Selection, second: Selection) -> Selection:
+    """Union of selections, e.g. of `items[0]` and `items[*]`"""
+    if first is None or second is None:
+        return None
+    result = dict(first)
+    for step, selection in second.items():
+        result[step] = (
+            merge(result[step], selection) if step in result else selection
+        )
+    return result
+
+
+def validate_selected(
+    node: Node, current_data: Any, selection: Selection, report: Report
+) -> bool:
+    """
+    Validate data along selected paths only, keys and items of other paths
+    are skipped with their extra keys. OptionalKey, Or, And and limits
+    of limited plan work the same as by validation of the whole data,
+    limits count containers along selected paths only, other schemas
+    validate the whole value when path goes deeper than schema
+    :param Node node: compiled schema
+    :param any current_data:
+    :param dict selection: tree of steps by `select`
+    :param Report report:
+    :return: bool
+    """
+    if selection is None:
+        return node.validate(current_data, report)
+    if isinstance(node, DictNode):
+        return validate_dict(node, current_data, selection, report)
+    if isinstance(node, ListNode):
+        return validate_list(node, current_data, selection, report)
+    validate_by = getattr(node, "validate_by", None)
+    if validate_by is not None:
+        # Or, And and limits validate their nodes along the same paths
+        return validate_by(
+            current_data,
+            report,
+            lambda child, data, report: validate_selected(
+                child, data, selection, report
+            ),
+        )
+    return node.validate(current_data, report)
+
+
+def validate_dict(
+    node: DictNode, current_data: Any, selection: dict, report: Report
+) -> bool:
+    """Selected fields in order of schema, steps out of schema are skipped"""
+    if node.literal and current_data == node.expected_data:
+        return True
+    if not isinstance(current_data, dict):
+        report.add_or_raise(
+            ErrorRecord(TYPE, dict, current_data), node.exception
+        )
+        return False
+
+    fields = [field for field in node.fields if field.key in selection]
+    soft = report.soft
+    report.soft = True
+    errors = report.errors
+    is_valid = True
+    for position, field in enumerate(fields):
+        value = current_data.get(field.key, MISSING)
+        if value is MISSING:
+            if field.optional:
+                continue
+            node.add_missing_key(report, soft, field, current_data)
+        else:
+            mark = len(errors)
+            if validate_selected(
+                field.node, value, selection[field.key], report
+            ):
+                continue
+            report.soft = soft
+            report.add_group(mark, field, node.exception, node)
+        if report.fail_fast:
+            report.skip(len(fields) - position - 1)
+            return False
+        report.soft = True
+        is_valid = False
+    report.soft = soft
+    return is_valid
+
+
+def validate_list(
+    node: ListNode, current_data: Any, selection: dict, report: Report
+) -> bool:
+    """
+    Every item by `[*]` and items by indexes, other items are skipped,
+    indexes out of list are reported as missing keys
+    """
+    expected = node.expected_data
+    if node.literal and expected == current_data:
+        return True
+    if (
+        not isinstance(current_data, SEQUENCE_TYPES)
+        or (not current_data and expected)
+        or (not expected and current_data)
+    ):
+        report.add_or_raise(
+            ErrorRecord(TYPE, expected, current_data), node.exception
+        )
+        return False
+
+    items = node.items
+    if not isinstance(current_data, (list, tuple)):
+        current_data = list(current_data)
+    size = len(current_data)
+    positional = len(items) == size
+    every = selection.get(ITEMS, MISSING)
+    steps = sorted(step for step in selection if type(step) is int)
+    # selected indexes out of list are reported as missing keys
+    missing = [step for step in steps if step >= size]
+    if every is not MISSING and len(selection) == 1:
+        selected = [(index, every) for index in range(size)]
+    else:
+        indexes: Iterable[int] = [step for step in steps if step < size]
+        if every is not MISSING:
+            indexes = range(size)
+        selected = []
+        for index in indexes:
+            own = selection.get(index, MISSING)
+            if own is MISSING:
+                selected.append((index, every))
+            elif every is MISSING:
+                selected.append((index, own))
+            else:
+                selected.append((index, merge(every, own)))
+
+    soft = report.soft
+    report.soft = True
+    errors = report.errors
+    is_valid = True
+    for position, (index, item_selection) in enumerate(selected):
+        mark = len(errors)
+        item_node = items[index] if positional else items[0]
+        if validate_selected(
+            item_node, current_data[index], item_selection, report
+        ):
+            continue
+        is_valid = False
+        report.soft = soft
+        report.add_group(mark, index, node.exception, node)
+        if report.fail_fast:
+            report.skip(len(selected) - position - 1 + len(missing))
+            return False
+        report.soft = True
+    report.soft = soft
+    for position, index in enumerate(missing):
+        report.add_or_raise(
+            ErrorRecord(MISSING_KEY, index, current_data), MissKeyCheckerError
+        )
+        if report.fail_fast:
+            report.skip(len(missing) - position - 1)
+            return False
+    return is_valid and not missing
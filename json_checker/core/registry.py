@@ -0,0 +1,89 @@
+import importlib
+from typing import Any, Callable, Dict, Optional
+
+
+class Registry:
+    """
+    Names of functions and types used into schemas,
+    lets generated code and other processes find them by name
+    Examples:
+    >>> from json_checker import Checker, register
+
+    >>> positive = register(lambda x: x > 0, name="positive")
+    >>> @register
+    >>> def is_even(x):
+    >>>     return x % 2 == 0
+
+    >>> registry.name_of(positive)  # 'positive'
+    >>> registry.name_of(is_even)  # 'my_module:is_even'
+    >>> registry.resolve("positive") is positive  # True
+
+    Not registered module level functions and classes
+    are named by import path `module:qualname`
+    """
+
+    def __init__(self):
+        self._objects: Dict[str, Any] = {}
+        self._names: Dict[int, str] = {}
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self._names
+
+    def register(self, obj: Any = None, name: Optional[str] = None) -> Any:
+        """
+        :param callable | type obj: function or class
+        :param str name: import path of obj by default
+        :return: obj for use as decorator
+        """
+        if obj is None:
+            return lambda o: self.register(o, name=name)
+        if name is None:
+            name = import_path(obj)
+            if name is None:
+                raise ValueError(
+                    "%s must be registered with name"
+                    % getattr(obj, "__name__", obj)
+                )
+        self._objects[name] = obj
+        self._names[id(obj)] = name
+        return obj
+
+    def name_of(self, obj: Any) -> str:
+        name = self._names.get(id(obj))
+        if name is not None and self._objects.get(name) is obj:
+            return name
+        name = import_path(obj)
+        if name is None:
+            raise ValueError(
+                "%s is not registered, use json_checker.register"
+                % getattr(obj, "__name__", obj)
+            )
+        return name
+
+    def resolve(self, name: str) -> Any:
+        if name in self._objects:
+            return self._objects[name]
+        if ":" not in name:
+            raise LookupError("%s is not registered" % name)
+        module_name, qualname = name.split(":", 1)
+        obj = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+        return obj
+
+
+def import_path(obj: Any) -> Optional[str]:
+    """
+    :param any obj:
+    :return: `module:qualname` when obj can be imported by it else None
+    """
+    module_name = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if not module_name or not qualname or "<" in qualname:
+        return None
+    return "%s:%s" % (module_name, qualname)
+
+
+registry = Registry()
+register: Callable = registry.register
+resolve: Callable = registry.resolve
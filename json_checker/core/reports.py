@@ -1,13 +1,79 @@
+from typing import Any, Iterator, List, NoReturn, Optional, Tuple
+
+from json_checker.core.errors import (
+    DEADLINE,
+    ITEMS,
+    MESSAGE,
+    ErrorAggregate,
+    ErrorGroup,
+    ErrorRecord,
+    Key,
+    iter_records,
+)
+
+
 class Report:
-    def __init__(self, soft=True):
+    # monotonic time when validation stops, it's checked by timed plan
+    # when countdown of visited nodes is over, reports without deadline
+    # keep these defaults of class
+    deadline: Optional[float] = None
+    countdown = 0
+    expired = False
+    # count of values of containers visited by limited plan,
+    # name of the exceeded limit
+    nodes = 0
+    exceeded: Optional[str] = None
+    # digests of values by their ids, cached plan keeps them
+    # while data is validated
+    digests: Optional[dict] = None
+
+    def __init__(self, soft=True, fail_fast=None, max_errors=None):
+        """
+        :param bool soft: collect errors instead of raising
+        :param bool fail_fast: stop validation on the first error,
+            by default when report is not soft
+        :param int max_errors: stop validation when so many errors
+            were collected
+        """
         self.soft = soft
+        self.fail_fast = not soft if fail_fast is None else fail_fast
+        self.max_errors: Optional[int] = max_errors
         self.errors = []
+        # count of added errors, groups of them are not counted
+        self.count = 0
+        # validation was stopped before all data was visited
+        self.truncated = False
+        # count of items of lists and keys of dicts which were not visited
+        self.skipped = 0
+        # count of items of sampled lists and of validated ones among them
+        self.sampled = 0
+        self.checked = 0
 
     def __repr__(self):
         return "<Report soft={} {}>".format(self.soft, self.errors)
 
     def __str__(self):
-        return "\n".join(self.errors)
+        messages = self.messages()
+        if self.truncated and self.max_errors is not None:
+            messages.append(
+                "Validation stopped after %s errors, %s items skipped"
+                % (self.count, self.skipped)
+            )
+        if self.expired:
+            reached = self.reached
+            place = (
+                "" if reached is None else " at %s" % (reached.pointer or "/")
+            )
+            messages.append(
+                "Validation stopped by deadline%s, report is incomplete"
+                % place
+            )
+        if self.sampled:
+            messages.append(
+                "Sampled validation checked %s of %s items (%.1f%%)"
+                % (self.checked, self.sampled, 100.0 * self.coverage)
+            )
+        return "\n".join(messages)
 
     def __len__(self):
         return len(self.errors)
@@ -23,20 +89,220 @@ class Report:
         return str(self) != str(other)
 
     def __contains__(self, item):
-        return str(item) in self.errors
+        return str(item) in self.messages()
 
     def has_errors(self):
         return bool(self.errors)
 
+    def messages(self) -> List[str]:
+        """Rendered messages of errors"""
+        return [str(error) for error in self.errors]
+
+    def records(self) -> Iterator[ErrorRecord]:
+        """Error records with filled paths, plain messages are skipped"""
+        return iter_records(self.errors)
+
+    @property
+    def reached(self) -> Optional[ErrorRecord]:
+        """Record of value where validation was stopped by deadline"""
+        for record in self.records():
+            if record.kind == DEADLINE:
+                return record
+        return None
+
+    @property
+    def stopped(self) -> bool:
+        """Validation was stopped by deadline or by exceeded limit"""
+        return self.expired or self.exceeded is not None
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of items of sampled lists which were validated"""
+        if not self.sampled:
+            return 1.0
+        return self.checked / self.sampled
+
     def merge(self, report):
         self.errors.extend(report.errors)
+        self.count += report.count
+        self.sampled += report.sampled
+        self.checked += report.checked
         return True
 
     def add(self, error_message):
         self.errors.append(error_message)
+        self.count += 1
+        if self.max_errors is not None and self.count >= self.max_errors:
+            self.fail_fast = True
         return True
 
+    def create_part(self) -> "Report":
+        """Empty soft report with the same settings for part of data"""
+        return Report(True, self.fail_fast, self.max_errors)
+
+    def skip(self, count: int):
+        """
+        Validation of container was stopped,
+        count of its items and keys were not visited
+        """
+        if count > 0:
+            self.truncated = True
+            self.skipped += count
+
+    def snapshot(self) -> Tuple[int, bool, bool, int, int]:
+        """
+        Counters of report, operators restore them for dropped errors
+        and values counted by limits of dropped alternatives
+        """
+        return (
+            self.count,
+            self.fail_fast,
+            self.truncated,
+            self.skipped,
+            self.nodes,
+        )
+
+    def restore(self, snapshot: Tuple[int, bool, bool, int, int]):
+        (
+            self.count,
+            self.fail_fast,
+            self.truncated,
+            self.skipped,
+            self.nodes,
+        ) = snapshot
+
     def add_or_raise(self, error_message, exception):
         if self.soft:
             return self.add(error_message)
+        if isinstance(error_message, ErrorRecord):
+            self.raise_errors([error_message], exception)
         raise exception(error_message)
+
+    def raise_errors(self, errors: List[Any], exception: type) -> NoReturn:
+        """Raise errors with report, message is rendered on demand"""
+        report = Report(soft=True, fail_fast=self.fail_fast)
+        report.errors = errors
+        report.sampled, report.checked = self.sampled, self.checked
+        report.expired, report.exceeded = self.expired, self.exceeded
+        raise exception(report)
+
+    def add_group(
+        self, mark: int, step: Any, exception: type, owner: Any = None
+    ) -> bool:
+        """
+        Group errors added after mark as errors of container item,
+        they are raised together when report is not soft
+        :param int mark: count of errors before validation of item
+        :param any step: Key of dict or index of list
+        :param type exception:
+        :param any owner: node of container
+        :return: True
+        """
+        errors = self.errors
+        group = ErrorGroup(step, errors[mark:])
+        del errors[mark:]
+        if self.soft:
+            errors.append(group)
+            return True
+        self.raise_errors([group], exception)
+
+
+class AggregatedReport(Report):
+    """
+    Soft report which groups errors by path template and kind,
+    memory depends on count of distinct failures, not on size of data
+    Examples:
+    >>> from json_checker.core.compiler import compile_schema
+
+    >>> report = AggregatedReport(max_samples=2)
+    >>> node = compile_schema({"items": [{"price": float}]})
+    >>> node.validate({"items": [{"price": "1"}] * 1000}, report)
+    >>> aggregate = report.aggregates()[0]
+    >>> aggregate.path_template  # 'items[*].price'
+    >>> aggregate.count  # 1000
+    >>> aggregate.sample_paths()
+    # [(('items', 0, 'price'), '1'), (('items', 1, 'price'), '1')]
+    """
+
+    def __init__(
+        self, soft=True, fail_fast=None, max_errors=None, max_samples=5
+    ):
+        """
+        :param bool soft: errors are aggregated only by soft report
+        :param bool fail_fast: stop validation on the first error
+        :param int max_errors: stop validation after so many errors
+        :param int max_samples: count of kept paths and values per group
+        """
+        super(AggregatedReport, self).__init__(soft, fail_fast, max_errors)
+        self.max_samples = max_samples
+        # containers switch hard report to soft one for their items,
+        # errors of hard report are raised as they are
+        self.aggregating = soft
+
+    def create_part(self) -> Report:
+        if not self.aggregating:
+            return super(AggregatedReport, self).create_part()
+        return AggregatedReport(
+            True, self.fail_fast, self.max_errors, self.max_samples
+        )
+
+    def aggregates(self) -> List[ErrorAggregate]:
+        return [
+            (
+                error
+                if isinstance(error, ErrorAggregate)
+                else ErrorAggregate(as_record(error))
+            )
+            for error in self.errors
+        ]
+
+    def add_group(
+        self, mark: int, step: Any, exception: type, owner: Any = None
+    ) -> bool:
+        """
+        Merge errors added after mark into groups of previous items
+        of the same container (owner)
+        """
+        if not self.aggregating:
+            return super(AggregatedReport, self).add_group(
+                mark, step, exception, owner
+            )
+        errors = self.errors
+        children = errors[mark:]
+        del errors[mark:]
+        if isinstance(step, Key):
+            path_step = template_step = step.key
+        else:
+            path_step, template_step = step, ITEMS
+
+        start = mark
+        while (
+            start
+            and isinstance(errors[start - 1], ErrorAggregate)
+            and errors[start - 1].owner is owner
+        ):
+            start -= 1
+        for child in children:
+            if isinstance(child, ErrorAggregate):
+                aggregate = child
+            else:
+                aggregate = ErrorAggregate(as_record(child))
+            aggregate.add_step(path_step, template_step)
+            for index in range(start, len(errors)):
+                sibling = errors[index]
+                if (
+                    sibling.kind == aggregate.kind
+                    and sibling.template == aggregate.template
+                ):
+                    sibling.merge(aggregate, self.max_samples)
+                    break
+            else:
+                aggregate.owner = owner
+                errors.append(aggregate)
+        return True
+
+
+def as_record(error: Any) -> ErrorRecord:
+    if isinstance(error, ErrorRecord):
+        return error
+    return ErrorRecord(MESSAGE, None, None, error)
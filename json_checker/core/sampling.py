@@ -0,0 +1,289 @@
+import math
+from random import Random
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from json_checker.core.compiler import (
+    SEQUENCE_TYPES,
+    AndNode,
+    DictNode,
+    Field,
+    ListNode,
+    Node,
+    OrNode,
+)
+from json_checker.core.errors import ITEMS, TYPE, ErrorRecord
+from json_checker.core.paths import parse_path
+from json_checker.core.reports import Report
+
+
+class Sample:
+    """
+    Items of list which are validated, other items are skipped
+    Examples:
+    >>> Sample(every=10)  # items 0, 10, 20, ...
+    >>> Sample(fraction=0.01, seed=1)  # every item with probability 1%
+    >>> Sample(first=10, random=10)  # 10 first items and 10 of the rest
+
+    Random items are picked by generator of sample, so the same seed
+    picks the same items by the same sequence of validations.
+    Sample counts items of lists and validated ones over all validations
+    of this process, e.g. for metrics of shadow validation
+    :param int every: validate every Nth item
+    :param float fraction: probability of item to be validated
+    :param int first: count of the first items
+    :param int random: count of random items after the first ones
+    :param int seed: seed of random items
+    """
+
+    def __init__(
+        self,
+        every: Optional[int] = None,
+        fraction: Optional[float] = None,
+        first: Optional[int] = None,
+        random: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        modes = (every is not None, fraction is not None) + (
+            first is not None or random is not None,
+        )
+        if sum(modes) != 1:
+            raise ValueError(
+                "sample needs one of every, fraction or first and random"
+            )
+        if every is not None and every < 1:
+            raise ValueError("every must be positive, got %r" % every)
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1], got %r" % fraction)
+        if (first or 0) < 0 or (random or 0) < 0:
+            raise ValueError("first and random can't be negative")
+        self.every = every
+        self.fraction = fraction
+        self.first = first or 0
+        self.random = random or 0
+        self.seed = seed
+        self.generator = Random(seed)
+        self.total = 0
+        self.checked = 0
+
+    def __repr__(self):
+        return "<Sample %s checked=%s total=%s>" % (
+            self.settings,
+            self.checked,
+            self.total,
+        )
+
+    @property
+    def settings(self) -> str:
+        """Mode and seed of sample without its counters"""
+        if self.every is not None:
+            mode = "every=%s" % self.every
+        elif self.fraction is not None:
+            mode = "fraction=%s" % self.fraction
+        else:
+            mode = "first=%s random=%s" % (self.first, self.random)
+        return "%s seed=%s" % (mode, self.seed)
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of items which were validated"""
+        if not self.total:
+            return 1.0
+        return self.checked / self.total
+
+    def indexes(self, size: int) -> Sequence[int]:
+        """
+        :param int size: length of list
+        :return: ascending indexes of validated items
+        """
+        if self.every is not None:
+            return range(0, size, self.every)
+        if self.fraction is not None:
+            return self.random_indexes(size, self.fraction)
+        first = min(self.first, size)
+        rest = size - first
+        if self.random >= rest:
+            return range(size)
+        picked = self.generator.sample(range(first, size), self.random)
+        return list(range(first)) + sorted(picked)
+
+    def random_indexes(self, size: int, fraction: float) -> Sequence[int]:
+        """Every index with probability of fraction by geometric gaps"""
+        if fraction >= 1:
+            return range(size)
+        random = self.generator.random
+        log_q = math.log(1 - fraction)
+        indexes: List[int] = []
+        index = -1
+        while True:
+            index += 1 + int(math.log(1 - random()) / log_q)
+            if index >= size:
+                return indexes
+            indexes.append(index)
+
+
+class SampledListNode(ListNode):
+    """
+    List which validates only sampled items,
+    report counts items of sampled lists and how many were checked
+    """
+
+    __slots__ = ("sample",)
+
+    def __init__(
+        self,
+        expected_data: Any,
+        items: Tuple[Node, ...],
+        sample: Sample,
+    ):
+        super(SampledListNode, self).__init__(expected_data, items)
+        self.sample = sample
+
+    def __repr__(self):
+        return "<%s expected=%s %s>" % (
+            self.__class__.__name__,
+            self.expected_data,
+            self.sample,
+        )
+
+    def validate(self, current_data: Any, report: Report) -> bool:
+        expected = self.expected_data
+        if (
+            not isinstance(current_data, SEQUENCE_TYPES)
+            or (not current_data and expected)
+            or (not expected and current_data)
+        ):
+            report.add_or_raise(
+                ErrorRecord(TYPE, expected, current_data), self.exception
+            )
+            return False
+
+        if not isinstance(current_data, (list, tuple)):
+            current_data = list(current_data)
+        items = self.items
+        positional = len(items) == len(current_data)
+        sample = self.sample
+        indexes = sample.indexes(len(current_data))
+        sample.total += len(current_data)
+        sample.checked += len(indexes)
+        report.sampled += len(current_data)
+        report.checked += len(indexes)
+
+        soft = report.soft
+        report.soft = True
+        errors = report.errors
+        is_valid = True
+        for position, index in enumerate(indexes):
+            mark = len(errors)
+            node = items[index] if positional else items[0]
+            if node.validate(current_data[index], report):
+                continue
+            is_valid = False
+            # hard report raises by add_group, so skipped items
+            # are not counted as checked before it
+            remaining = len(indexes) - position - 1
+            if report.fail_fast:
+                sample.checked -= remaining
+                report.checked -= remaining
+            report.soft = soft
+            report.add_group(mark, index, self.exception, self)
+            if report.fail_fast:
+                report.skip(remaining)
+                return False
+            report.soft = True
+        report.soft = soft
+        return is_valid
+
+    def is_valid(self, current_data: Any) -> bool:
+        return self.validate(current_data, Report(soft=True, fail_fast=True))
+
+
+def sample_paths(
+    sample: Union[Sample, Dict[str, Sample]],
+) -> Union[Sample, Dict[Tuple[Any, ...], Sample]]:
+    """
+    :param sample: sample of every list or samples by paths of lists
+    :return: sample or samples by steps of paths
+    """
+    if isinstance(sample, Sample):
+        return sample
+    samples = {}
+    for path, value in sample.items():
+        steps = parse_path(path)
+        if any(type(step) is int for step in steps):
+            raise ValueError(
+                "path %r of sample must have [*] for items of lists" % path
+            )
+        samples[steps] = value
+    return samples
+
+
+def sampled_plan(
+    node: Node,
+    sample: Union[Sample, Dict[Tuple[Any, ...], Sample]],
+    path: Tuple[Any, ...] = (),
+    used: Optional[List[Tuple[Any, ...]]] = None,
+) -> Node:
+    """
+    Copy of compiled plan where lists validate only sampled items,
+    keys of dicts are checked the same as without sample
+    Examples:
+    >>> plan = compile_schema({"items": [{"tags": [str]}]})
+    >>> sampled_plan(plan, Sample(every=10))  # all lists
+    >>> sampled_plan(plan, {("items",): Sample(first=1, random=10)})
+
+    :param Node node: compiled schema
+    :param sample: sample of every list or samples by steps of paths
+    :param tuple path: steps of node, items of lists are ITEMS
+    :param list used: paths where samples were applied
+    :return: Node
+    """
+    if used is None:
+        used = []
+        plan = sampled_plan(node, sample, path, used)
+        if isinstance(sample, dict):
+            unknown = [p for p in sample if p not in used]
+            if unknown:
+                raise ValueError("sample paths have no lists: %s" % unknown)
+        return plan
+
+    if isinstance(node, DictNode):
+        fields = tuple(
+            Field(
+                field.key,
+                sampled_plan(field.node, sample, path + (field.key,), used),
+                field.optional,
+            )
+            for field in node.fields
+        )
+        return DictNode(
+            node.expected_data, fields, node.ignore_extra_keys, node.literal
+        )
+    if isinstance(node, ListNode) and not node.literal and node.items:
+        items = tuple(
+            sampled_plan(item, sample, path + (ITEMS,), used)
+            for item in node.items
+        )
+        current: Optional[Sample]
+        if isinstance(sample, Sample):
+            current = sample
+        else:
+            current = sample.get(path)
+        if current is None:
+            return ListNode(node.expected_data, items, node.literal)
+        used.append(path)
+        return SampledListNode(node.expected_data, items, current)
+    if isinstance(node, OrNode):
+        return OrNode(
+            node.expected_data,
+            tuple(
+                sampled_plan(n, sample, path, used) for n in node.alternatives
+            ),
+        )
+    if isinstance(node, AndNode):
+        return AndNode(
+            node.expected_data,
+            tuple(
+                sampled_plan(n, sample, path, used) for n in node.conditions
+            ),
+        )
+    return node
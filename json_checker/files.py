@@ -0,0 +1,1104 @@
+import codecs
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import queue
+import re
+import threading
+from collections import deque
+from itertools import chain
+from time import perf_counter
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from json_checker.app import Checker
+from json_checker.core import parallel
+from json_checker.core.codegen import fingerprint
+from json_checker.core.decoder import match_space
+from json_checker.core.errors import record_template
+from json_checker.core.parallel import dumps, loads
+from json_checker.core.reports import AggregatedReport, Report
+
+# files are split between worker processes by ranges of so many bytes
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# ranges sent to workers and not returned yet, per worker
+PENDING_CHUNKS = 2
+
+# chars of JSON document read at once
+BLOCK_SIZE = 64 * 1024
+
+# the end of buffer which can be a part of number
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+# the end of buffer from error of decoder which can be a part of value
+# cut by the end of buffer: literal, number or escape of string
+VALUE_TAIL = re.compile(r"[^ \t\n\r,:\[\]{}\"]*\Z")
+
+# batches read ahead by background thread
+PENDING_BATCHES = 4
+
+# bytes of lines per batch of background thread
+BATCH_SIZE = 64 * 1024
+
+# checkpoint of validation is saved after so many lines
+CHECKPOINT_LINES = 100000
+
+# modules of compressed files by extension
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+
+Source = Union[str, "os.PathLike[str]", IO[Any]]
+
+
+def is_compressed(path: Any) -> bool:
+    return os.path.splitext(os.fspath(path))[1].lower() in COMPRESSIONS
+
+
+def open_source(path: Any) -> IO[bytes]:
+    """
+    Open file for binary reading, .gz, .bz2 and .xz files are decompressed
+    :param str path:
+    :return: binary file
+    """
+    path = os.fspath(path)
+    module = COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+    if module is None:
+        return open(path, "rb")
+    return importlib.import_module(module).open(path, "rb")
+
+
+class LineFailure:
+    """
+    Line which can't be decoded or is not valid,
+    report is None for decode errors
+    """
+
+    __slots__ = ("line", "offset", "report", "error")
+
+    def __init__(
+        self,
+        line: int,
+        offset: int,
+        report: Optional[Report] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        :param int line: number of line from 1
+        :param int offset: offset of the first byte of line
+        :param Report report: errors of validation
+        :param str error: error of decoding
+        """
+        self.line = line
+        self.offset = offset
+        self.report = report
+        self.error = error
+
+    def __repr__(self):
+        return "<LineFailure line=%s offset=%s>" % (self.line, self.offset)
+
+    def __str__(self):
+        return "line %s (offset %s): %s" % (
+            self.line,
+            self.offset,
+            self.error if self.report is None else self.report,
+        )
+
+
+class Stage:
+    """Time of stage of file validation and size of data passed it"""
+
+    __slots__ = ("name", "seconds", "bytes", "records")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.bytes = 0
+        self.records = 0
+
+    def __repr__(self):
+        return "<Stage %s %.1f MB/s %.0f records/s>" % (
+            self.name,
+            self.mb_per_second,
+            self.records_per_second,
+        )
+
+    @property
+    def mb_per_second(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.bytes / 1024 / 1024 / self.seconds
+
+    @property
+    def records_per_second(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.records / self.seconds
+
+    def update(self, other: "Stage"):
+        self.seconds += other.seconds
+        self.bytes += other.bytes
+        self.records += other.records
+
+
+class Summary:
+    """Counts of validated file, they grow while failures are consumed"""
+
+    __slots__ = (
+        "lines",
+        "records",
+        "valid",
+        "invalid",
+        "decode_errors",
+        "bytes",
+        "errors",
+        "stages",
+    )
+
+    def __init__(self):
+        # blank lines are counted by lines only
+        self.lines = 0
+        self.records = 0
+        self.valid = 0
+        self.invalid = 0
+        self.decode_errors = 0
+        self.bytes = 0
+        # count of errors by (path template, kind)
+        self.errors: Dict[Tuple[str, str], int] = {}
+        # reading of file and validation, time of parallel validation
+        # is summed over processes
+        self.stages: Dict[str, Stage] = {
+            "read": Stage("read"),
+            "validate": Stage("validate"),
+        }
+
+    def __repr__(self):
+        return (
+            "<Summary lines=%s records=%s valid=%s invalid=%s "
+            "decode_errors=%s bytes=%s>"
+            % (
+                self.lines,
+                self.records,
+                self.valid,
+                self.invalid,
+                self.decode_errors,
+                self.bytes,
+            )
+        )
+
+    def update(self, other: "Summary"):
+        self.lines += other.lines
+        self.records += other.records
+        self.valid += other.valid
+        self.invalid += other.invalid
+        self.decode_errors += other.decode_errors
+        self.bytes += other.bytes
+        errors = self.errors
+        for key, count in other.errors.items():
+            errors[key] = errors.get(key, 0) + count
+        for name, stage in other.stages.items():
+            self.stages[name].update(stage)
+
+    def count_errors(self, report: Report):
+        """Add errors of report to counts by path template and kind"""
+        errors = self.errors
+        if isinstance(report, AggregatedReport):
+            for aggregate in report.aggregates():
+                key = aggregate.path_template, aggregate.kind
+                errors[key] = errors.get(key, 0) + aggregate.count
+            return
+        for record in report.records():
+            key = record_template(record), record.kind
+            errors[key] = errors.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts of summary as JSON object, stages are not kept"""
+        return {
+            "lines": self.lines,
+            "records": self.records,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "decode_errors": self.decode_errors,
+            "bytes": self.bytes,
+            "errors": [
+                [template, kind, count]
+                for (template, kind), count in self.errors.items()
+            ],
+        }
+
+    def restore(self, snapshot: Dict[str, Any]):
+        self.lines = snapshot["lines"]
+        self.records = snapshot["records"]
+        self.valid = snapshot["valid"]
+        self.invalid = snapshot["invalid"]
+        self.decode_errors = snapshot["decode_errors"]
+        self.bytes = snapshot["bytes"]
+        self.errors = {
+            (template, kind): count
+            for template, kind, count in snapshot["errors"]
+        }
+
+
+class Checkpoint:
+    """
+    Progress of file validation saved into small JSON file: offset of
+    the next line, counts of summary and fingerprint of checker.
+    Validation resumes from checkpoint and refuses it when schema
+    or settings of checker were changed
+    Examples:
+    >>> from json_checker import validate_ndjson
+
+    >>> validation = validate_ndjson(
+    ...     "events.ndjson", {"id": int}, checkpoint="events.checkpoint"
+    ... )
+    >>> for failure in validation:  # interrupted
+    ...     print(failure)
+    # the next run starts from the last saved line
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self, path: Any, checker: Checker, every: int = CHECKPOINT_LINES
+    ):
+        """
+        :param str path: file of checkpoint
+        :param Checker checker: functions of schema must be registered
+            by `json_checker.register` or be importable by module path
+        :param int every: checkpoint is saved after so many lines
+        """
+        self.path = os.fspath(path)
+        self.every = every
+        sample = checker.sample
+        if isinstance(sample, dict):
+            samples: Optional[str] = ", ".join(
+                "%s: %s" % (key, sample[key].settings)
+                for key in sorted(sample)
+            )
+        else:
+            samples = None if sample is None else sample.settings
+        self.fingerprint = (
+            "%s soft=%s aggregate=%s max_errors=%s limits=%r sample=%s"
+            % (
+                fingerprint(checker.expected_data, checker.ignore_extra_keys),
+                checker.soft,
+                checker.aggregate,
+                checker.max_errors,
+                checker.limits,
+                samples,
+            )
+        )
+
+    def __repr__(self):
+        return "<Checkpoint %s>" % self.path
+
+    def load(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        :return: offset and snapshot of summary, None without checkpoint
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get("version") != self.VERSION:
+            raise ValueError(
+                "checkpoint %s has unknown version %s"
+                % (self.path, state.get("version"))
+            )
+        if state["fingerprint"] != self.fingerprint:
+            raise ValueError(
+                "checkpoint %s was saved for another schema or settings"
+                % self.path
+            )
+        return state["offset"], state["summary"]
+
+    def save(self, offset: int, summary: Summary):
+        """
+        Replace checkpoint atomically, so it's whole after crash
+        :param int offset: offset of the next line
+        :param Summary summary: counts of validated lines
+        """
+        state = {
+            "version": self.VERSION,
+            "fingerprint": self.fingerprint,
+            "offset": offset,
+            "summary": summary.snapshot(),
+        }
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def iter_lines(
+    f: Iterable[Any], start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Lines of file by buffered reads, only one line is kept in memory
+    :param iterable f: binary or text file or its lines
+    :param int start: offset of the first line
+    :param int end: lines which start from end are not read
+    :return: iterator of (offset, line)
+    """
+    offset = start
+    for line in f:
+        if end is not None and offset >= end:
+            return
+        yield offset, line
+        offset += line_size(line)
+
+
+def line_size(line: Any) -> int:
+    """
+    Size of line in bytes, offsets and throughput of stages are in bytes
+    of UTF-8, lone surrogates of text decoded with errors are encoded too
+    """
+    if isinstance(line, bytes):
+        return len(line)
+    return len(line.encode("utf-8", "surrogatepass"))
+
+
+class Prefetcher:
+    """
+    Background thread reads batches into bounded queue, decompression
+    of gzip, bz2 and lzma releases GIL, so it overlaps validation.
+    Errors of reading are raised by consumer
+    Examples:
+    >>> with open_source("events.ndjson.gz") as f:
+    ...     prefetcher = Prefetcher(lambda: f.readlines(BATCH_SIZE))
+    ...     for lines in prefetcher:
+    ...         print(len(lines))
+    ...     prefetcher.close()
+    """
+
+    END = object()
+
+    def __init__(
+        self, read: Callable[[], Any], pending: int = PENDING_BATCHES
+    ):
+        """
+        :param callable read: returns the next batch, empty at the end
+        :param int pending: count of batches read ahead
+        """
+        self.read_batch = read
+        self.queue: queue.Queue = queue.Queue(pending)
+        self.closed = threading.Event()
+        # time of reading by thread and time of waiting by consumer
+        self.seconds = 0.0
+        self.wait = 0.0
+        self.rest: Any = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        read_batch = self.read_batch
+        put = self.queue.put
+        try:
+            while not self.closed.is_set():
+                start = perf_counter()
+                batch = read_batch()
+                self.seconds += perf_counter() - start
+                if not batch:
+                    break
+                put(batch)
+            put(self.END)
+        except BaseException as e:
+            put(e)
+
+    def next_batch(self) -> Any:
+        """
+        :return: the next batch, None at the end
+        """
+        if self.rest is not None:
+            batch, self.rest = self.rest, None
+            return batch
+        start = perf_counter()
+        batch = self.queue.get()
+        self.wait += perf_counter() - start
+        if batch is self.END:
+            # the end is seen by the next call too
+            self.queue.put(batch)
+            return None
+        if isinstance(batch, BaseException):
+            raise batch
+        return batch
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            batch = self.next_batch()
+            if batch is None:
+                return
+            yield batch
+
+    def read(self, size: int) -> Any:
+        """
+        File-like read of batches of bytes or str
+        :param int size: count of bytes or chars
+        :return: empty bytes or str at the end
+        """
+        chunks = []
+        count = 0
+        while count < size:
+            batch = self.next_batch()
+            if batch is None:
+                break
+            chunks.append(batch)
+            count += len(batch)
+        if not chunks:
+            return b""
+        data = chunks[0][:0].join(chunks)
+        if count > size:
+            self.rest = data[size:]
+        return data[:size]
+
+    def close(self):
+        """Stop thread, it's blocked by full queue until batches are taken"""
+        self.closed.set()
+        while self.thread.is_alive():
+            try:
+                self.queue.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self.thread.join()
+
+
+def run_stages(
+    failures: Iterator[Any], prefetcher: Prefetcher, summary: Summary
+) -> Iterator[Any]:
+    """
+    Yield failures, time of reading and time of validation are added
+    to stages of summary, time of consumer of failures and waiting
+    of batches are not counted
+    :param iterator failures:
+    :param Prefetcher prefetcher: reader of batches
+    :param Summary summary:
+    :return: iterator of failures
+    """
+    busy = 0.0
+    # summary can be restored from checkpoint
+    size, records = summary.bytes, summary.records
+    start = perf_counter()
+    try:
+        for failure in failures:
+            busy += perf_counter() - start
+            yield failure
+            start = perf_counter()
+        busy += perf_counter() - start
+    finally:
+        prefetcher.close()
+        stages = summary.stages
+        stages["read"].seconds += prefetcher.seconds
+        stages["validate"].seconds += max(busy - prefetcher.wait, 0.0)
+        for stage in stages.values():
+            stage.bytes = summary.bytes - size
+            stage.records = summary.records - records
+
+
+def check_lines(
+    checker: Checker,
+    lines: Iterable[Tuple[int, Any]],
+    summary: Summary,
+    first_line: int = 1,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Iterator[LineFailure]:
+    """
+    Decode and validate lines one by one, blank lines are skipped
+    :param Checker checker:
+    :param iterable lines: (offset, line)
+    :param Summary summary: counts are updated by every line
+    :param int first_line: number of the first line
+    :param Checkpoint checkpoint: it's saved before line when failures
+        of previous lines were consumed
+    :return: iterator of failures
+    """
+    plan = checker.current_plan()
+    decode = json.JSONDecoder().decode
+    create_report = checker.create_report
+    fail_fast = not checker.soft
+    next_save = math.inf
+    if checkpoint is not None:
+        next_save = summary.lines + checkpoint.every
+    # report of valid line stays empty, it's used for the next line
+    report = create_report(soft=True, fail_fast=fail_fast)
+    for number, (offset, line) in enumerate(lines, first_line):
+        if checkpoint is not None and summary.lines >= next_save:
+            checkpoint.save(offset, summary)
+            next_save = summary.lines + checkpoint.every
+        summary.lines += 1
+        summary.bytes += line_size(line)
+        if not line.strip():
+            continue
+        summary.records += 1
+        try:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            data = decode(line)
+        except ValueError as e:
+            summary.decode_errors += 1
+            yield LineFailure(number, offset, error=str(e))
+            continue
+        if plan.validate(data, report):
+            summary.valid += 1
+            # values counted by limits and items by sample are of one line
+            report.nodes = report.sampled = report.checked = 0
+        else:
+            summary.invalid += 1
+            summary.count_errors(report)
+            yield LineFailure(number, offset, report)
+            report = create_report(soft=True, fail_fast=fail_fast)
+
+
+class NDJSONValidation:
+    """
+    Iterator of failed lines of newline-delimited JSON,
+    summary counts are complete when all failures were consumed
+    Examples:
+    >>> from json_checker import validate_ndjson
+
+    >>> validation = validate_ndjson("events.ndjson", {"id": int})
+    >>> for failure in validation:
+    ...     print(failure.line, failure.offset, failure.report)
+    >>> validation.summary  # <Summary records=1000 valid=998 ...>
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        checker: Checker,
+        workers: int = 1,
+        chunk_size: int = CHUNK_SIZE,
+        checkpoint: Optional[Checkpoint] = None,
+    ):
+        """
+        :param str | file source: path or opened binary file,
+            .gz, .bz2 and .xz files are decompressed by background thread
+        :param Checker checker:
+        :param int workers: count of processes, source must be a path
+        :param int chunk_size: bytes of file per task of worker
+        :param Checkpoint checkpoint: validation resumes from it
+            and saves it periodically, it's removed at the end of file
+        """
+        if workers > 1 and not isinstance(source, (str, os.PathLike)):
+            raise ValueError("workers validate files by path only")
+        if workers > 1 and is_compressed(source):
+            raise ValueError("compressed files are validated by one process")
+        if workers > 1 and checkpoint is not None:
+            raise ValueError("checkpoints are saved by one process")
+        self.source = source
+        self.checker = checker
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.checkpoint = checkpoint
+        self.summary = Summary()
+
+    def __iter__(self) -> Iterator[LineFailure]:
+        source = self.source
+        if self.workers > 1 and isinstance(source, (str, os.PathLike)):
+            return self.validate_parallel(os.fspath(source))
+        return self.validate()
+
+    def validate(self) -> Iterator[LineFailure]:
+        source = self.source
+        if not isinstance(source, (str, os.PathLike)):
+            yield from self.validate_file(source)
+            return
+        with open_source(source) as f:
+            yield from self.validate_file(f)
+
+    def validate_file(self, f: IO[Any]) -> Iterator[LineFailure]:
+        """Batches of lines are read by background thread"""
+        checkpoint = self.checkpoint
+        summary = self.summary
+        start = 0
+        if checkpoint is not None:
+            state = checkpoint.load()
+            if state is not None:
+                start, snapshot = state
+                summary.restore(snapshot)
+                f.seek(start)
+        prefetcher = Prefetcher(lambda: f.readlines(BATCH_SIZE))
+        lines = iter_lines(chain.from_iterable(prefetcher), start)
+        yield from run_stages(
+            check_lines(
+                self.checker, lines, summary, summary.lines + 1, checkpoint
+            ),
+            prefetcher,
+            summary,
+        )
+        if checkpoint is not None:
+            checkpoint.remove()
+
+    def validate_parallel(self, path: str) -> Iterator[LineFailure]:
+        """
+        Ranges of file which start from new lines are validated
+        by processes, failures are yielded in order of lines
+        :param str path: workers open the file by path
+        """
+        limit = self.workers * PENDING_CHUNKS
+        pending: deque = deque()
+        first_line = 1
+        pool = multiprocessing.Pool(
+            self.workers, parallel.init_worker, (dumps(self.checker),)
+        )
+        try:
+            for start, end in split_file(path, self.chunk_size):
+                pending.append(
+                    pool.apply_async(validate_range, (path, start, end))
+                )
+                while len(pending) >= limit:
+                    first_line = yield from self.merge(
+                        pending.popleft(), first_line
+                    )
+            while pending:
+                first_line = yield from self.merge(
+                    pending.popleft(), first_line
+                )
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    def merge(self, result: Any, first_line: int):
+        """
+        :param AsyncResult result: failures of range
+        :param int first_line: number of the first line of range
+        :return: number of the first line of next range
+        """
+        lines, summary, failures = loads(result.get())
+        self.summary.update(summary)
+        for failure in failures:
+            failure.line += first_line - 1
+            yield failure
+        return first_line + lines
+
+
+def split_file(path: str, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """
+    Ranges of file about chunk_size bytes which start from new lines
+    :param str path:
+    :param int chunk_size:
+    :return: iterator of (start, end)
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(start + chunk_size)
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def validate_range(path: str, start: int, end: int) -> bytes:
+    """
+    Task of worker process, numbers of lines start from 1 into range
+    :return: pickled count of lines, summary and failures
+    """
+    summary = Summary()
+    started = perf_counter()
+    with open(path, "rb") as f:
+        f.seek(start)
+        failures = list(
+            check_lines(parallel._checker, iter_lines(f, start, end), summary)
+        )
+    stage = summary.stages["validate"]
+    stage.seconds = perf_counter() - started
+    stage.bytes = summary.bytes
+    stage.records = summary.records
+    return dumps((summary.lines, summary, failures))
+
+
+def validate_ndjson(
+    source: Source,
+    schema: Any,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    checkpoint: Optional[str] = None,
+    checkpoint_every: int = CHECKPOINT_LINES,
+) -> NDJSONValidation:
+    """
+    Validate newline-delimited JSON file line by line in constant memory
+    Examples:
+    >>> from json_checker import Checker, validate_ndjson
+
+    >>> for failure in validate_ndjson("events.ndjson", {"id": int}):
+    ...     print(failure)
+    line 3 (offset 120): From key="id": ...
+
+    # soft reports and 4 processes
+    >>> validate_ndjson("events.ndjson", Checker(schema, soft=True), workers=4)
+
+    # interrupted validation resumes from the last checkpoint
+    >>> validate_ndjson("events.ndjson", schema, checkpoint="events.ckpt")
+
+    # decompression overlaps validation
+    >>> validation = validate_ndjson("events.ndjson.gz", {"id": int})
+    >>> list(validation)
+    >>> validation.summary.stages["read"]  # <Stage read 95.3 MB/s ...>
+
+    :param str | file source: path or opened binary file,
+        .gz, .bz2 and .xz files are decompressed by background thread
+    :param any schema: expected schema of every line or Checker
+    :param int workers: count of processes, source must be a path
+    :param int chunk_size: bytes of file per task of worker
+    :param str checkpoint: file of checkpoint, validation resumes from it
+        and it's removed at the end of file
+    :param int checkpoint_every: checkpoint is saved after so many lines
+    :return: NDJSONValidation
+    """
+    checker = schema if isinstance(schema, Checker) else Checker(schema)
+    progress = None
+    if checkpoint is not None:
+        progress = Checkpoint(checkpoint, checker, checkpoint_every)
+    return NDJSONValidation(source, checker, workers, chunk_size, progress)
+
+
+class ItemFailure:
+    """Not valid item of JSON array"""
+
+    __slots__ = ("index", "position", "pointer", "report")
+
+    def __init__(
+        self, index: int, position: int, pointer: str, report: Report
+    ):
+        """
+        :param int index: index of item into array
+        :param int position: position of the first char of item
+        :param str pointer: JSON Pointer of item into document
+        :param Report report: errors of validation
+        """
+        self.index = index
+        self.position = position
+        self.pointer = pointer
+        self.report = report
+
+    def __repr__(self):
+        return "<ItemFailure %s position=%s>" % (self.pointer, self.position)
+
+    def __str__(self):
+        return "item %s (position %s): %s" % (
+            self.pointer,
+            self.position,
+            self.report,
+        )
+
+
+class JSONArrayReader:
+    """
+    Decodes items of JSON array one by one by `JSONDecoder.raw_decode`
+    over sliding buffer, memory depends on size of items only.
+    Array can be nested into document, it's found by path
+    Examples:
+    >>> with open("export.json", "rb") as f:
+    ...     for index, position, item in JSONArrayReader(f).items("/data"):
+    ...         print(index, item)
+    """
+
+    def __init__(self, f: IO[Any], block_size: int = BLOCK_SIZE):
+        """
+        :param file f: binary or text file
+        :param int block_size: chars read at once
+        """
+        self.f = f
+        self.block_size = block_size
+        self.buffer = ""
+        # position of current char into buffer
+        self.pos = 0
+        # count of chars dropped from the start of buffer
+        self.shift = 0
+        self.eof = False
+        self.bytes = 0
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.raw_decode = json.JSONDecoder().raw_decode
+
+    @property
+    def position(self) -> int:
+        """Position of current char into document"""
+        return self.shift + self.pos
+
+    def error(self, message: str, pos: Optional[int] = None) -> ValueError:
+        """
+        :param str message:
+        :param int pos: position of error into buffer, current by default
+        :return: ValueError
+        """
+        if pos is None:
+            pos = self.pos
+        return ValueError("%s: char %s" % (message, self.shift + pos))
+
+    def read(self, size: int = 0) -> bool:
+        """
+        Drop decoded chars and append next block to buffer
+        :param int size: min count of chars to read
+        :return: False at the end of file
+        """
+        if self.eof:
+            return False
+        pos = self.pos
+        if pos:
+            self.shift += pos
+            self.buffer = self.buffer[pos:]
+            self.pos = 0
+        chunk = self.f.read(max(size, self.block_size))
+        if isinstance(chunk, bytes):
+            self.bytes += len(chunk)
+            text = self.decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if not chunk:
+            self.eof = True
+        self.buffer += text
+        return bool(chunk)
+
+    def skip_space(self) -> str:
+        """
+        :return: next not whitespace char, empty string at the end
+        """
+        while True:
+            self.pos = match_space(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.skip_space()
+        if not char or char not in chars:
+            raise self.error(
+                "Expecting %s" % " or ".join(repr(c) for c in chars)
+            )
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        Decode the next value, buffer grows until it has whole value,
+        malformed value fails without reading the rest of file
+        """
+        self.skip_space()
+        while True:
+            try:
+                value, end = self.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.is_cut(e) and self.read(len(self.buffer)):
+                    continue
+                raise self.error(e.msg, e.pos)
+            # numbers may continue into the next block
+            if NUMBER_TAIL.match(self.buffer, end) and self.read(
+                len(self.buffer)
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def is_cut(self, error: json.JSONDecodeError) -> bool:
+        """Error of decoder is made by the end of buffer, not by value"""
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return VALUE_TAIL.match(self.buffer, error.pos) is not None
+
+    def find(self, path: Sequence[str]):
+        """
+        Skip document until value of path
+        :param list path: keys of objects and indexes of arrays
+        """
+        for step in path:
+            if self.expect("{[") == "{":
+                self.find_key(step)
+            else:
+                self.find_index(step)
+
+    def find_key(self, key: str):
+        if self.skip_space() != "}":
+            while True:
+                name = self.value()
+                self.expect(":")
+                if name == key:
+                    return
+                self.value()
+                if self.expect(",}") == "}":
+                    break
+        raise self.error("Missing key %s" % key)
+
+    def find_index(self, step: str):
+        if not step.isdigit():
+            raise self.error("Expecting index of array, not %s" % step)
+        if self.skip_space() != "]":
+            for _ in range(int(step)):
+                self.value()
+                if self.expect(",]") == "]":
+                    break
+            else:
+                return
+        raise self.error("Missing index %s" % step)
+
+    def items(
+        self, path: Sequence[str] = ()
+    ) -> Iterator[Tuple[int, int, Any]]:
+        """
+        :param list path: keys and indexes of array into document
+        :return: iterator of (index, position, item)
+        """
+        self.find(path)
+        self.expect("[")
+        if self.skip_space() == "]":
+            self.pos += 1
+            self.end(path)
+            return
+        index = 0
+        while True:
+            self.skip_space()
+            position = self.position
+            yield index, position, self.value()
+            if self.expect(",]") == "]":
+                self.end(path)
+                return
+            index += 1
+
+    def end(self, path: Sequence[str]):
+        """
+        Root array is the whole document, only whitespace can follow it,
+        the rest of document around nested array is not read
+        """
+        if not path and self.skip_space():
+            raise self.error("Extra data")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    :param str pointer: JSON Pointer (RFC 6901), e.g. "/data/items"
+    :return: list of keys and indexes
+    """
+    if not pointer:
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError("JSON Pointer must start with '/': %s" % pointer)
+    return [
+        step.replace("~1", "/").replace("~0", "~")
+        for step in pointer[1:].split("/")
+    ]
+
+
+class ArrayValidation:
+    """
+    Iterator of not valid items of JSON array,
+    summary counts are complete when all failures were consumed
+    Examples:
+    >>> from json_checker import validate_json_array
+
+    >>> validation = validate_json_array("export.json", {"id": int}, "/data")
+    >>> for failure in validation:
+    ...     print(failure.pointer, failure.report)  # /data/12 ...
+    >>> validation.summary  # <Summary lines=0 records=1000 valid=999 ...>
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        checker: Checker,
+        pointer: str = "",
+        block_size: int = BLOCK_SIZE,
+    ):
+        """
+        :param str | file source: path or opened file,
+            .gz, .bz2 and .xz files are decompressed by background thread
+        :param Checker checker: checker of every item
+        :param str pointer: JSON Pointer of array into document
+        :param int block_size: chars read at once
+        """
+        self.source = source
+        self.checker = checker
+        self.pointer = pointer
+        self.path = parse_pointer(pointer)
+        self.block_size = block_size
+        self.summary = Summary()
+
+    def __iter__(self) -> Iterator[ItemFailure]:
+        source = self.source
+        if not isinstance(source, (str, os.PathLike)):
+            yield from self.validate_file(source)
+            return
+        with open_source(source) as f:
+            yield from self.validate_file(f)
+
+    def validate_file(self, f: IO[Any]) -> Iterator[ItemFailure]:
+        """Blocks of file are read by background thread"""
+        block_size = self.block_size
+        prefetcher = Prefetcher(lambda: f.read(block_size))
+        yield from run_stages(
+            self.validate(prefetcher), prefetcher, self.summary
+        )
+
+    def validate(self, f: Any) -> Iterator[ItemFailure]:
+        checker = self.checker
+        plan = checker.current_plan()
+        create_report = checker.create_report
+        fail_fast = not checker.soft
+        summary = self.summary
+        reader = JSONArrayReader(f, self.block_size)
+        report = create_report(soft=True, fail_fast=fail_fast)
+        for index, position, item in reader.items(self.path):
+            summary.records += 1
+            summary.bytes = reader.bytes
+            if plan.validate(item, report):
+                summary.valid += 1
+                report.nodes = report.sampled = report.checked = 0
+                continue
+            summary.invalid += 1
+            pointer = "%s/%s" % (self.pointer, index)
+            yield ItemFailure(index, position, pointer, report)
+            report = create_report(soft=True, fail_fast=fail_fast)
+        summary.bytes = reader.bytes
+
+
+def validate_json_array(
+    source: Source,
+    schema: Any,
+    pointer: str = "",
+    block_size: int = BLOCK_SIZE,
+) -> ArrayValidation:
+    """
+    Validate items of huge JSON array without loading whole document,
+    every item is validated as soon as it's decoded and then dropped
+    Examples:
+    >>> from json_checker import validate_json_array
+
+    # [{"id": 1}, ...]
+    >>> for failure in validate_json_array("export.json", {"id": int}):
+    ...     print(failure)
+    item /12 (position 120): From key="id": ...
+
+    # {"meta": {...}, "data": [{"id": 1}, ...]}
+    >>> validate_json_array("export.json", {"id": int}, pointer="/data")
+
+    :param str | file source: path or opened file,
+        .gz, .bz2 and .xz files are decompressed by background thread
+    :param any schema: expected schema of every item or Checker
+    :param str pointer: JSON Pointer of array into document
+    :param int block_size: chars read at once
+    :return: ArrayValidation
+    """
+    checker = schema if isinstance(schema, Checker) else Checker(schema)
+    return ArrayValidation(source, checker, pointer, block_size)
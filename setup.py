@@ -20,10 +20,24 @@ setup(
     license='MIT license',
     py_modules=[
         'json_checker.app',
+        'json_checker.files',
         'json_checker.core.base',
+        'json_checker.core.cache',
         'json_checker.core.checkers',
+        'json_checker.core.codegen',
+        'json_checker.core.compiler',
+        'json_checker.core.deadlines',
+        'json_checker.core.decoder',
         'json_checker.core.exceptions',
+        'json_checker.core.lazy',
+        'json_checker.core.limits',
+        'json_checker.core.paths',
+        'json_checker.core.parallel',
+        'json_checker.core.patch',
+        'json_checker.core.errors',
+        'json_checker.core.registry',
         'json_checker.core.reports',
+        'json_checker.core.sampling',
     ],
     python_requires='>=3.6',
     long_description=codecs.open('README.rst', 'r', 'utf-8').read(),
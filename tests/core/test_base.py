@@ -0,0 +1,172 @@
+import tracemalloc
+from collections import Counter, OrderedDict, defaultdict, deque, namedtuple
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from json_checker.core.base import (
+    ReprLimits,
+    bounded_repr,
+    format_data,
+    repr_limits,
+)
+
+
+class NotRendered:
+    def __repr__(self):
+        raise AssertionError("items must not be rendered")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        1,
+        "it's",
+        b"bytes",
+        1.5,
+        [1, "2", None],
+        (1,),
+        (),
+        {1, 2},
+        set(),
+        frozenset({1}),
+        frozenset(),
+        {"key": [1, {"key2": (True,)}], 2: {}},
+        [int, str],
+    ],
+)
+def test_bounded_repr_of_small_data(data):
+    assert bounded_repr(data) == repr(data)
+
+
+@pytest.mark.parametrize(
+    "data, exp_repr",
+    [
+        [list(range(101)), "<list len=101>"],
+        [{"key": [NotRendered()] * 200}, "{'key': <list len=200>}"],
+        [[[[[[[1]]]]]], "[[[[[<list len=1>]]]]]"],
+        [OrderedDict((i, i) for i in range(101)), "<OrderedDict len=101>"],
+    ],
+)
+def test_bounded_repr_of_large_data(data, exp_repr):
+    assert bounded_repr(data) == exp_repr
+
+
+class Items(list):
+    pass
+
+
+class Text(str):
+    pass
+
+
+Point = namedtuple("Point", "x y")
+
+
+class Settings(Mapping):
+    def __init__(self, **data):
+        self.data = data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        raise AssertionError("repr of container must not be called")
+
+
+class Numbers(Sequence):
+    def __getitem__(self, index):
+        return range(1000)[index]
+
+    def __len__(self):
+        return 1000
+
+    def __repr__(self):
+        raise AssertionError("repr of container must not be called")
+
+
+@pytest.mark.parametrize(
+    "data, exp_repr",
+    [
+        [Point(x=1, y=2), "Point(x=1, y=2)"],
+        [OrderedDict([("key", 1)]), "OrderedDict({'key': 1})"],
+        [defaultdict(list, key=[1]), "defaultdict({'key': [1]})"],
+        [Counter("abca"), "Counter({'a': 2, 'b': 1, 'c': 1})"],
+        [Items([1, (2,)]), "Items([1, (2,)])"],
+        [Items(), "Items([])"],
+        [Settings(a=(1,)), "Settings({'a': (1,)})"],
+        [deque([1, 2]), "deque([1, 2])"],
+        [range(3), "range(0, 3)"],
+    ],
+)
+def test_bounded_repr_of_subclasses(data, exp_repr):
+    assert bounded_repr(data) == exp_repr
+
+
+@pytest.mark.parametrize(
+    "data, exp_repr",
+    [
+        [Items([NotRendered()] * 101), "<Items len=101>"],
+        [Numbers(), "<Numbers len=1000>"],
+        [Point(x=[1], y="x" * 2000), "Point(x=[1], y='%s..." % ("x" * 984)],
+        [
+            OrderedDict([("key", [NotRendered()] * 200)]),
+            "OrderedDict({'key': <list len=200>})",
+        ],
+    ],
+)
+def test_bounded_repr_of_large_subclasses(data, exp_repr):
+    assert bounded_repr(data) == exp_repr
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        list(range(10 ** 6)),
+        OrderedDict([("key", list(range(10 ** 6)))]),
+        Point(x=list(range(10 ** 6)), y=1),
+    ],
+)
+def test_bounded_repr_memory(data):
+    tracemalloc.start()
+    try:
+        text = bounded_repr(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert "len=1000000" in text
+    assert peak < 64 * 1024
+
+
+@pytest.mark.parametrize("data", [Text("x" * 2000), bytearray(b"x" * 2000)])
+def test_bounded_repr_of_long_strings(data):
+    text = bounded_repr(data)
+    assert len(text) == 1003
+    assert text.endswith("xxx...")
+
+
+def test_bounded_repr_max_length():
+    assert bounded_repr("x" * 2000) == "'%s..." % ("x" * 999)
+    text = bounded_repr(["x" * 600, "y" * 600, NotRendered()])
+    assert len(text) == 1003
+    assert text.endswith("yyy...")
+
+
+def test_bounded_repr_custom_limits():
+    limits = ReprLimits(max_length=15, max_depth=1, max_items=3)
+    assert bounded_repr([1, 2, 3], limits) == "[1, 2, 3]"
+    assert bounded_repr([1, 2, 3, 4], limits) == "<list len=4>"
+    assert bounded_repr([[1]], limits) == "[<list len=1>]"
+    assert bounded_repr("x" * 20, limits) == "'%s..." % ("x" * 14)
+
+
+def test_format_data_uses_repr_limits(monkeypatch):
+    monkeypatch.setattr(repr_limits, "max_items", 2)
+    assert format_data([1, 2, 3]) == "<list len=3> (list)"
+    assert format_data([1, 2]) == "[1, 2] (list)"
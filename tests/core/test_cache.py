@@ -0,0 +1,176 @@
+import marshal
+import pickle
+from collections import OrderedDict
+
+import pytest
+
+from json_checker import Checker
+from json_checker.core import cache as cache_module
+from json_checker.core.cache import CachedNode, ValidationCache, cached_plan
+from json_checker.core.checkers import Or
+from json_checker.core.compiler import DictNode, compile_schema
+from json_checker.core.exceptions import CheckerError, DictCheckerError
+
+SCHEMA = {"id": int, "items": [{"name": str, "price": float}]}
+
+
+def payload(size=3):
+    return {
+        "id": 1,
+        "items": [{"name": "item %s" % i, "price": 1.5} for i in range(size)],
+    }
+
+
+def test_unchanged_data_is_found():
+    cache = ValidationCache(min_size=0)
+    checker = Checker(SCHEMA, cache=cache)
+    data = payload()
+    checker.validate(data)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 5, 5)
+    checker.validate(payload())
+    assert (cache.hits, cache.misses, len(cache)) == (1, 5, 5)
+
+    data["items"][0]["price"] = 2.5
+    checker.validate(data)
+    # root, items and the first item are validated again
+    assert (cache.hits, cache.misses, len(cache)) == (3, 8, 8)
+    assert repr(cache).startswith("<ValidationCache entries=8 bytes=")
+
+
+def test_invalid_data_is_not_cached():
+    cache = ValidationCache(min_size=0)
+    checker = Checker(SCHEMA, cache=cache)
+    data = payload()
+    data["items"][1]["price"] = "1"
+    for _ in range(2):
+        with pytest.raises(DictCheckerError):
+            checker.validate(data)
+        assert not checker.is_valid(data)
+    # hard checker stops on the second item, only the first one is valid
+    assert len(cache) == 1
+    cache.clear()
+    with pytest.raises(CheckerError):
+        Checker(SCHEMA, soft=True, cache=cache).validate(data)
+    # soft checker visits the third item too
+    assert len(cache) == 2
+
+
+def test_entries_are_evicted():
+    cache = ValidationCache(max_entries=3, min_size=0)
+    checker = Checker(SCHEMA, cache=cache)
+    checker.validate(payload())
+    assert (len(cache), cache.evictions) == (3, 2)
+    checker.validate(payload())
+    assert cache.hits == 1
+
+    cache = ValidationCache(max_bytes=1, min_size=0)
+    Checker(SCHEMA, cache=cache).validate(payload())
+    assert (len(cache), cache.bytes, cache.evictions) == (0, 0, 5)
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.evictions) == (0, 0, 0)
+
+
+def test_small_and_not_encoded_data_is_not_cached():
+    cache = ValidationCache(min_size=1000)
+    Checker(SCHEMA, cache=cache).validate(payload())
+    assert (len(cache), cache.misses) == (0, 0)
+
+    cache = ValidationCache(min_size=0)
+    data = OrderedDict(payload())
+    Checker(SCHEMA, cache=cache).validate(data)
+    # dict subclass at root, list and items are cached
+    assert len(cache) == 4
+
+
+def test_big_data_is_kept_by_digest():
+    cache = ValidationCache()
+    Checker(SCHEMA, cache=cache).validate(payload(100))
+    token, size, digest = next(iter(cache.entries))
+    assert size > 256 and len(digest) == 32
+
+
+def nested(depth):
+    schema = {"id": int, "tags": [str]}
+    data = {"id": 0, "tags": ["a", "b", "c"]}
+    for level in range(1, depth):
+        schema = {"id": int, "tags": [str], "child": schema}
+        data = {"id": level, "tags": ["a", "b", "c"], "child": data}
+    return schema, data
+
+
+@pytest.mark.parametrize("depth", [1, 5, 50])
+def test_nested_data_is_encoded_once(monkeypatch, depth):
+    encoded = []
+
+    class Marshal:
+        @staticmethod
+        def dumps(value, version):
+            result = marshal.dumps(value, version)
+            encoded.append(len(result))
+            return result
+
+    monkeypatch.setattr(cache_module, "marshal", Marshal)
+    schema, data = nested(depth)
+    cache = ValidationCache(min_size=0)
+    checker = Checker(schema, cache=cache)
+    checker.validate(data)
+    # every level is encoded by a few cached nodes, not by all parents,
+    # so encoded bytes don't grow with depth faster than data does
+    assert sum(encoded) <= 8 * len(marshal.dumps(data, 4))
+    assert (cache.hits, len(cache)) == (0, 2 * depth)
+
+    checker.validate(nested(depth)[1])
+    assert cache.hits == 1
+    deepest = data
+    while "child" in deepest:
+        deepest = deepest["child"]
+    deepest["tags"].append("d")
+    assert checker.is_valid(data)
+    # only the changed list and its parents are validated again
+    assert cache.hits == 1 + max(depth - 1, 0)
+    deepest["tags"].append(1)
+    assert not checker.is_valid(data)
+    with pytest.raises(CheckerError):
+        checker.validate(data)
+
+
+def test_only_pure_nodes_are_cached():
+    cache = ValidationCache()
+    schema = {
+        "id": lambda x: x > 0,
+        "user": {"name": str},
+        "value": Or({"a": int}, [int]),
+    }
+    plan, pure = cached_plan(compile_schema(schema), cache)
+    assert not pure
+    assert isinstance(plan, DictNode)
+    assert isinstance(plan.index["user"].node, CachedNode)
+    alternatives = plan.index["value"].node.alternatives
+    assert all(isinstance(node, CachedNode) for node in alternatives)
+
+
+def test_original_plan_is_not_changed():
+    checker = Checker(SCHEMA, cache=ValidationCache())
+    plan = checker.compile()
+    checker.validate(payload())
+    assert checker.compile() is not plan
+    assert not isinstance(checker.compile().index["items"].node, CachedNode)
+    assert checker.with_cache(checker._plan) is checker.with_cache(
+        checker._plan
+    )
+
+
+def test_generated_plan_with_cache():
+    cache = ValidationCache(min_size=0)
+    checker = Checker(SCHEMA, cache=cache)
+    checker.compile(generate=True)
+    checker.validate(payload())
+    checker.validate(payload())
+    assert cache.hits == 1
+
+
+def test_cache_is_not_pickled():
+    checker = Checker(SCHEMA, cache=ValidationCache())
+    checker.validate(payload())
+    assert pickle.loads(pickle.dumps(checker)).cache is None
@@ -0,0 +1,194 @@
+import os
+
+import pytest
+
+from json_checker import Checker
+from json_checker.core import codegen, parallel
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.codegen import (
+    describe,
+    fingerprint,
+    generate_source,
+    load_plan,
+)
+from json_checker.core.compiler import compile_schema
+from json_checker.core.exceptions import CheckerError
+from json_checker.core.registry import register
+from json_checker.core.reports import AggregatedReport, Report
+
+positive = register(lambda x: x > 0, name="tests.positive")
+
+SCHEMAS = [
+    [int, "1"],
+    [None, 1],
+    [[int], [1, "2", "3"]],
+    [[int, str], [1, 2]],
+    [[int, str], ["1", 2, 3]],
+    [[], [1]],
+    [[int], {}],
+    [{"id": int, "name": str}, {"id": "1", "name": 2}],
+    [{"id": int, OptionalKey("name"): str}, {"id": 1, "name": 2}],
+    [{"id": int}, {"id": 1, "extra": 2}],
+    [{"id": {"key": [bool]}}, {"id": {"key": [1, True]}}],
+    [{"id": {"key": [bool]}}, {"id": []}],
+    [Or(int, None), "1"],
+    [Or({"key1": int}, {"key2": str}), {"key2": 12}],
+    [Or({"key1": int}, {"key2": str}), {"key1": "1"}],
+    [{"key": Or(int, [int])}, {"key": ["1"]}],
+    [And(int, positive), -1],
+    [{"key": And(int, positive)}, {"key": "1"}],
+    [[positive], [1, -1]],
+    [{"key": 100.5, "key2": "%s"}, {"key": 1.5, "key2": "%d"}],
+]
+
+
+def run(plan, data, soft):
+    report = Report(soft)
+    try:
+        result = plan.validate(data, report)
+    except CheckerError as e:
+        return type(e), str(e)
+    return result, str(report)
+
+
+@pytest.mark.parametrize("soft", [True, False])
+@pytest.mark.parametrize("schema, current_data", SCHEMAS)
+def test_generated_same_as_compiled(schema, current_data, soft):
+    generated = load_plan(schema)
+    compiled = compile_schema(schema)
+    assert run(generated, current_data, soft) == run(
+        compiled, current_data, soft
+    )
+
+
+@pytest.mark.parametrize("schema, current_data", SCHEMAS)
+def test_generated_max_errors(schema, current_data):
+    reports = [Report(max_errors=1), Report(max_errors=1)]
+    load_plan(schema).validate(current_data, reports[0])
+    compile_schema(schema).validate(current_data, reports[1])
+    generated, compiled = [
+        (str(r), r.count, r.truncated, r.skipped) for r in reports
+    ]
+    assert generated == compiled
+
+
+@pytest.mark.parametrize("schema, current_data", SCHEMAS)
+def test_generated_aggregates(schema, current_data):
+    reports = [AggregatedReport(), AggregatedReport()]
+    load_plan(schema).validate(current_data, reports[0])
+    compile_schema(schema).validate(current_data, reports[1])
+    generated, compiled = [str(r) for r in reports]
+    assert generated == compiled
+
+
+@pytest.mark.parametrize("schema, current_data", SCHEMAS)
+def test_generated_is_valid(schema, current_data):
+    assert load_plan(schema).is_valid(current_data) is (
+        compile_schema(schema).is_valid(current_data)
+    )
+
+
+def records(plan, data):
+    report = Report(soft=True)
+    plan.validate(data, report)
+    return [
+        (e.kind, e.path, repr(e.expected), e.value) for e in report.records()
+    ]
+
+
+@pytest.mark.parametrize("schema, current_data", SCHEMAS)
+def test_generated_records_same_as_compiled(schema, current_data):
+    generated = load_plan(schema)
+    compiled = compile_schema(schema)
+    assert records(generated, current_data) == records(compiled, current_data)
+
+
+@pytest.mark.parametrize(
+    "schema, current_data",
+    [
+        [int, 1],
+        [[int, str], [1, "2"]],
+        [[int], [1, 2, 3]],
+        [[], []],
+        [{"id": int, OptionalKey("name"): str}, {"id": 1}],
+        [{"id": [{"key": Or(int, None)}]}, {"id": [{"key": None}]}],
+        [{"key": And(int, positive)}, {"key": 1}],
+    ],
+)
+def test_generated_valid_data(schema, current_data):
+    assert load_plan(schema).validate(current_data, Report(False)) is True
+
+
+def test_generated_stops_on_first_error():
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x > 0
+
+    register(is_positive, name="test_codegen.is_positive")
+    plan = load_plan([{"key": [is_positive]}])
+    with pytest.raises(CheckerError):
+        plan.validate([{"key": [1, -2, 3]}, {"key": [-4]}], Report(False))
+    assert calls == [1, -2]
+    report = Report(soft=False, fail_fast=False)
+    with pytest.raises(CheckerError):
+        plan.validate([{"key": [1, -2, 3]}, {"key": [-4]}], report)
+    assert calls == [1, -2, 1, -2, 3]
+
+
+def test_generated_ignore_extra_keys():
+    plan = load_plan({"id": int}, ignore_extra_keys=True)
+    assert plan.validate({"id": 1, "extra": 2}, Report(False)) is True
+
+
+def test_source_references_registry():
+    source = generate_source({"key": positive})
+    assert "resolve('tests.positive')" in source
+    compile(source, "<generated>", "exec")
+
+
+def test_fingerprint():
+    assert fingerprint({"key": int}) == fingerprint({"key": int})
+    assert fingerprint({"key": int}) != fingerprint({"key": str})
+    assert fingerprint({"key": int}) != fingerprint({"key": int}, True)
+    assert fingerprint([positive]) == fingerprint([positive])
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [lambda x: x, object(), {int: int}, {"key": {1, 2}}, float("nan")],
+)
+def test_not_supported_schema(schema):
+    with pytest.raises(ValueError):
+        describe(schema)
+
+
+def test_cache_dir(tmp_path, monkeypatch):
+    schema = {"id": int, "tags": [str]}
+    plan = load_plan(schema, cache_dir=str(tmp_path))
+    assert plan.path == os.path.join(
+        str(tmp_path), "%s.py" % fingerprint(schema)
+    )
+    assert os.path.exists(plan.path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("source must be loaded from cache")
+
+    monkeypatch.setattr(codegen, "generate_source", fail)
+    cached = load_plan(schema, cache_dir=str(tmp_path))
+    assert cached.source == plan.source
+    assert cached.validate({"id": 1, "tags": ["a"]}, Report(False))
+
+
+def test_workers_load_plan_from_cache_dir(tmp_path, monkeypatch):
+    checker = Checker({"id": int, "tags": [str]})
+    plan = checker.compile(cache_dir=str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("source must be loaded from cache")
+
+    monkeypatch.setattr(codegen, "generate_source", fail)
+    monkeypatch.setattr(parallel, "_checker", None)
+    parallel.init_worker(parallel.dumps(checker))
+    assert parallel._checker._plan.path == plan.path
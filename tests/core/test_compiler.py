@@ -0,0 +1,389 @@
+import pytest
+
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.compiler import (
+    AndNode,
+    CustomNode,
+    DictNode,
+    FunctionNode,
+    ListNode,
+    LiteralNode,
+    OrNode,
+    TypeNode,
+    compile_schema,
+)
+from json_checker.core.exceptions import (
+    CheckerError,
+    DictCheckerError,
+    ListCheckerError,
+    MissKeyCheckerError,
+    TypeCheckerError,
+)
+from json_checker.core.reports import Report
+
+
+class WithValidate:
+    def validate(self, data):
+        report = Report(soft=True)
+        if data != "custom":
+            report.add("custom error")
+        return report
+
+
+@pytest.mark.parametrize(
+    "schema, node_class",
+    [
+        [int, TypeNode],
+        [1, LiteralNode],
+        ["test", LiteralNode],
+        [None, LiteralNode],
+        [True, LiteralNode],
+        [lambda x: x, FunctionNode],
+        [[int], ListNode],
+        [(int, str), ListNode],
+        [{"key": int}, DictNode],
+        [Or(int, None), OrNode],
+        [And(int, lambda x: x > 0), AndNode],
+        [WithValidate(), CustomNode],
+    ],
+)
+def test_compile_schema_node(schema, node_class):
+    assert isinstance(compile_schema(schema), node_class)
+
+
+def test_compile_dict_fields():
+    node = compile_schema({"key1": int, OptionalKey("key2"): [str]})
+    assert [f.key for f in node.fields] == ["key1", "key2"]
+    assert [f.optional for f in node.fields] == [False, True]
+    assert isinstance(node.fields[1].node, ListNode)
+    assert list(node.index) == ["key1", "key2"]
+    assert node.required == 1
+
+
+def test_compile_ignore_extra_keys_only_for_dicts():
+    node = compile_schema({"key": {"k": int}, "items": [{}]}, True)
+    assert node.ignore_extra_keys is True
+    assert node.fields[0].node.ignore_extra_keys is True
+    assert node.fields[1].node.items[0].ignore_extra_keys is False
+
+
+def test_compiled_plan_is_reusable():
+    plan = compile_schema({"id": int, "items": [int]})
+    for data in ({"id": 1, "items": [1]}, {"id": 2, "items": [1, 2, 3]}):
+        report = Report(soft=False)
+        assert plan.validate(data, report) is True
+        assert not report.has_errors()
+
+
+def test_or_node_caches_candidates_by_type():
+    node = compile_schema(Or(int, None, [int]))
+    assert node.validate(1, Report()) is True
+    assert node.validate([1], Report()) is True
+    assert set(node.candidates) == {int, list}
+
+
+def test_and_node_stops_on_first_failed_condition():
+    calls = []
+    node = compile_schema(And(int, lambda x: calls.append(x) or True))
+    report = Report(soft=True)
+    assert node.validate("1", report) is False
+    assert calls == []
+    assert report == (
+        "Not valid data: "
+        "current value '1' (str) is not And(int, <lambda>) (And)"
+    )
+
+
+def test_custom_node_merges_report():
+    report = Report(soft=True)
+    assert compile_schema(WithValidate()).validate("other", report) is False
+    assert report == "custom error"
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, exp_message",
+    [
+        [int, "1", "current value '1' (str) is not int"],
+        [
+            {"test": [int]},
+            {"test": [1, "2"]},
+            "From key=\"test\": \n\tcurrent value '2' (str) is not int",
+        ],
+        [
+            [{"key": int}],
+            [{"key": 1}, {}],
+            "Missing keys in current response: key",
+        ],
+        [
+            Or({"key1": int}, {"key2": str}),
+            {"key2": 12},
+            'From key="key2": \n\tcurrent value 12 (int) is not str',
+        ],
+    ],
+)
+def test_soft_messages(schema, current_data, exp_message):
+    report = Report(soft=True)
+    assert compile_schema(schema).validate(current_data, report) is False
+    assert report == exp_message
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, exception",
+    [
+        [int, "1", TypeCheckerError],
+        [[int], [1, "2"], ListCheckerError],
+        [{"key": int}, {"key": "1"}, DictCheckerError],
+        [{"key": int}, {}, MissKeyCheckerError],
+        [{"key": {"k": int}}, {"key": {}}, DictCheckerError],
+    ],
+)
+def test_hard_exceptions(schema, current_data, exception):
+    with pytest.raises(exception):
+        compile_schema(schema).validate(current_data, Report(soft=False))
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, exp_message",
+    [
+        [[int], [1, "2", "3"], "current value '2' (str) is not int"],
+        [
+            {"key": [int], "key2": str},
+            {"key": ["1", "2"], "key2": 2},
+            "From key=\"key\": \n\tcurrent value '1' (str) is not int",
+        ],
+        [
+            {"key": {"key2": int, "key3": int}},
+            {"key": {"key3": "3"}},
+            'From key="key": \n\tMissing keys in current response: key2',
+        ],
+        [
+            {"key": Or({"a": int}, {"b": str})},
+            {"key": {"a": "1"}},
+            'From key="key": \n\tFrom key="a": \n\t'
+            "current value '1' (str) is not int",
+        ],
+    ],
+)
+def test_hard_stops_on_first_error(schema, current_data, exp_message):
+    with pytest.raises(CheckerError) as e:
+        compile_schema(schema).validate(current_data, Report(soft=False))
+    assert str(e.value) == exp_message
+
+
+def test_hard_does_not_validate_after_first_error():
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x > 0
+
+    node = compile_schema({"key": [is_positive], "key2": int})
+    with pytest.raises(DictCheckerError):
+        node.validate({"key": [1, -2, -3, 4], "key2": "5"}, Report(False))
+    assert calls == [1, -2]
+
+
+def test_hard_without_fail_fast():
+    node = compile_schema({"key": [int]})
+    with pytest.raises(DictCheckerError) as e:
+        node.validate({"key": ["1", "2"]}, Report(soft=False, fail_fast=False))
+    assert str(e.value) == (
+        'From key="key": \n\t'
+        "current value '1' (str) is not int\n"
+        "current value '2' (str) is not int"
+    )
+
+
+def test_soft_with_fail_fast():
+    report = Report(soft=True, fail_fast=True)
+    node = compile_schema({"key": int, "key2": int})
+    assert node.validate({"key": "1", "key2": "2"}, report) is False
+    assert report == (
+        "From key=\"key\": \n\tcurrent value '1' (str) is not int"
+    )
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, exp_count, exp_skipped",
+    [
+        [[int], ["1"] * 10, 3, 7],
+        [{"key": int, "key2": int, "key3": int, "key4": int}, {}, 3, 1],
+        [{"key": [int], "key2": [int]}, {"key": ["1"] * 5, "key2": []}, 3, 3],
+        [[Or(int, [int])], [["1", "2", "3", "4"], "5"], 3, 2],
+        [[And(int, lambda x: x > 0)], [-1, -2, "3", -4], 3, 1],
+    ],
+)
+def test_max_errors(schema, current_data, exp_count, exp_skipped):
+    report = Report(soft=True, max_errors=3)
+    assert compile_schema(schema).validate(current_data, report) is False
+    assert report.count == exp_count
+    assert report.truncated is True
+    assert report.skipped == exp_skipped
+    assert str(report).endswith(
+        "Validation stopped after 3 errors, %s items skipped" % exp_skipped
+    )
+
+
+def test_max_errors_not_reached():
+    report = Report(soft=True, max_errors=3)
+    node = compile_schema([int])
+    assert node.validate([1, "2", 3, "4", "5"], report) is False
+    assert report.count == 3
+    assert report.truncated is False
+    assert report.skipped == 0
+    assert "Validation stopped" not in str(report)
+
+
+def test_max_errors_of_dropped_or_candidates():
+    report = Report(soft=True, max_errors=2)
+    node = compile_schema([Or([int], [str])])
+    assert node.validate([[1, 2, "3"], [None]], report) is False
+    assert report.count == 2
+    assert report.truncated is False
+    assert report == (
+        "current value '3' (str) is not int\n" "current value None is not str"
+    )
+
+
+WIDE_SCHEMA = {"key%d" % i: int for i in range(100)}
+WIDE_SCHEMA.update({OptionalKey("opt%d" % i): str for i in range(100)})
+
+
+@pytest.mark.parametrize("ignore_extra_keys", [True, False])
+def test_wide_dict_valid(ignore_extra_keys):
+    node = compile_schema(WIDE_SCHEMA, ignore_extra_keys)
+    data = {"key%d" % i: i for i in range(100)}
+    data["opt7"] = "7"
+    assert node.validate(data, Report(soft=False)) is True
+
+
+@pytest.mark.parametrize(
+    "data, exp_message",
+    [
+        [
+            {"key%d" % i: i for i in range(1, 100)},
+            "Missing keys in current response: key0",
+        ],
+        [
+            dict({"key%d" % i: i for i in range(100)}, opt1=1),
+            'From key="opt1": \n\tcurrent value 1 (int) is not str',
+        ],
+        [
+            dict({"key%d" % i: i for i in range(100)}, extra=1),
+            "Missing keys in expected schema: extra",
+        ],
+        [
+            dict({"key%d" % i: i for i in range(1, 100)}, key3="3", extra=1),
+            "From key=\"key3\": \n\tcurrent value '3' (str) is not int\n"
+            "Missing keys in current response: key0\n"
+            "Missing keys in expected schema: extra",
+        ],
+    ],
+)
+def test_wide_dict_errors(data, exp_message):
+    report = Report(soft=True)
+    assert compile_schema(WIDE_SCHEMA).validate(data, report) is False
+    assert report == exp_message
+
+
+def test_wide_dict_ignore_extra_keys():
+    data = dict({"key%d" % i: i for i in range(100)}, extra=1)
+    node = compile_schema(WIDE_SCHEMA, ignore_extra_keys=True)
+    assert node.validate(data, Report(soft=False)) is True
+
+
+@pytest.mark.parametrize(
+    "data, exception",
+    [
+        [{"key%d" % i: i for i in range(1, 100)}, MissKeyCheckerError],
+        [{"key%d" % i: str(i) for i in range(100)}, DictCheckerError],
+    ],
+)
+def test_wide_dict_hard(data, exception):
+    with pytest.raises(exception):
+        compile_schema(WIDE_SCHEMA).validate(data, Report(soft=False))
+
+
+class NotComparable(dict):
+    def __eq__(self, other):
+        raise AssertionError("must not be compared")
+
+    __hash__ = None
+
+
+@pytest.mark.parametrize(
+    "schema, literal",
+    [
+        [1, True],
+        [int, False],
+        [[1, "2", None], True],
+        [[1, int], False],
+        [{"key": [1, {"key2": 2.5}]}, True],
+        [{"key": [1, {"key2": float}]}, False],
+        [{OptionalKey("key"): 1}, False],
+        [Or(1, 2), False],
+        [[], True],
+        [{}, True],
+    ],
+)
+def test_literal_nodes(schema, literal):
+    assert compile_schema(schema).literal is literal
+
+
+def test_type_nodes_are_not_compared():
+    node = compile_schema({"key": {"key2": [int]}, "key3": [{"key": str}]})
+    data = NotComparable(
+        key=NotComparable(key2=[1, 2]), key3=[NotComparable(key="1")]
+    )
+    assert node.validate(data, Report(soft=False)) is True
+
+
+def test_literal_node_compared_once():
+    node = compile_schema({"key": [1, 2, {"key2": "3"}]})
+    assert node.validate({"key": [1, 2, {"key2": "3"}]}, Report()) is True
+    report = Report(soft=True)
+    assert node.validate({"key": [1, 2, {"key2": 3}]}, report) is False
+    assert report == (
+        'From key="key": \n\tFrom key="key2": \n\t'
+        "current value 3 (int) is not '3' (str)"
+    )
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, expected",
+    [
+        [int, 1, True],
+        [int, "1", False],
+        ["1", "1", True],
+        [lambda x: x > 0, 1, True],
+        [lambda x: x > 0, "1", False],
+        [[int], [1, 2], True],
+        [[int], [1, "2"], False],
+        [[int, str], [1, "2"], True],
+        [[], [1], False],
+        [{"key": int, OptionalKey("key2"): str}, {"key": 1}, True],
+        [{"key": int}, {"key": 1, "key2": 2}, False],
+        [{"key": int}, {}, False],
+        [Or(int, None), None, True],
+        [Or(int, None), "1", False],
+        [And(int, lambda x: x > 0), -1, False],
+        [WIDE_SCHEMA, {"key%d" % i: i for i in range(100)}, True],
+        [WIDE_SCHEMA, {"key%d" % i: i for i in range(1, 100)}, False],
+        [WIDE_SCHEMA, dict({"key%d" % i: i for i in range(99)}, e=1), False],
+    ],
+)
+def test_is_valid(schema, current_data, expected):
+    node = compile_schema(schema)
+    assert node.is_valid(current_data) is expected
+    assert node.validate(current_data, Report(soft=True)) is expected
+
+
+def test_is_valid_stops_on_first_error():
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        return x > 0
+
+    assert compile_schema([is_positive]).is_valid([1, -1, 2, 3]) is False
+    assert calls == [1, -1]
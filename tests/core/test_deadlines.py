@@ -0,0 +1,149 @@
+import json
+import time
+
+import pytest
+
+from json_checker import And, Checker, Or, Sample
+from json_checker.core import deadlines
+from json_checker.core.compiler import DictNode, compile_schema
+from json_checker.core.deadlines import TimedNode, timed_plan
+from json_checker.core.errors import DEADLINE
+from json_checker.core.exceptions import CheckerError, DictCheckerError
+from json_checker.core.reports import Report
+
+SCHEMA = {"id": int, "items": [{"id": int, "name": str}]}
+
+
+def payload(size=1000):
+    return {
+        "id": 1,
+        "items": [{"id": i, "name": "item %s" % i} for i in range(size)],
+    }
+
+
+@pytest.fixture
+def interval(monkeypatch):
+    monkeypatch.setattr(deadlines, "CHECK_INTERVAL", 10)
+
+
+def test_valid_data_before_deadline():
+    checker = Checker(SCHEMA, budget_ms=10000)
+    data = payload()
+    assert checker.validate(data) is data
+    assert checker.validate(data, deadline=time.monotonic() + 10) is data
+
+
+def test_soft_report_is_incomplete(interval):
+    checker = Checker(SCHEMA, soft=True)
+    data = payload()
+    data["items"][0]["id"] = "1"
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data, deadline=time.monotonic() - 1)
+    report = error.value.report
+    assert report.expired and report.truncated
+    # root dict, id, items, two items with their fields and the third item
+    assert report.reached.path == ("items", 2)
+    assert report.skipped == 997
+    assert [record.kind for record in report.records()] == ["type", DEADLINE]
+    assert str(report).endswith(
+        "Validation stopped by deadline at /items/2, report is incomplete"
+    )
+
+
+def test_hard_checker_raises_expired_report(interval):
+    checker = Checker(SCHEMA, budget_ms=0)
+    with pytest.raises(DictCheckerError) as error:
+        checker.validate(payload())
+    report = error.value.report
+    assert report.expired
+    assert report.reached.path == ("items", 2)
+
+
+def test_functions_check_time_every_call():
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.002)
+        return True
+
+    checker = Checker([slow], soft=True, budget_ms=10)
+    with pytest.raises(CheckerError) as error:
+        checker.validate(list(range(1000)))
+    assert len(calls) < 100
+    assert error.value.report.reached.path == (len(calls),)
+
+
+def test_deadline_inside_or(interval):
+    checker = Checker({"items": [Or({"id": int}, {"name": str})]}, soft=True)
+    data = {"items": [{"name": "a"}] * 100}
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data, deadline=time.monotonic() - 1)
+    report = error.value.report
+    assert report.expired
+    assert report.reached.path[0] == "items"
+    assert report.count <= 2
+
+
+def test_deadline_with_sample(interval):
+    sample = Sample(every=10)
+    checker = Checker(SCHEMA, soft=True, sample=sample, budget_ms=0)
+    with pytest.raises(CheckerError) as error:
+        checker.validate(payload())
+    assert error.value.report.reached.path == ("items", 20)
+    assert checker.with_deadline(checker._plan) is checker._timed_plan[1]
+
+
+def test_deadline_with_only():
+    checker = Checker(SCHEMA, budget_ms=100)
+    with pytest.raises(ValueError):
+        checker.validate(payload(), only=["id"])
+
+
+def test_timed_plan_keeps_original():
+    plan = compile_schema(SCHEMA)
+    timed = timed_plan(plan)
+    assert isinstance(timed, TimedNode) and type(timed.node) is DictNode
+    assert type(plan.fields[0].node) is not TimedNode
+    assert timed.is_valid(payload(3))
+
+    report = Report(soft=True)
+    deadlines.start(report, time.monotonic() + 10)
+    assert timed.validate(payload(3), report) and not report.expired
+    assert report.reached is None
+
+
+def test_deadline_inside_and(interval):
+    checker = Checker(
+        {"items": [And({"id": int}, lambda item: True)]}, soft=True
+    )
+    with pytest.raises(CheckerError) as error:
+        checker.validate({"items": [{"id": 1}] * 100}, deadline=0)
+    report = error.value.report
+    assert report.expired and report.truncated
+    assert report.reached.path[0] == "items"
+    assert [record.kind for record in report.records()] == [DEADLINE]
+
+
+def test_budget_of_decoded_and_lazy_data(interval):
+    checker = Checker(SCHEMA, budget_ms=0)
+    text = json.dumps(payload())
+    for validate in (
+        checker.validate_str,
+        lambda text: checker.validate_bytes(text.encode()),
+        lambda text: checker.lazy(json.loads(text)),
+    ):
+        with pytest.raises(DictCheckerError) as error:
+            validate(text)
+        assert error.value.report.reached.path == ("items", 2)
+
+
+def test_budget_of_every_item_of_many(interval):
+    checker = Checker(SCHEMA, budget_ms=0)
+    results = list(checker.validate_many([payload(), payload()]))
+    expected = [(0, False), (1, False)]
+    assert [(index, ok) for index, ok, _ in results] == expected
+    assert all(report.expired for _, _, report in results)
+    assert list(checker.validate_many([payload()], only_valid=True)) == []
+    checker = Checker(SCHEMA, budget_ms=10000)
+    assert list(checker.validate_many([payload()])) == [(0, True, None)]
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from json_checker.core.checkers import OptionalKey
+from json_checker.core.compiler import compile_schema
+from json_checker.core.decoder import decode
+from json_checker.core.exceptions import DictCheckerError, ListCheckerError
+from json_checker.core.reports import Report
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "[1, 2",
+        "[1 2]",
+        "[1, ]",
+        '{"a" 1}',
+        '{"a": 1,}',
+        "{1: 1}",
+        "[1] 2",
+        "\ufeff[1]",
+    ],
+)
+def test_decode_raises_errors_of_json(text):
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError) as error:
+        decode(compile_schema([int]), text, Report(soft=False))
+    assert error.value.msg == expected.value.msg
+    assert error.value.pos == expected.value.pos
+
+
+@pytest.mark.parametrize(
+    "text", ["[1,2]", "[1, 2]", " [ 1 ,\n\t2 ] ", "[\r\n1,\r\n2\r\n]"]
+)
+def test_decode_separators(text):
+    assert decode(compile_schema([int]), text, Report(soft=False)) == [1, 2]
+
+
+def test_decode_checks_list_items_while_decoding():
+    plan = compile_schema([int])
+    with pytest.raises(ListCheckerError) as error:
+        decode(plan, '[1, "2", oops', Report(soft=False))
+    assert [record.path for record in error.value.report.records()] == [(1,)]
+
+
+def test_decode_checks_fields_in_order_of_schema():
+    plan = compile_schema({"a": int, OptionalKey("b"): int, "c": int})
+    with pytest.raises(DictCheckerError):
+        decode(plan, '{"b": 2, "a": "1", oops', Report(soft=False))
+    with pytest.raises(DictCheckerError) as error:
+        decode(plan, '{"c": "3", "b": 2, "a": 1, oops', Report(soft=False))
+    assert [record.path for record in error.value.report.records()] == [("c",)]
+
+    # "c" waits for optional "b" until the end of dict
+    with pytest.raises(json.JSONDecodeError):
+        decode(plan, '{"c": "3", "a": 1, oops', Report(soft=False))
+
+
+def test_decode_checks_last_value_of_duplicated_key():
+    plan = compile_schema({"a": int, "b": int})
+    assert decode(plan, '{"b": 1, "b": 2, "a": 1}', Report(soft=False)) == {
+        "a": 1,
+        "b": 2,
+    }
+    with pytest.raises(DictCheckerError):
+        decode(plan, '{"a": 1, "b": 1, "a": "1"}', Report(soft=False))
+
+
+def test_decode_soft_report_collects_errors():
+    report = Report(soft=True)
+    data = decode(compile_schema([int]), '[1, "2", "3"]', report)
+    assert data == [1, "2", "3"]
+    assert report.count == 2
@@ -0,0 +1,159 @@
+import pytest
+
+from json_checker.core.checkers import Or
+from json_checker.core.compiler import compile_schema
+from json_checker.core.errors import (
+    EXTRA_KEYS,
+    FUNCTION,
+    MESSAGE,
+    MISSING_KEY,
+    NOT_VALID,
+    TYPE,
+    ErrorGroup,
+    ErrorRecord,
+    Key,
+    iter_records,
+)
+from json_checker.core.exceptions import DictCheckerError
+from json_checker.core.reports import Report
+
+
+class NotRendered:
+    def __repr__(self):
+        raise AssertionError("value must not be rendered")
+
+
+def records(schema, current_data):
+    report = Report(soft=True)
+    assert compile_schema(schema).validate(current_data, report) is False
+    return list(report.records())
+
+
+@pytest.mark.parametrize(
+    "error, exp_message",
+    [
+        [ErrorRecord(TYPE, int, "1"), "current value '1' (str) is not int"],
+        [
+            ErrorRecord(FUNCTION, lambda x: x, 1),
+            "function error: <lambda> with data 1 (int)",
+        ],
+        [
+            ErrorRecord(FUNCTION, lambda x: x, 1, "boom"),
+            "function error: <lambda> with data boom",
+        ],
+        [
+            ErrorRecord(MISSING_KEY, "key", {}),
+            "Missing keys in current response: key",
+        ],
+        [
+            ErrorRecord(EXTRA_KEYS, {}, {"a": 1, 2: 2}, ["a", 2]),
+            "Missing keys in expected schema: a, 2",
+        ],
+        [
+            ErrorRecord(NOT_VALID, Or(int, None), "1"),
+            "Not valid data: "
+            "current value '1' (str) is not Or(int, None) (Or)",
+        ],
+        [ErrorRecord(MESSAGE, None, None, "some message"), "some message"],
+    ],
+)
+def test_error_message(error, exp_message):
+    assert error.message() == exp_message
+    assert str(error) == exp_message
+
+
+def test_error_pointer():
+    error = ErrorRecord(TYPE, int, "1")
+    assert error.pointer == ""
+    error.path = ("~c", "a/b", 0)
+    assert error.pointer == "/~0c/a~1b/0"
+
+
+@pytest.mark.parametrize(
+    "schema, current_data, exp_paths",
+    [
+        [int, "1", [()]],
+        [[int], [1, "2", "3"], [(1,), (2,)]],
+        [
+            {"key": {"key2": [int]}},
+            {"key": {"key2": ["1"]}},
+            [("key", "key2", 0)],
+        ],
+        [{"key": {"key2": int}}, {"key": {}}, [("key", "key2")]],
+        [{"key": int}, {"key": 1, "key2": 2}, [()]],
+        [[{1: int}], [{1: "1"}], [(0, 1)]],
+    ],
+)
+def test_records_paths(schema, current_data, exp_paths):
+    assert [e.path for e in records(schema, current_data)] == exp_paths
+
+
+def test_records_keep_values():
+    value = ["1"]
+    error = records({"key": int}, {"key": value})[0]
+    assert error.kind == TYPE
+    assert error.expected is int
+    assert error.value is value
+    assert error.pointer == "/key"
+
+
+def test_messages_are_rendered_on_demand():
+    report = Report(soft=True)
+    node = compile_schema({"key": [int]})
+    assert node.validate({"key": [NotRendered()]}, report) is False
+    assert len(report) == 1
+    with pytest.raises(AssertionError):
+        str(report)
+
+
+def test_hard_error_has_report():
+    with pytest.raises(DictCheckerError) as e:
+        compile_schema({"key": [int]}).validate(
+            {"key": [1, "2"]}, Report(soft=False)
+        )
+    assert [r.pointer for r in e.value.report.records()] == ["/key/1"]
+    assert str(e.value) == (
+        "From key=\"key\": \n\tcurrent value '2' (str) is not int"
+    )
+
+
+def test_group_message():
+    errors = [
+        ErrorRecord(TYPE, int, "1"),
+        ErrorGroup(
+            Key("key2"),
+            [
+                ErrorGroup(0, [ErrorRecord(TYPE, int, "2")]),
+                ErrorGroup(1, [ErrorRecord(TYPE, int, "3")]),
+            ],
+        ),
+        ErrorRecord(MISSING_KEY, "key3", {}),
+    ]
+    assert str(ErrorGroup(Key("key"), errors)) == (
+        'From key="key": \n\t'
+        "current value '1' (str) is not int\n"
+        'From key="key2": \n\t'
+        "current value '2' (str) is not int\n"
+        "current value '3' (str) is not int\n"
+        "Missing keys in current response: key3"
+    )
+    assert str(ErrorGroup(0, ["message"])) == "message"
+
+
+def test_iter_records():
+    errors = [
+        ErrorGroup(
+            Key("key"),
+            [
+                ErrorGroup(3, [ErrorRecord(TYPE, int, "1")]),
+                ErrorRecord(MISSING_KEY, "key2", {}),
+                "message",
+            ],
+        ),
+        ErrorRecord(EXTRA_KEYS, {}, {"a": 1}, ["a"]),
+    ]
+    assert [e.path for e in iter_records(errors)] == [
+        ("key", 3),
+        ("key", "key2"),
+        (),
+    ]
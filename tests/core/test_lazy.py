@@ -0,0 +1,129 @@
+import pytest
+
+from json_checker import Checker, Sample
+from json_checker.core.checkers import OptionalKey
+from json_checker.core.compiler import compile_schema
+from json_checker.core.exceptions import (
+    CheckerError,
+    DictCheckerError,
+    MissKeyCheckerError,
+)
+from json_checker.core.lazy import LazyDict, LazyList, wrap
+from json_checker.core.reports import Report
+
+SCHEMA = {"id": int, "items": [{"price": float}], OptionalKey("name"): str}
+
+
+def hard(data, schema=SCHEMA):
+    return wrap(compile_schema(schema), data, Report(soft=False))
+
+
+def test_values_are_checked_on_access():
+    proxy = hard({"id": "1", "items": [{"price": 1.5}, {"price": "2"}]})
+    assert proxy["items"][0]["price"] == 1.5
+    assert proxy["items"][-2]["price"] == 1.5
+    with pytest.raises(DictCheckerError) as error:
+        proxy["items"][1]["price"]
+    assert [r.pointer for r in error.value.report.records()] == [
+        "/items/1/price"
+    ]
+    with pytest.raises(DictCheckerError):
+        proxy["id"]
+
+
+def test_values_are_memoized():
+    proxy = hard({"id": 1, "items": [{"price": 1.5}]})
+    items = proxy["items"]
+    assert isinstance(items, LazyList)
+    assert proxy["items"] is items
+    assert isinstance(items[0], LazyDict)
+    assert items[0] is items[-1]
+    assert repr(items) == "<LazyList /items checked=1>"
+
+
+def test_keys_are_checked_on_creation():
+    with pytest.raises(MissKeyCheckerError):
+        hard({"items": []})
+    proxy = hard({"id": 1, "items": [{"price": 1.5, "extra": 1}]})
+    with pytest.raises(DictCheckerError) as error:
+        proxy["items"][0]
+    assert "Missing keys in expected schema: extra" in str(error.value)
+
+
+def test_read_only_mapping_and_sequence():
+    proxy = hard({"id": 1, "items": [{"price": 1.5}, {"price": 2.5}]})
+    assert list(proxy) == ["id", "items"]
+    assert len(proxy) == 2
+    assert "name" not in proxy
+    assert proxy.get("name") is None
+    assert [item["price"] for item in proxy["items"]] == [1.5, 2.5]
+    assert len(proxy["items"][1:]) == 1
+    with pytest.raises(TypeError):
+        proxy["id"] = 2
+    with pytest.raises(IndexError):
+        proxy["items"][2]
+
+
+def test_finalize_checks_values_never_accessed():
+    data = {"id": 1, "items": [{"price": 1.5}, {"price": "2"}]}
+    proxy = hard(data)
+    proxy["items"][0]
+    with pytest.raises(DictCheckerError):
+        proxy.finalize()
+    data["items"][1]["price"] = 2.5
+    assert hard(data).finalize() is data
+
+
+def test_soft_report_collects_errors_of_access_and_finalize():
+    report = Report(soft=True)
+    data = {"id": "1", "items": [{"price": "1"}, {"price": "2"}]}
+    proxy = wrap(compile_schema(SCHEMA), data, report)
+    assert proxy["id"] == "1"
+    assert proxy["id"] == "1"
+    assert report.count == 1
+    with pytest.raises(CheckerError) as error:
+        proxy.finalize()
+    assert sorted(r.pointer for r in error.value.report.records()) == [
+        "/id",
+        "/items/0/price",
+        "/items/1/price",
+    ]
+
+
+@pytest.mark.parametrize(
+    "schema, data",
+    [[int, 1], [[int], []], [{"a": 1}, {"a": 1}], [[int], {1, 2}]],
+)
+def test_wrap_checks_other_data_at_once(schema, data):
+    assert wrap(compile_schema(schema), data, Report(soft=False)) is None
+
+
+def test_checker_lazy():
+    checker = Checker(SCHEMA)
+    data = {"id": 1, "items": [{"price": 1.5}]}
+    proxy = checker.lazy(data)
+    assert proxy["items"][0]["price"] == 1.5
+    assert proxy.finalize() is data
+    assert Checker(int).lazy(5) == 5
+    with pytest.raises(CheckerError):
+        Checker(int).lazy("5")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"aggregate": True},
+        {"max_errors": 2},
+        {"sample": Sample(every=2)},
+    ],
+)
+def test_checker_lazy_with_report_settings(options):
+    checker = Checker(SCHEMA, soft=True, **options)
+    data = {"id": "1", "items": [{"price": str(i)} for i in range(10)]}
+    with pytest.raises(CheckerError) as eager:
+        checker.validate(data)
+    with pytest.raises(CheckerError) as lazy:
+        checker.lazy(data)
+    assert str(lazy.value) == str(eager.value)
+    if options.get("aggregate"):
+        assert "10 type errors" in str(lazy.value)
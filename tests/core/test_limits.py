@@ -0,0 +1,269 @@
+import json
+import pickle
+import time
+
+import pytest
+
+from json_checker import (
+    And,
+    Checker,
+    LimitCheckerError,
+    Limits,
+    Or,
+    Sample,
+)
+from json_checker.core import deadlines
+from json_checker.core.compiler import (
+    DictNode,
+    ListNode,
+    LiteralNode,
+    TypeNode,
+    compile_schema,
+)
+from json_checker.core.deadlines import TimedNode, timed_plan
+from json_checker.core.exceptions import CheckerError
+from json_checker.core.limits import (
+    LimitedContainer,
+    LimitedString,
+    limited_plan,
+)
+
+SCHEMA = {"id": int, "items": [{"name": str, "tags": [str]}]}
+
+
+def payload(size=10):
+    return {
+        "id": 1,
+        "items": [{"name": "item", "tags": ["a", "b"]} for _ in range(size)],
+    }
+
+
+def pointers(error):
+    return [record.pointer for record in error.report.records()]
+
+
+def test_limits_arguments():
+    with pytest.raises(ValueError):
+        Limits(max_depth=-1)
+    assert repr(Limits(max_nodes=10)) == (
+        "<Limits max_depth=None max_nodes=10 max_length=None max_string=None>"
+    )
+
+
+def test_data_within_limits():
+    limits = Limits(max_depth=4, max_nodes=52, max_length=10, max_string=4)
+    checker = Checker(SCHEMA, limits=limits)
+    data = payload()
+    assert checker.validate(data) is data
+    assert checker.is_valid(data)
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_long_list_is_rejected_before_items(soft):
+    checker = Checker(SCHEMA, soft=soft, limits=Limits(max_length=10))
+    data = payload(11)
+    data["items"][0]["name"] = 1
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(data)
+    report = error.value.report
+    assert report.exceeded == "max_length"
+    # items were not validated, so the error of the first item is not found
+    assert pointers(error.value) == ["/items"]
+    assert str(error.value).endswith(
+        "Limit max_length is exceeded: 11 items > 10"
+    )
+    assert not checker.is_valid(data)
+
+
+def test_count_of_values():
+    checker = Checker(SCHEMA, soft=True, limits=Limits(max_nodes=20))
+    # root has 2 keys, items have 10 items with 2 keys and 2 tags each
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(payload())
+    assert pointers(error.value) == ["/items/2"]
+    assert "22 values > 20" in str(error.value)
+
+
+def test_nesting_of_containers():
+    checker = Checker(SCHEMA, limits=Limits(max_depth=2))
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(payload())
+    assert pointers(error.value) == ["/items/0"]
+    assert Checker(SCHEMA, limits=Limits(max_depth=4)).is_valid(payload())
+
+
+def test_length_of_strings():
+    checker = Checker(
+        {"name": str, "data": bytes}, limits=Limits(max_string=3)
+    )
+    assert checker.is_valid({"name": "abc", "data": b"abc"})
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate({"name": "abc", "data": b"abcd"})
+    assert pointers(error.value) == ["/data"]
+    assert not checker.is_valid({"name": "abcd", "data": b""})
+
+
+def test_limits_inside_or():
+    schema = {"value": Or([int], str, None)}
+    checker = Checker(schema, soft=True, limits=Limits(max_length=2))
+    assert checker.is_valid({"value": [1, 2]})
+    with pytest.raises(LimitCheckerError):
+        checker.validate({"value": [1, 2, 3]})
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        Or({"a": [int]}, {"a": [str]}),
+        And({"a": [str]}, {"a": [str]}),
+    ],
+)
+def test_values_are_counted_once_by_operators(schema):
+    checker = Checker(schema, limits=Limits(max_nodes=1500))
+    data = {"a": ["x"] * 1000}
+    assert checker.validate(data) is data
+    assert checker.is_valid(data)
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate({"a": ["x"] * 1500})
+    assert "1501 values > 1500" in str(error.value)
+
+
+def test_errors_before_limit():
+    checker = Checker(SCHEMA, soft=True, limits=Limits(max_nodes=20))
+    data = payload()
+    data["id"] = "1"
+    data["items"][0]["tags"] = [1]
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(data)
+    assert pointers(error.value) == ["/id", "/items/0/tags/0", "/items/2"]
+
+
+def test_plain_errors_without_limit():
+    checker = Checker(SCHEMA, soft=True, limits=Limits(max_nodes=1000))
+    data = payload()
+    data["id"] = "1"
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data)
+    assert type(error.value) is CheckerError
+
+
+def test_validate_many_with_limits():
+    checker = Checker([int], limits=Limits(max_length=2))
+    results = list(checker.validate_many([[1], [1, 2, 3], ["1"]]))
+    assert [ok for _, ok, _ in results] == [True, False, False]
+    assert results[1][2].exceeded == "max_length"
+    assert results[2][2].exceeded is None
+    valid = checker.validate_many([[1], [1, 2, 3]], only_valid=True)
+    assert list(valid) == [(0, True, None)]
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_limit_inside_and_stops_validation(soft):
+    checker = Checker(
+        [And([int], lambda items: True)],
+        soft=soft,
+        limits=Limits(max_length=2),
+    )
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate([[1, 2, 3], [1]])
+    report = error.value.report
+    assert report.exceeded == "max_length"
+    assert [(r.kind, r.pointer) for r in report.records()] == [("limit", "/0")]
+
+    checker = Checker(
+        [Or([int], [str])], soft=soft, limits=Limits(max_length=2)
+    )
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate([["a"], ["a", "b", "c"]])
+    assert pointers(error.value) == ["/1"]
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_limits_of_decoded_and_lazy_data(soft):
+    checker = Checker([int], soft=soft, limits=Limits(max_length=3))
+    text = json.dumps([1, 2, 3, 4, 5, 6])
+    for validate in (
+        checker.validate_str,
+        lambda text: checker.validate_bytes(text.encode("utf-16")),
+        lambda text: checker.lazy(json.loads(text)),
+    ):
+        with pytest.raises(LimitCheckerError) as error:
+            validate(text)
+        assert error.value.report.exceeded == "max_length"
+    assert checker.validate_str("[1, 2]") == [1, 2]
+    assert checker.lazy([1, 2]) == [1, 2]
+
+
+def test_limits_with_sample_and_deadline(monkeypatch):
+    monkeypatch.setattr(deadlines, "CHECK_INTERVAL", 10)
+    checker = Checker(
+        SCHEMA,
+        sample={"items": Sample(every=5)},
+        limits=Limits(max_length=100),
+        budget_ms=0,
+    )
+    with pytest.raises(CheckerError) as error:
+        checker.validate(payload(50))
+    assert error.value.report.expired
+    with pytest.raises(LimitCheckerError):
+        checker.validate(payload(101))
+    with pytest.raises(ValueError):
+        checker.validate(payload(), only=["id"])
+    checker.budget_ms = None
+    with pytest.raises(ValueError):
+        checker.validate(payload(), only=["id"])
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_limits_of_selected_paths(soft):
+    checker = Checker(SCHEMA, soft=soft, limits=Limits(max_length=10))
+    data = payload(11)
+    assert checker.validate(data, only=["id"]) is data
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(data, only=["items[*].name"])
+    assert pointers(error.value) == ["/items"]
+
+    data = payload(3)
+    data["items"][1]["tags"] = ["a"] * 11
+    assert checker.validate(data, only=["items[*].name"]) is data
+    with pytest.raises(LimitCheckerError) as error:
+        checker.validate(data, only=["items[1].tags"])
+    assert pointers(error.value) == ["/items/1/tags"]
+
+
+def test_limited_plan():
+    plan = compile_schema({"a": [str], "b": [1, 2], "c": Or(int, None)})
+    limited = limited_plan(plan, Limits(max_nodes=10, max_string=5))
+    assert isinstance(limited, LimitedContainer)
+    assert type(limited.node) is DictNode
+    items = limited.node.fields[0].node
+    assert isinstance(items.node, ListNode)
+    assert isinstance(items.node.items[0], LimitedString)
+    # literal lists are compared without their items
+    assert type(limited.node.fields[1].node.node) is ListNode
+    alternatives = limited.node.fields[2].node.alternatives
+    # int rejects strings by type, None is literal
+    assert [type(node) for node in alternatives] == [TypeNode, LiteralNode]
+
+    assert limited_plan(plan, Limits()) is not plan
+    timed = timed_plan(limited)
+    assert isinstance(timed, LimitedContainer)
+    assert isinstance(timed.node, TimedNode)
+
+
+def test_checker_with_limits_is_pickled():
+    checker = Checker(SCHEMA, limits=Limits(max_length=5))
+    checker.validate(payload(5))
+    copy = pickle.loads(pickle.dumps(checker))
+    assert copy._limited_plan is None
+    assert not copy.is_valid(payload(6))
+
+
+def test_deep_data_under_type_is_not_visited():
+    checker = Checker({"data": dict}, limits=Limits(max_depth=2))
+    data = {}
+    for _ in range(10000):
+        data = {"a": data}
+    start = time.monotonic()
+    assert checker.is_valid({"data": data})
+    assert time.monotonic() - start < 1
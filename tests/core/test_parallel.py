@@ -0,0 +1,191 @@
+import time
+
+import pytest
+
+from json_checker import Checker
+from json_checker.core import parallel
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.compiler import compile_schema
+from json_checker.core.exceptions import CheckerError
+from json_checker.core.parallel import ChunkSizes, dumps, iter_chunks, loads
+from json_checker.core.registry import register
+
+positive = register(lambda x: x > 0, name="tests.parallel.positive")
+
+SCHEMA = {"id": And(int, positive), "tags": [Or(str, None)]}
+
+DATA = [{"id": i % 5 - 1, "tags": ["a", None, i % 3]} for i in range(300)]
+
+
+def results(checker, **kwargs):
+    return [
+        (index, ok, str(report))
+        for index, ok, report in checker.validate_many(DATA, **kwargs)
+    ]
+
+
+def test_registered_functions_are_pickled_by_name():
+    data = loads(dumps({"id": And(int, positive)}))
+    assert data["id"].expected_data[1] is positive
+
+
+def test_not_registered_function_is_not_pickled():
+    with pytest.raises(ValueError):
+        dumps(lambda x: x)
+
+
+def test_iter_chunks():
+    chunks = iter_chunks(range(7), iter([3, 3, 3, 3]))
+    assert list(chunks) == [(0, [0, 1, 2]), (3, [3, 4, 5]), (6, [6])]
+
+
+def test_chunk_sizes():
+    sizes = ChunkSizes()
+    assert next(sizes) == parallel.MIN_CHUNK_SIZE
+    sizes.update(100, parallel.TARGET_CHUNK_TIME / 10)
+    assert next(sizes) == 1000
+    sizes.update(100, 100)
+    assert next(sizes) == parallel.MIN_CHUNK_SIZE
+    sizes.update(100, 0)
+    assert next(sizes) == parallel.MAX_CHUNK_SIZE
+
+
+def test_fixed_chunk_sizes():
+    sizes = ChunkSizes(10)
+    sizes.update(10, 100)
+    assert next(sizes) == 10
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_parallel_same_as_sequential(soft):
+    checker = Checker(SCHEMA, soft=soft)
+    assert results(checker, workers=2, chunk_size=7) == results(checker)
+
+
+def test_parallel_unordered():
+    checker = Checker(SCHEMA, soft=True)
+    unordered = results(checker, workers=2, ordered=False)
+    assert sorted(unordered) == results(checker)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"only_failures": True}, {"only_valid": True}]
+)
+def test_parallel_filters(kwargs):
+    checker = Checker(SCHEMA, aggregate=True, soft=True)
+    assert results(checker, workers=2, **kwargs) == results(checker, **kwargs)
+
+
+def validate(checker, data):
+    try:
+        checker.validate(data)
+    except CheckerError as e:
+        return type(e), str(e), e.report.count
+    return None
+
+
+@pytest.fixture(params=["processes", "threads"])
+def document_workers(request, monkeypatch):
+    # parts are sent to workers even when this process is faster
+    monkeypatch.setattr(parallel, "MIN_SPEEDUP", 0)
+    if request.param == "threads":
+        monkeypatch.setattr(parallel, "free_threading", lambda: True)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "schema, data, exp_size",
+    [
+        [[int], list(range(10)), 10],
+        [[int], set(range(10)), 0],
+        [[1, 2], [1, 2], 0],
+        [{"a": [int], "b": int}, {"a": [1, 2], "b": 1}, 3],
+        [{"a": [int]}, {"a": [1, 2]}, 0],
+        [int, 1, 0],
+    ],
+)
+def test_document_size(schema, data, exp_size):
+    assert parallel.document_size(compile_schema(schema), data) == exp_size
+
+
+@pytest.mark.parametrize("soft", [True, False])
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"aggregate": True}, {"max_errors": 10}]
+)
+@pytest.mark.parametrize(
+    "schema, data",
+    [
+        [[SCHEMA], DATA],
+        [
+            {"a": [SCHEMA], "b": [SCHEMA], OptionalKey("c"): int, "d": int},
+            {"a": DATA, "b": DATA[:50], "e": 1},
+        ],
+    ],
+)
+def test_document_same_as_sequential(
+    document_workers, soft, kwargs, schema, data
+):
+    checker = Checker(schema, soft=soft, **kwargs)
+    with Checker(
+        schema, soft=soft, workers=2, parallel_threshold=10, **kwargs
+    ) as parallel_checker:
+        assert validate(parallel_checker, data) == validate(checker, data)
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_document_workers_are_reused(document_workers, soft):
+    valid = [{"id": 1, "tags": ["a"]}] * 100
+    with Checker(
+        [SCHEMA], soft=soft, workers=2, parallel_threshold=10
+    ) as checker:
+        invalid = validate(checker, DATA)
+        assert invalid is not None
+        workers = checker._document_workers
+        assert workers.sent == [] and not workers.cancelled.is_set()
+        assert validate(checker, valid) is None
+        assert validate(checker, DATA) == invalid
+        assert checker._document_workers is workers
+
+        checker.expected_data = [dict]
+        assert checker._document_workers is None
+        assert validate(checker, DATA) is None
+    assert checker._document_workers is None
+
+
+@pytest.mark.parametrize(
+    "schema, data",
+    [
+        [[SCHEMA], DATA],
+        [{"a": [SCHEMA], "b": [SCHEMA]}, {"a": DATA, "b": DATA}],
+    ],
+)
+def test_cheap_document_is_not_sent(monkeypatch, schema, data):
+    monkeypatch.setattr(parallel, "MIN_SPEEDUP", float("inf"))
+    sent = []
+    monkeypatch.setattr(
+        parallel.DocumentWorkers,
+        "send",
+        lambda self, *args: sent.append(args),
+    )
+    checker = Checker(schema, soft=True)
+    with Checker(
+        schema, soft=True, workers=2, parallel_threshold=10
+    ) as parallel_checker:
+        assert validate(parallel_checker, data) == validate(checker, data)
+    assert sent == []
+
+
+def test_document_hard_cancels_workers(monkeypatch):
+    monkeypatch.setattr(parallel, "free_threading", lambda: True)
+    calls = []
+
+    def is_positive(x):
+        calls.append(x)
+        time.sleep(0.001)
+        return x > 0
+
+    with Checker([is_positive], workers=2, parallel_threshold=10) as checker:
+        with pytest.raises(CheckerError):
+            checker.validate([-1] + [1] * 999)
+    time.sleep(0.01)
+    assert len(calls) < 500
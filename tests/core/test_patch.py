@@ -0,0 +1,196 @@
+import pytest
+
+from json_checker import Checker
+from json_checker.core.checkers import OptionalKey, Or
+from json_checker.core.exceptions import CheckerError, DictCheckerError
+from json_checker.core.patch import Changes, apply_patch, parse_pointer
+
+SCHEMA = {"id": int, "items": [{"id": int}], OptionalKey("note"): str}
+
+
+def document(size=5):
+    return {"id": 1, "items": [{"id": i} for i in range(size)]}
+
+
+def pointers(error):
+    return [r.pointer for r in error.report.records()]
+
+
+def patched(data, operations):
+    return apply_patch(data, operations, Changes([]))
+
+
+@pytest.mark.parametrize(
+    "pointer, tokens",
+    [
+        ["", []],
+        ["/", [""]],
+        ["/a/0", ["a", "0"]],
+        ["/a~1b/c~0d", ["a/b", "c~d"]],
+    ],
+)
+def test_parse_pointer(pointer, tokens):
+    assert parse_pointer(pointer) == tokens
+
+
+@pytest.mark.parametrize("pointer", ["a", None, 1])
+def test_parse_pointer_not_valid(pointer):
+    with pytest.raises(ValueError):
+        parse_pointer(pointer)
+
+
+def test_apply_patch():
+    data = {"a": {"b": 1}, "c": [1, 2]}
+    assert patched(
+        data,
+        [
+            {"op": "add", "path": "/c/-", "value": 3},
+            {"op": "add", "path": "/c/0", "value": 0},
+            {"op": "remove", "path": "/c/1"},
+            {"op": "replace", "path": "/a/b", "value": 2},
+            {"op": "move", "from": "/a/b", "path": "/d"},
+            {"op": "copy", "from": "/c", "path": "/a/c"},
+            {"op": "test", "path": "/a/c/2", "value": 3},
+        ],
+    ) == {"a": {"c": [0, 2, 3]}, "c": [0, 2, 3], "d": 2}
+    assert data["a"]["c"] is not data["c"]
+    assert patched(data, [{"op": "replace", "path": "", "value": 1}]) == 1
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "remove", "path": "/c/-"},
+        {"op": "remove", "path": "/c/01"},
+        {"op": "remove", "path": "/x"},
+        {"op": "remove", "path": ""},
+        {"op": "replace", "path": "/c/2", "value": 1},
+        {"op": "add", "path": "/a/b/c", "value": 1},
+        {"op": "add", "path": "/c/3", "value": 1},
+        {"op": "move", "from": "/a", "path": "/a/b"},
+        {"op": "test", "path": "/a/b", "value": 2},
+        {"op": "add", "path": "/a/b"},
+        {"op": "copy", "path": "/d"},
+        {"op": "merge", "path": "/a"},
+    ],
+)
+def test_failed_patch_restores_document(operation):
+    data = {"a": {"b": 1}, "e": 1, "c": [1, 2]}
+    operations = [
+        {"op": "remove", "path": "/a"},
+        {"op": "add", "path": "/a", "value": {"b": 1}},
+        {"op": "remove", "path": "/c/0"},
+        {"op": "add", "path": "/c/0", "value": 1},
+        {"op": "replace", "path": "/e", "value": 2},
+        operation,
+    ]
+    with pytest.raises(ValueError):
+        patched(data, operations)
+    assert data == {"a": {"b": 1}, "e": 1, "c": [1, 2]}
+    assert list(data) == ["a", "e", "c"]
+
+
+def test_revalidate_valid_document():
+    checker = Checker(SCHEMA, soft=True)
+    data = document()
+    result = checker.validate(data)
+    operations = [{"op": "add", "path": "/items/-", "value": {"id": 5}}]
+    assert checker.revalidate(data, operations, result) is data
+    assert data == document(6)
+
+    with pytest.raises(CheckerError) as error:
+        checker.revalidate(
+            data, [{"op": "add", "path": "/items/1/id", "value": "1"}], data
+        )
+    assert pointers(error.value) == ["/items/1/id"]
+
+
+def test_revalidate_keeps_and_shifts_errors():
+    checker = Checker(SCHEMA, soft=True)
+    data = document()
+    data["id"] = "1"
+    data["items"][3]["id"] = "3"
+    with pytest.raises(CheckerError) as previous:
+        checker.validate(data)
+
+    operations = [
+        {"op": "add", "path": "/items/0", "value": {"id": "new"}},
+        {"op": "add", "path": "/extra", "value": 1},
+        {"op": "remove", "path": "/items/2"},
+    ]
+    with pytest.raises(CheckerError) as error:
+        checker.revalidate(data, operations, previous.value)
+    assert pointers(error.value) == ["/id", "/items/0/id", "/items/3/id", ""]
+    with pytest.raises(CheckerError) as expected:
+        checker.validate(data)
+    assert str(error.value) == str(expected.value)
+
+    operations = [
+        {"op": "replace", "path": "/id", "value": 1},
+        {"op": "remove", "path": "/items/0"},
+        {"op": "remove", "path": "/extra"},
+        {"op": "remove", "path": "/items/2"},
+    ]
+    assert checker.revalidate(data, operations, error.value) is data
+
+
+def test_revalidate_checks_keys_of_changed_dict_only():
+    checker = Checker(SCHEMA, soft=True)
+    data = document()
+    with pytest.raises(CheckerError) as previous:
+        checker.revalidate(data, [{"op": "remove", "path": "/id"}], data)
+    assert pointers(previous.value) == ["/id"]
+    operations = [{"op": "add", "path": "/items/0/x", "value": 1}]
+    with pytest.raises(CheckerError) as error:
+        checker.revalidate(data, operations, previous.value)
+    assert pointers(error.value) == ["/id", "/items/0"]
+
+
+def test_revalidate_visits_changed_values_only():
+    calls = []
+
+    def positive(value):
+        calls.append(value)
+        return value >= 0
+
+    checker = Checker({"items": [{"id": positive}]}, soft=True)
+    data = {"items": [{"id": i} for i in range(100)]}
+    result = checker.validate(data)
+    del calls[:]
+    operations = [
+        {"op": "replace", "path": "/items/10/id", "value": -1},
+        {"op": "add", "path": "/items/0", "value": {"id": 1}},
+    ]
+    with pytest.raises(CheckerError) as error:
+        checker.revalidate(data, operations, result)
+    assert pointers(error.value) == ["/items/11/id"]
+    assert sorted(calls) == [-1, 1]
+
+
+def test_revalidate_operators_wholly():
+    checker = Checker({"value": Or({"a": int}, {"b": int})}, soft=True)
+    data = {"value": {"a": 1}}
+    result = checker.validate(data)
+    operations = [{"op": "move", "from": "/value/a", "path": "/value/b"}]
+    assert checker.revalidate(data, operations, result) == {"value": {"b": 1}}
+    operations = [{"op": "add", "path": "/value/a", "value": 1}]
+    with pytest.raises(CheckerError) as error:
+        checker.revalidate(data, operations, data)
+    assert pointers(error.value) == ["/value"]
+
+
+def test_revalidate_hard_checker():
+    checker = Checker(SCHEMA)
+    data = document()
+    result = checker.validate(data)
+    operations = [{"op": "replace", "path": "/items/1/id", "value": "1"}]
+    with pytest.raises(DictCheckerError) as error:
+        checker.revalidate(data, operations, result)
+    assert pointers(error.value) == ["/items/1/id"]
+
+    # the first error only is known, document is validated wholly
+    data["id"] = "1"
+    operations = [{"op": "replace", "path": "/items/1/id", "value": 1}]
+    with pytest.raises(DictCheckerError) as full:
+        checker.revalidate(data, operations, error.value)
+    assert pointers(full.value) == ["/id"]
@@ -0,0 +1,166 @@
+import pytest
+
+from json_checker.core.checkers import And, OptionalKey, Or
+from json_checker.core.compiler import compile_schema
+from json_checker.core.errors import ITEMS
+from json_checker.core.exceptions import DictCheckerError
+from json_checker.core.paths import parse_path, select, validate_selected
+from json_checker.core.reports import Report
+
+SCHEMA = {
+    "user": {"id": int, "name": str},
+    "items": [{"price": float, "title": str}],
+    OptionalKey("note"): str,
+}
+
+
+def pointers(data, paths, schema=SCHEMA):
+    report = Report(soft=True)
+    node = compile_schema(schema)
+    validate_selected(node, data, select(paths, node), report)
+    return [r.pointer for r in report.records()]
+
+
+@pytest.mark.parametrize(
+    "path, steps",
+    [
+        ["", ()],
+        ["user", ("user",)],
+        ["user.id", ("user", "id")],
+        ["items[*].price", ("items", ITEMS, "price")],
+        ["[0][1].id", (0, 1, "id")],
+        ["items[2]", ("items", 2)],
+    ],
+)
+def test_parse_path(path, steps):
+    assert parse_path(path) == steps
+
+
+@pytest.mark.parametrize(
+    "path", [".id", "user..id", "items[", "a[x]", "a.[0]"]
+)
+def test_parse_path_not_valid(path):
+    with pytest.raises(ValueError):
+        parse_path(path)
+
+
+def test_select():
+    assert select(["user.id", "items[*].price"]) == {
+        "user": {"id": None},
+        "items": {ITEMS: {"price": None}},
+    }
+    assert select(["user", "user.id"]) == {"user": None}
+    assert select(["user.id", "user"]) == {"user": None}
+    assert select(["user", ""]) is None
+    with pytest.raises(TypeError):
+        select("user.id")
+
+
+def test_other_keys_are_skipped():
+    data = {
+        "user": {"id": "1", "name": 1, "extra": 1},
+        "items": [{"price": "1", "title": 1}, {"price": 2.0}],
+        "extra": 1,
+    }
+    assert pointers(data, ["user.id"]) == ["/user/id"]
+    assert pointers(data, ["items[*].price"]) == ["/items/0/price"]
+    assert pointers(data, ["items[1].title"]) == ["/items/1/title"]
+    assert pointers(data, ["items[0]", "items[*].title"]) == [
+        "/items/0/price",
+        "/items/0/title",
+        "/items/1/title",
+    ]
+    assert sorted(pointers(data, ["user"])) == [
+        "/user",
+        "/user/id",
+        "/user/name",
+    ]
+
+
+def test_missing_keys_of_path():
+    assert pointers({"items": []}, ["user.id"]) == ["/user"]
+    assert pointers({"user": {}}, ["user.id"]) == ["/user/id"]
+    data = {"user": {"id": 1}, "items": [{"price": 1.0, "title": "a"}]}
+    assert pointers(data, ["note"]) == []
+    assert pointers(data, ["items[5]", "items[0].price", "items[2]"]) == [
+        "/items/2",
+        "/items/5",
+    ]
+    assert pointers(data, ["items[*]", "items[1].title"]) == ["/items/1"]
+
+
+def test_hard_report_raises_missing_index():
+    with pytest.raises(DictCheckerError) as error:
+        validate_selected(
+            compile_schema(SCHEMA),
+            {"items": [{"price": 1.0, "title": "a"}]},
+            select(["items[3].price"]),
+            Report(soft=False),
+        )
+    assert [r.pointer for r in error.value.report.records()] == ["/items/3"]
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["missing", "user.login", "items.price", "items[*].id", "[0]"],
+)
+def test_path_out_of_schema(path):
+    with pytest.raises(ValueError, match="is not in schema"):
+        select(["user.id", path], compile_schema(SCHEMA))
+
+
+@pytest.mark.parametrize(
+    "schema, path",
+    [
+        [{"value": Or({"id": int}, [int])}, "value.id"],
+        [{"value": Or({"id": int}, [int])}, "value[3]"],
+        [{"value": And({"id": int}, dict)}, "value.id"],
+        [{"value": int}, "value.id[0]"],
+        [[{"id": int}, {"name": str}], "[1].name"],
+    ],
+)
+def test_path_in_schema(schema, path):
+    assert select([path], compile_schema(schema)) is not None
+
+
+def test_not_expected_types_of_path():
+    assert pointers({"user": []}, ["user.id"]) == ["/user"]
+    assert pointers({"items": {}}, ["items[*].price"]) == ["/items"]
+    assert pointers({"items": []}, ["items[*].price"]) == ["/items"]
+    assert pointers({"user": {"id": 1}}, ["user.id.value"]) == []
+
+
+def test_or_and_on_path():
+    schema = {
+        "value": Or({"id": int, "name": str}, [int]),
+        "checked": And({"id": int}, dict),
+    }
+    data = {"value": {"id": 1, "name": 2}, "checked": {"id": "1", "a": 1}}
+    assert pointers(data, ["value.id"], schema) == []
+    assert pointers(data, ["value.name"], schema) == ["/value/name"]
+    assert pointers(data, ["checked.a"], schema) == []
+    assert pointers(data, ["checked.id"], schema) == ["/checked"]
+
+
+def test_hard_report_raises_first_error():
+    data = {"user": {"id": "1", "name": 1}}
+    with pytest.raises(DictCheckerError) as error:
+        validate_selected(
+            compile_schema(SCHEMA),
+            data,
+            select(["user.id", "user.name"]),
+            Report(soft=False),
+        )
+    assert [r.pointer for r in error.value.report.records()] == ["/user/id"]
+
+
+def test_hard_report_picks_closest_alternative():
+    schema = {"value": Or({"a": int, "b": int}, {"b": str, "a": bool})}
+    with pytest.raises(DictCheckerError) as error:
+        validate_selected(
+            compile_schema(schema),
+            {"value": {"a": "1", "b": 2, "c": 3}},
+            select(["value.a", "value.b"]),
+            Report(soft=False),
+        )
+    assert [r.pointer for r in error.value.report.records()] == ["/value/a"]
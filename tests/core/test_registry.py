@@ -0,0 +1,61 @@
+import pytest
+
+from json_checker.core.registry import Registry, import_path
+
+
+def is_positive(x):
+    return x > 0
+
+
+def test_register_with_name():
+    r = Registry()
+    func = r.register(lambda x: x, name="identity")
+    assert "identity" == r.name_of(func)
+    assert r.resolve("identity") is func
+    assert func in r
+
+
+def test_register_as_decorator():
+    r = Registry()
+
+    @r.register(name="negative")
+    def is_negative(x):
+        return x < 0
+
+    assert r.name_of(is_negative) == "negative"
+
+
+def test_register_lambda_without_name():
+    with pytest.raises(ValueError):
+        Registry().register(lambda x: x)
+
+
+def test_name_of_not_registered_lambda():
+    with pytest.raises(ValueError):
+        Registry().name_of(lambda x: x)
+
+
+@pytest.mark.parametrize(
+    "obj, name",
+    [
+        [is_positive, "tests.core.test_registry:is_positive"],
+        [int, "builtins:int"],
+        [Registry, "json_checker.core.registry:Registry"],
+    ],
+)
+def test_name_of_by_import_path(obj, name):
+    r = Registry()
+    assert r.name_of(obj) == name
+    assert r.resolve(name) is obj
+
+
+def test_import_path_of_local_function():
+    def local(x):
+        return x
+
+    assert import_path(local) is None
+
+
+def test_resolve_unknown_name():
+    with pytest.raises(LookupError):
+        Registry().resolve("unknown")
@@ -1,20 +1,33 @@
 import pytest
 
-from json_checker.core.reports import Report
+from json_checker.core.compiler import compile_schema
+from json_checker.core.reports import AggregatedReport, Report
 
 
 def test_create_instance_with_default_params():
     r = Report()
     assert r.soft is True
+    assert r.fail_fast is False
+    assert r.max_errors is None
     assert r.errors == []
+    assert r.count == 0
+    assert r.truncated is False
+    assert r.skipped == 0
 
 
 def test_create_instance_with_custom_params():
     r = Report(soft=False)
     assert r.soft is False
+    assert r.fail_fast is True
     assert r.errors == []
 
 
+def test_create_instance_without_fail_fast():
+    r = Report(soft=False, fail_fast=False)
+    assert r.soft is False
+    assert r.fail_fast is False
+
+
 def test_report_instance_string():
     r = Report()
     assert str(r) == ""
@@ -107,3 +120,78 @@ def test_not_contain_report():
     r = Report()
     r.errors.extend(["some error message #1", "some error message #2"])
     assert "error" not in r
+
+
+def test_add_error_to_report_with_max_errors():
+    r = Report(max_errors=2)
+    r.add("error #1")
+    assert r.fail_fast is False
+    r.add("error #2")
+    assert r.fail_fast is True
+    assert r.count == 2
+
+
+def test_skip_items():
+    r = Report(max_errors=1)
+    r.skip(0)
+    assert r.truncated is False
+    r.skip(5)
+    r.skip(2)
+    assert r.truncated is True
+    assert r.skipped == 7
+
+
+def test_restore_report_counters():
+    r = Report(max_errors=1)
+    snapshot = r.snapshot()
+    r.add("error #1")
+    r.skip(3)
+    r.nodes = 10
+    r.restore(snapshot)
+    assert (r.count, r.fail_fast, r.truncated, r.skipped, r.nodes) == (
+        0,
+        False,
+        False,
+        0,
+        0,
+    )
+
+
+def test_aggregated_report():
+    node = compile_schema({"items": [{"price": float, "id": int}]})
+    r = AggregatedReport(max_samples=2)
+    data = [{"price": "1", "id": 1} for _ in range(1000)]
+    assert node.validate({"items": data}, r) is False
+    assert len(r) == 1
+    assert r.count == 1000
+    aggregate = r.aggregates()[0]
+    assert aggregate.kind == "type"
+    assert aggregate.path_template == "items[*].price"
+    assert aggregate.count == 1000
+    assert aggregate.sample_paths() == [
+        (("items", 0, "price"), "1"),
+        (("items", 1, "price"), "1"),
+    ]
+    assert str(r) == (
+        "items[*].price: 1000 type errors like "
+        "current value '1' (str) is not float at /items/0/price, "
+        "/items/1/price"
+    )
+
+
+def test_aggregated_report_by_kinds():
+    node = compile_schema([{"price": float}])
+    r = AggregatedReport()
+    assert node.validate([{}, {"price": 1}, {}, "1"], r) is False
+    assert [(a.kind, a.path_template, a.count) for a in r.aggregates()] == [
+        ("missing_key", "[*].price", 2),
+        ("type", "[*].price", 1),
+        ("type", "[*]", 1),
+    ]
+
+
+def test_aggregated_report_root_error():
+    r = AggregatedReport()
+    assert compile_schema(int).validate("1", r) is False
+    aggregate = r.aggregates()[0]
+    assert (aggregate.path_template, aggregate.count) == ("", 1)
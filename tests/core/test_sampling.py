@@ -0,0 +1,173 @@
+import pickle
+
+import pytest
+
+from json_checker import Checker, Sample
+from json_checker.core.checkers import Or
+from json_checker.core.compiler import ListNode, compile_schema
+from json_checker.core.exceptions import CheckerError
+from json_checker.core.sampling import SampledListNode, sampled_plan
+
+SCHEMA = {"id": int, "items": [{"name": str, "tags": [str]}]}
+
+
+def payload(size=100):
+    return {
+        "id": 1,
+        "items": [{"name": "item %s" % i, "tags": ["a"]} for i in range(size)],
+    }
+
+
+def failed_indexes(error):
+    return sorted(record.path[1] for record in error.report.records())
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"every": 1, "fraction": 0.5},
+        {"fraction": 0.5, "first": 1},
+        {"every": 0},
+        {"fraction": 0},
+        {"fraction": 1.5},
+        {"first": -1},
+    ],
+)
+def test_sample_arguments(kwargs):
+    with pytest.raises(ValueError):
+        Sample(**kwargs)
+
+
+def test_every_nth_item():
+    sample = Sample(every=3)
+    assert list(sample.indexes(10)) == [0, 3, 6, 9]
+    assert list(sample.indexes(0)) == []
+
+
+def test_random_fraction_is_deterministic():
+    first = Sample(fraction=0.1, seed=7)
+    second = Sample(fraction=0.1, seed=7)
+    indexes = list(first.indexes(10000))
+    assert indexes == list(second.indexes(10000))
+    assert indexes == sorted(set(indexes))
+    assert 800 < len(indexes) < 1200
+    assert list(Sample(fraction=1).indexes(5)) == [0, 1, 2, 3, 4]
+
+
+def test_first_and_random_items():
+    sample = Sample(first=3, random=2, seed=1)
+    indexes = list(sample.indexes(100))
+    assert indexes[:3] == [0, 1, 2]
+    assert len(indexes) == 5 and indexes == sorted(indexes)
+    assert all(index >= 3 for index in indexes[3:])
+    # short lists are validated wholly
+    assert list(sample.indexes(4)) == [0, 1, 2, 3]
+    assert list(Sample(first=2).indexes(10)) == [0, 1]
+
+
+def test_report_tells_checked_fraction():
+    checker = Checker(SCHEMA, soft=True, sample=Sample(every=10))
+    data = payload()
+    for item in data["items"]:
+        item["name"] = 1
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data)
+    report = error.value.report
+    assert failed_indexes(error.value) == list(range(0, 100, 10))
+    # every tags list of checked items is sampled too
+    assert (report.checked, report.sampled) == (20, 110)
+    assert str(report).endswith(
+        "Sampled validation checked 20 of 110 items (18.2%)"
+    )
+    assert checker.sample.total == 110 and checker.sample.checked == 20
+
+
+def test_samples_by_paths():
+    sample = Sample(first=1, random=0)
+    checker = Checker(SCHEMA, soft=True, sample={"items": sample})
+    data = payload()
+    data["items"][0]["tags"] = ["a", 1, 2]
+    data["items"][1]["name"] = 1
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data)
+    # tags of checked items are validated wholly
+    assert len(list(error.value.report.records())) == 2
+    assert failed_indexes(error.value) == [0, 0]
+    assert error.value.report.coverage == 0.01
+
+    checker = Checker(
+        SCHEMA, sample={"items[*].tags": Sample(every=2), "items": sample}
+    )
+    assert checker.is_valid(payload())
+
+
+def test_dict_keys_are_checked_wholly():
+    checker = Checker(SCHEMA, sample=Sample(every=1000))
+    data = payload()
+    data["extra"] = 1
+    with pytest.raises(CheckerError) as error:
+        checker.validate(data)
+    assert "checked 2 of 101 items" in str(error.value)
+    del data["extra"], data["id"]
+    assert not checker.is_valid(data)
+    # keys of the first item are checked, other items are skipped
+    data = payload()
+    data["id"] = 1
+    data["items"][0]["extra"] = 1
+    assert not checker.is_valid(data)
+    data["items"][0].pop("extra")
+    data["items"][1]["extra"] = 1
+    assert checker.is_valid(data)
+
+
+def test_hard_checker_stops_on_first_sampled_error():
+    checker = Checker([int], sample=Sample(every=2))
+    checker.validate([1, "skipped", 3])
+    with pytest.raises(CheckerError) as error:
+        checker.validate([1, 2, "a", 4, "b"])
+    assert error.value.report.checked == 2
+
+
+def test_type_of_list_is_checked():
+    checker = Checker({"items": [int]}, sample=Sample(every=10))
+    with pytest.raises(CheckerError):
+        checker.validate({"items": "1"})
+    assert checker.is_valid({"items": ({1, 2})})
+
+
+def test_sampled_plan_keeps_original():
+    plan = compile_schema({"a": Or([int], None), "b": [1, 2], "c": [str]})
+    sampled = sampled_plan(plan, {("a",): Sample(every=2)})
+    assert isinstance(plan.fields[0].node.alternatives[0], ListNode)
+    node = sampled.fields[0].node.alternatives[0]
+    assert isinstance(node, SampledListNode)
+    # literal lists are compared wholly, other paths are not sampled
+    assert type(sampled.fields[1].node) is ListNode
+    assert type(sampled.fields[2].node) is ListNode
+    with pytest.raises(ValueError):
+        sampled_plan(plan, {("b",): Sample(every=2)})
+
+
+@pytest.mark.parametrize("path", ["missing", "items[0]", "id"])
+def test_unknown_sample_paths(path):
+    with pytest.raises(ValueError):
+        Checker(SCHEMA, sample={path: Sample(every=2)}).validate(payload())
+
+
+def test_validate_many_samples_items():
+    checker = Checker([int], soft=True, sample=Sample(every=2))
+    results = list(checker.validate_many([[1, "a"], ["a", 1], [1, 2, "a"]]))
+    assert [ok for _, ok, _ in results] == [True, False, False]
+    assert results[1][2].checked == 1
+    assert list(checker.validate_many([[1, "a"]], only_valid=True)) == [
+        (0, True, None)
+    ]
+
+
+def test_checker_with_sample_is_pickled():
+    checker = Checker(SCHEMA, sample={"items": Sample(every=10, seed=1)})
+    checker.validate(payload())
+    copy = pickle.loads(pickle.dumps(checker))
+    assert copy._sampled_plan is None
+    assert copy.is_valid(payload())
@@ -1,11 +1,23 @@
+import json
+
 import pytest
 
-from json_checker import Checker, And, Or, OptionalKey
+from json_checker import (
+    And,
+    Checker,
+    Limits,
+    OptionalKey,
+    Or,
+    Sample,
+    ValidationCache,
+)
+from json_checker.core import parallel
 from json_checker.core.exceptions import (
     CheckerError,
     TypeCheckerError,
     ListCheckerError,
     DictCheckerError,
+    LimitCheckerError,
     MissKeyCheckerError,
 )
 
@@ -302,3 +314,318 @@ def test_miss_keys(expected, current, exp_exception):
 def test_miss_keys_soft(expected, current):
     with pytest.raises(CheckerError):
         Checker(expected, soft=True).validate(current)
+
+
+def test_checker_compile_once():
+    c = Checker({"key": int})
+    plan = c.compile()
+    c.validate({"key": 1})
+    assert c.compile() is not plan
+    assert c._plan is not plan
+
+
+def test_checker_recompile_after_change_schema():
+    c = Checker({"key": int})
+    c.validate({"key": 1})
+    c.expected_data = {"key": str}
+    assert c.validate({"key": "1"}) == {"key": "1"}
+    assert not c.is_valid({"key": 1, "extra": 1})
+    c.ignore_extra_keys = True
+    assert c.is_valid({"key": "1", "extra": 1})
+
+
+def test_checker_plans_after_change_settings():
+    c = Checker({"key": [int]}, cache=ValidationCache())
+    data = {"key": [1, 2, 3]}
+    c.validate(data)
+    c.cache = None
+    assert c._cached_plan is None
+    c.sample = Sample(every=2)
+    assert c.is_valid({"key": [1, "2", 3]})
+    c.sample = None
+    c.limits = Limits(max_length=2)
+    with pytest.raises(LimitCheckerError):
+        c.validate(data)
+    c.limits = None
+    assert c.validate(data) is data
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"sample": Sample(every=2)},
+        {"budget_ms": 100},
+        {"limits": Limits(max_depth=2)},
+    ],
+)
+def test_checker_cache_with_other_options(options):
+    with pytest.raises(ValueError):
+        Checker([int], cache=ValidationCache(), **options)
+    c = Checker([int], **options)
+    with pytest.raises(ValueError):
+        c.cache = ValidationCache()
+    c = Checker([int], cache=ValidationCache())
+    name, value = next(iter(options.items()))
+    with pytest.raises(ValueError):
+        setattr(c, name, value)
+    assert getattr(c, name) is None
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_checker_compile_generate(soft, tmp_path):
+    c = Checker({"key": [int]}, soft=soft)
+    c.compile(cache_dir=str(tmp_path))
+    assert c.validate({"key": [1, 2]}) == {"key": [1, 2]}
+    with pytest.raises(CheckerError):
+        c.validate({"key": [1, "2"]})
+
+
+@pytest.mark.parametrize("generate", [True, False])
+@pytest.mark.parametrize("soft", [True, False])
+def test_checker_or_reports_closest_alternative(soft, generate, tmp_path):
+    c = Checker(Or({"a": int}, {"b": str}), soft=soft)
+    if generate:
+        c.compile(cache_dir=str(tmp_path))
+    with pytest.raises(CheckerError) as e:
+        c.validate({"a": "1"})
+    assert str(e.value) == (
+        "From key=\"a\": \n\tcurrent value '1' (str) is not int"
+    )
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_checker_error_report(soft):
+    c = Checker({"items": [{"price": float}], "id": int}, soft=soft)
+    with pytest.raises(CheckerError) as e:
+        c.validate({"items": [{"price": 1.5}, {"price": "2"}]})
+    records = list(e.value.report.records())
+    assert records[0].pointer == "/items/1/price"
+    assert records[0].kind == "type"
+    assert records[0].value == "2"
+
+
+def test_checker_error_without_report():
+    assert CheckerError("message").report is None
+
+
+def test_checker_error_of_huge_value():
+    c = Checker({"key": int}, soft=True)
+    with pytest.raises(CheckerError) as e:
+        c.validate({"key": list(range(100000))})
+    assert str(e.value) == (
+        'From key="key": \n\t'
+        "current value <list len=100000> (list) is not int"
+    )
+
+
+@pytest.mark.parametrize("max_errors", [0, -1])
+def test_checker_max_errors_must_be_positive(max_errors):
+    with pytest.raises(ValueError):
+        Checker([int], soft=True, max_errors=max_errors)
+    c = Checker([int], soft=True, max_errors=1)
+    with pytest.raises(ValueError):
+        c.max_errors = max_errors
+    assert c.max_errors == 1
+
+
+def test_checker_max_errors():
+    c = Checker([int], soft=True, max_errors=2)
+    with pytest.raises(CheckerError) as e:
+        c.validate(["1"] * 1000)
+    assert e.value.report.count == 2
+    assert e.value.report.skipped == 998
+    assert str(e.value) == (
+        "current value '1' (str) is not int\n"
+        "current value '1' (str) is not int\n"
+        "Validation stopped after 2 errors, 998 items skipped"
+    )
+
+
+def test_checker_aggregate():
+    c = Checker([{"price": float}], soft=True, aggregate=True)
+    with pytest.raises(CheckerError) as e:
+        c.validate([{"price": "1"}] * 10)
+    assert str(e.value) == (
+        "[*].price: 10 type errors like "
+        "current value '1' (str) is not float at "
+        "/0/price, /1/price, /2/price, /3/price, /4/price"
+    )
+
+
+def test_checker_aggregate_hard():
+    c = Checker({"items": [{"price": float}]}, aggregate=True)
+    with pytest.raises(CheckerError) as e:
+        c.validate({"items": [{"price": 1.5}, {"price": "1"}] * 10})
+    assert str(e.value) == (
+        'From key="items": \n\tFrom key="price": \n\t'
+        "current value '1' (str) is not float"
+    )
+    records = list(e.value.report.records())
+    assert [r.pointer for r in records] == ["/items/1/price"]
+
+
+@pytest.mark.parametrize("soft", [True, False])
+def test_checker_is_valid(soft):
+    c = Checker({"items": [{"price": float}]}, soft=soft)
+    assert c.is_valid({"items": [{"price": 1.5}]}) is True
+    assert c.is_valid({"items": [{"price": 1.5}, {"price": "2"}]}) is False
+
+
+def test_checker_validate_many():
+    c = Checker({"id": int})
+    results = list(c.validate_many([{"id": 1}, {"id": "2"}, {}]))
+    assert [(index, ok) for index, ok, _ in results] == [
+        (0, True),
+        (1, False),
+        (2, False),
+    ]
+    assert results[0][2] is None
+    assert str(results[1][2]) == (
+        "From key=\"id\": \n\tcurrent value '2' (str) is not int"
+    )
+    assert str(results[2][2]) == "Missing keys in current response: id"
+
+
+@pytest.mark.parametrize(
+    "soft, exp_count",
+    [[True, 3], [False, 1]],
+)
+def test_checker_validate_many_report(soft, exp_count):
+    c = Checker([int], soft=soft)
+    [(_, ok, report)] = c.validate_many([["1", "2", "3"]])
+    assert ok is False
+    assert report.count == exp_count
+
+
+@pytest.mark.parametrize(
+    "kwargs, exp_indexes",
+    [
+        [{}, [0, 1, 2, 3]],
+        [{"only_failures": True}, [1, 3]],
+        [{"only_valid": True}, [0, 2]],
+    ],
+)
+def test_checker_validate_many_filters(kwargs, exp_indexes):
+    results = Checker(int).validate_many([1, "2", 3, None], **kwargs)
+    assert [index for index, _, _ in results] == exp_indexes
+
+
+def test_checker_validate_many_exclusive_filters():
+    with pytest.raises(ValueError):
+        next(
+            Checker(int).validate_many(
+                [1], only_failures=True, only_valid=True
+            )
+        )
+
+
+def test_checker_validate_many_is_lazy():
+    def items():
+        yield 1
+        yield "2"
+        raise AssertionError("must not be consumed")
+
+    results = Checker(int).validate_many(items(), only_failures=True)
+    assert next(results)[0] == 1
+
+
+@pytest.mark.parametrize("soft", [True, False])
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"id": 1, "tags": ["a"]}',
+        '{"tags": ["a"], "id": 1}',
+        ' [{"id": 1, "tags": ["b"]}] ',
+    ],
+)
+def test_checker_validate_str_returns_decoded_data(soft, text):
+    schema = {"id": int, "tags": [str]}
+    if text.strip().startswith("["):
+        schema = [schema]
+    c = Checker(schema, soft=soft)
+    assert c.validate_str(text) == c.validate(json.loads(text))
+
+
+@pytest.mark.parametrize("soft", [True, False])
+@pytest.mark.parametrize(
+    "schema, text",
+    [
+        [{"id": int, "name": str}, '{"name": 1, "id": "1"}'],
+        [{"id": int, "name": str}, '{"name": "a"}'],
+        [{"id": int}, '{"id": 1, "name": "a"}'],
+        [[{"id": int}], '[{"id": 1}, {"id": "2"}, {"id": 3}]'],
+        [[int, str], "[1, 2]"],
+        [[int], "[]"],
+        [[int], "{}"],
+        [Or(int, None), '"1"'],
+    ],
+)
+def test_checker_validate_str_same_errors_as_validate(soft, schema, text):
+    c = Checker(schema, soft=soft)
+    with pytest.raises(CheckerError) as expected:
+        c.validate(json.loads(text))
+    with pytest.raises(CheckerError) as error:
+        c.validate_str(text)
+    assert type(error.value) is type(expected.value)
+    assert str(error.value) == str(expected.value)
+
+
+def test_checker_validate_str_stops_decoding_on_first_error():
+    text = '[{"id": "1"}, {"id": 2}, not json'
+    with pytest.raises(ListCheckerError):
+        Checker([{"id": int}]).validate_str(text)
+    with pytest.raises(json.JSONDecodeError):
+        Checker([{"id": int}], soft=True).validate_str(text)
+
+
+def test_checker_validate_str_by_settings_of_validate(monkeypatch):
+    text = json.dumps([1, "2", 3])
+    checker = Checker([int], sample=Sample(every=2))
+    assert checker.validate_str(text) == [1, "2", 3]
+    cache = ValidationCache(min_size=0)
+    checker = Checker([int], cache=cache)
+    checker.validate_str("[1, 2]")
+    checker.validate_bytes(b"[1, 2]")
+    assert cache.hits == 1
+
+    calls = []
+    monkeypatch.setattr(
+        parallel, "validate_document", lambda *args: calls.append(args)
+    )
+    Checker([int], workers=2, parallel_threshold=2).validate_str("[1, 2]")
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "utf-32"])
+def test_checker_validate_bytes(encoding):
+    c = Checker({"name": str})
+    data = '{"name": "ü"}'.encode(encoding)
+    assert c.validate_bytes(data) == {"name": "ü"}
+    with pytest.raises(DictCheckerError):
+        c.validate_bytes('{"name": 1}'.encode(encoding))
+
+
+def test_checker_validate_only_paths():
+    c = Checker({"user": {"id": int}, "items": [{"price": int}]}, soft=True)
+    data = {"user": {"id": 1, "extra": 1}, "items": [{"price": "1"}]}
+    assert c.validate(data, only=["user.id"]) is data
+    with pytest.raises(CheckerError) as error:
+        c.validate(data, only=["user.id", "items[*].price"])
+    assert [r.pointer for r in error.value.report.records()] == [
+        "/items/0/price"
+    ]
+    with pytest.raises(CheckerError):
+        c.validate(data, only=[""])
+    with pytest.raises(ValueError):
+        c.validate(data, only=["user.login"])
+    with pytest.raises(CheckerError) as error:
+        c.validate(data, only=["items[1].price"])
+    assert [r.pointer for r in error.value.report.records()] == ["/items/1"]
+
+
+def test_checker_validate_only_paths_of_generated_plan(tmpdir):
+    c = Checker({"user": {"id": int}, "name": str})
+    c.compile(cache_dir=str(tmpdir))
+    assert c.validate({"user": {"id": 1}, "name": 1}, only=["user.id"])
+    with pytest.raises(DictCheckerError):
+        c.validate({"user": {"id": "1"}}, only=["user.id"])
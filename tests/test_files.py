@@ -0,0 +1,506 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+
+import pytest
+
+from json_checker import (
+    Checker,
+    Limits,
+    Sample,
+    validate_json_array,
+    validate_ndjson,
+)
+from json_checker.files import (
+    Checkpoint,
+    JSONArrayReader,
+    Prefetcher,
+    Stage,
+    Summary,
+    iter_lines,
+    parse_pointer,
+    split_file,
+)
+
+SCHEMA = {"id": int}
+
+LINES = [
+    json.dumps({"id": 1}),
+    json.dumps({"id": "2"}),
+    "",
+    "{not json",
+    json.dumps({"id": 5}),
+    json.dumps({}),
+]
+
+
+@pytest.fixture
+def ndjson(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text("\n".join(LINES * 50) + "\n")
+    return path
+
+
+def failures(validation):
+    return [(f.line, f.offset, str(f)) for f in validation]
+
+
+def test_iter_lines():
+    f = io.BytesIO(b'{"id": 1}\n\n{"id": 2}\n')
+    assert list(iter_lines(f)) == [
+        (0, b'{"id": 1}\n'),
+        (10, b"\n"),
+        (11, b'{"id": 2}\n'),
+    ]
+
+
+def test_iter_lines_of_text_with_surrogates():
+    data = b'{"id": "\xff"}\n{"id": 2}\n'
+    f = io.TextIOWrapper(io.BytesIO(data), errors="surrogateescape")
+    validation = validate_ndjson(f, SCHEMA)
+    assert [failure.offset for failure in validation] == [0]
+    lines = iter_lines(["\udcff\n", "1\n"])
+    assert [offset for offset, _ in lines] == [0, 4]
+
+
+def test_iter_lines_of_range():
+    f = io.BytesIO(b"1\n22\n333\n")
+    f.seek(2)
+    assert list(iter_lines(f, 2, 5)) == [(2, b"22\n")]
+
+
+def test_split_file(ndjson):
+    data = ndjson.read_bytes()
+    ranges = list(split_file(str(ndjson), 100))
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[:end].endswith(b"\n")
+
+
+def test_validate_ndjson(ndjson):
+    validation = validate_ndjson(str(ndjson), SCHEMA)
+    result = failures(validation)
+    assert result[:3] == [
+        (
+            2,
+            10,
+            'line 2 (offset 10): From key="id": \n\t'
+            "current value '2' (str) is not int",
+        ),
+        (
+            4,
+            23,
+            "line 4 (offset 23): Expecting property name enclosed "
+            "in double quotes: line 1 column 2 (char 1)",
+        ),
+        (6, 43, "line 6 (offset 43): Missing keys in current response: id"),
+    ]
+    summary = validation.summary
+    assert (
+        summary.lines,
+        summary.records,
+        summary.valid,
+        summary.invalid,
+        summary.decode_errors,
+        summary.bytes,
+    ) == (300, 250, 100, 100, 50, ndjson.stat().st_size)
+
+
+def test_validate_ndjson_file_object(ndjson):
+    with open(str(ndjson), "rb") as f:
+        result = failures(validate_ndjson(f, SCHEMA))
+    assert result == failures(validate_ndjson(str(ndjson), SCHEMA))
+
+
+def test_validate_ndjson_soft_checker(ndjson):
+    checker = Checker({"id": int, "name": str}, soft=True)
+    failure = list(validate_ndjson(str(ndjson), checker))[1]
+    assert failure.line == 2
+    assert failure.report.count == 2
+
+
+def test_validate_ndjson_generated_plan(tmp_path, ndjson):
+    checker = Checker(SCHEMA)
+    plan = checker.compile(cache_dir=str(tmp_path))
+    result = failures(validate_ndjson(str(ndjson), checker))
+    assert checker._plan is plan
+    assert result == failures(validate_ndjson(str(ndjson), SCHEMA))
+
+
+def test_validate_ndjson_limits_and_sample(tmp_path):
+    path = tmp_path / "data.ndjson"
+    lines = [[1, 2]] * 10 + [[1, 2, 3], [1, "2"], ["1", 2]]
+    path.write_text("\n".join(json.dumps(line) for line in lines))
+    # values are counted by every line, not by the whole file
+    checker = Checker([int], limits=Limits(max_length=2, max_nodes=2))
+    result = list(validate_ndjson(str(path), checker))
+    assert [f.line for f in result] == [11, 12, 13]
+    assert result[0].report.exceeded == "max_length"
+
+    checker = Checker([int], sample=Sample(every=2))
+    result = list(validate_ndjson(str(path), checker))
+    assert [f.line for f in result] == [13]
+    assert result[0].report.checked == 1
+
+
+def test_validate_ndjson_parallel(ndjson):
+    validation = validate_ndjson(str(ndjson), SCHEMA, workers=2, chunk_size=64)
+    expected = validate_ndjson(str(ndjson), SCHEMA)
+    assert failures(validation) == failures(expected)
+    assert repr(validation.summary) == repr(expected.summary)
+
+
+def test_validate_ndjson_parallel_needs_path():
+    with pytest.raises(ValueError):
+        validate_ndjson(io.BytesIO(b""), SCHEMA, workers=2)
+
+
+def test_summary_update():
+    summary, other = Summary(), Summary()
+    other.lines, other.records, other.bytes = 3, 2, 10
+    summary.update(other)
+    summary.update(other)
+    assert (summary.lines, summary.records, summary.bytes) == (6, 4, 20)
+    other.stages["read"].seconds = 0.5
+    summary.update(other)
+    assert summary.stages["read"].seconds == 0.5
+
+
+def test_summary_errors(ndjson):
+    validation = validate_ndjson(str(ndjson), {"id": int, "name": str})
+    list(validation)
+    assert validation.summary.errors == {
+        ("id", "type"): 50,
+        ("id", "missing_key"): 50,
+        ("name", "missing_key"): 100,
+    }
+    parallel = validate_ndjson(
+        str(ndjson), {"id": int, "name": str}, workers=2, chunk_size=64
+    )
+    list(parallel)
+    assert parallel.summary.errors == validation.summary.errors
+
+
+def test_summary_errors_aggregated():
+    summary = Summary()
+    checker = Checker([{"id": int}], soft=True, aggregate=True)
+    report = checker.create_report()
+    checker.compile().validate([{"id": "1"}, {"id": "2"}], report)
+    summary.count_errors(report)
+    assert summary.errors == {("[*].id", "type"): 2}
+
+
+def test_summary_snapshot():
+    summary = Summary()
+    summary.lines, summary.bytes = 3, 10
+    summary.errors = {("id", "type"): 2}
+    restored = Summary()
+    restored.restore(json.loads(json.dumps(summary.snapshot())))
+    assert repr(restored) == repr(summary)
+    assert restored.errors == summary.errors
+
+
+def interrupt(validation, count):
+    iterator = iter(validation)
+    result = [next(iterator) for _ in range(count)]
+    iterator.close()
+    return result
+
+
+def test_validate_ndjson_resumes_from_checkpoint(tmp_path, ndjson):
+    path = str(tmp_path / "checkpoint")
+    expected = validate_ndjson(str(ndjson), SCHEMA)
+    expected_failures = failures(expected)
+
+    first = validate_ndjson(
+        str(ndjson), SCHEMA, checkpoint=path, checkpoint_every=10
+    )
+    interrupt(first, 40)
+    with open(path) as f:
+        state = json.load(f)
+    saved = state["summary"]["lines"]
+    assert state["offset"] == sum(
+        len(line) + 1 for line in (LINES * 50)[:saved]
+    )
+
+    second = validate_ndjson(str(ndjson), SCHEMA, checkpoint=path)
+    result = failures(second)
+    skipped = len(expected_failures) - len(result)
+    assert skipped > 0
+    assert result == expected_failures[skipped:]
+    assert repr(second.summary) == repr(expected.summary)
+    assert second.summary.errors == expected.summary.errors
+    assert not os.path.exists(path)
+
+
+def test_validate_ndjson_checkpoint_of_other_schema(tmp_path, ndjson):
+    path = str(tmp_path / "checkpoint")
+    interrupt(
+        validate_ndjson(
+            str(ndjson), SCHEMA, checkpoint=path, checkpoint_every=10
+        ),
+        20,
+    )
+    with pytest.raises(ValueError):
+        list(validate_ndjson(str(ndjson), {"id": str}, checkpoint=path))
+    soft = Checker(SCHEMA, soft=True)
+    with pytest.raises(ValueError):
+        list(validate_ndjson(str(ndjson), soft, checkpoint=path))
+    assert failures(validate_ndjson(str(ndjson), SCHEMA, checkpoint=path))
+
+
+def test_validate_ndjson_compressed_resumes(tmp_path, ndjson):
+    path = tmp_path / "data.ndjson.gz"
+    path.write_bytes(gzip.compress(ndjson.read_bytes()))
+    checkpoint = str(tmp_path / "checkpoint")
+    expected = failures(validate_ndjson(str(ndjson), SCHEMA))
+    interrupt(
+        validate_ndjson(
+            str(path), SCHEMA, checkpoint=checkpoint, checkpoint_every=7
+        ),
+        30,
+    )
+    result = failures(
+        validate_ndjson(str(path), SCHEMA, checkpoint=checkpoint)
+    )
+    skipped = len(expected) - len(result)
+    assert result == expected[skipped:]
+
+
+def test_checkpoint_needs_one_process(tmp_path):
+    with pytest.raises(ValueError):
+        validate_ndjson(
+            str(tmp_path / "data.ndjson"),
+            SCHEMA,
+            workers=2,
+            checkpoint=str(tmp_path / "checkpoint"),
+        )
+
+
+def test_checkpoint_load(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint", Checker(SCHEMA))
+    assert checkpoint.load() is None
+    summary = Summary()
+    summary.lines = 5
+    checkpoint.save(100, summary)
+    offset, snapshot = checkpoint.load()
+    assert (offset, snapshot["lines"]) == (100, 5)
+    checkpoint.remove()
+    assert checkpoint.load() is None
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"max_errors": 10},
+        {"limits": Limits(max_depth=2)},
+        {"sample": Sample(every=2)},
+        {"sample": {"[*]": Sample(every=2)}},
+    ],
+)
+def test_checkpoint_of_other_settings(tmp_path, options):
+    path = tmp_path / "checkpoint"
+    Checkpoint(path, Checker(SCHEMA)).save(100, Summary())
+    with pytest.raises(ValueError):
+        Checkpoint(path, Checker(SCHEMA, **options)).load()
+    checkpoint = Checkpoint(path, Checker(SCHEMA, **options))
+    checkpoint.save(100, Summary())
+    assert Checkpoint(path, Checker(SCHEMA, **options)).load()[0] == 100
+
+
+COMPRESSIONS = [[".gz", gzip], [".bz2", bz2], [".xz", lzma]]
+
+
+@pytest.mark.parametrize("extension, module", COMPRESSIONS)
+def test_validate_ndjson_compressed(tmp_path, ndjson, extension, module):
+    path = tmp_path / ("data.ndjson" + extension)
+    path.write_bytes(module.compress(ndjson.read_bytes()))
+    validation = validate_ndjson(str(path), SCHEMA)
+    expected = validate_ndjson(str(ndjson), SCHEMA)
+    assert failures(validation) == failures(expected)
+    assert repr(validation.summary) == repr(expected.summary)
+
+
+def test_validate_ndjson_compressed_by_one_process(tmp_path):
+    with pytest.raises(ValueError):
+        validate_ndjson(str(tmp_path / "data.ndjson.gz"), SCHEMA, workers=2)
+
+
+def test_validate_ndjson_stages(ndjson):
+    validation = validate_ndjson(str(ndjson), SCHEMA)
+    list(validation)
+    for name in ("read", "validate"):
+        stage = validation.summary.stages[name]
+        assert stage.bytes == ndjson.stat().st_size
+        assert stage.records == 250
+        assert stage.seconds > 0
+
+
+def test_validate_ndjson_stops_reading(tmp_path):
+    path = tmp_path / "data.ndjson"
+    path.write_text('{"id": "1"}\n' * 100000)
+    validation = validate_ndjson(str(path), SCHEMA)
+    iterator = iter(validation)
+    next(iterator)
+    iterator.close()
+    assert validation.summary.records < 100000
+
+
+def test_stage():
+    stage = Stage("read")
+    assert (stage.mb_per_second, stage.records_per_second) == (0.0, 0.0)
+    stage.seconds, stage.bytes, stage.records = 2.0, 4 * 1024 * 1024, 10
+    assert (stage.mb_per_second, stage.records_per_second) == (2.0, 5.0)
+    assert repr(stage) == "<Stage read 2.0 MB/s 5 records/s>"
+
+
+def test_prefetcher_read():
+    f = io.BytesIO(b"0123456789")
+    prefetcher = Prefetcher(lambda: f.read(3), pending=1)
+    assert prefetcher.read(5) == b"01234"
+    assert prefetcher.read(1) == b"5"
+    assert prefetcher.read(10) == b"6789"
+    assert prefetcher.read(10) == b""
+    prefetcher.close()
+
+
+def test_prefetcher_raises_errors_of_thread():
+    def read():
+        raise OSError("broken file")
+
+    prefetcher = Prefetcher(read)
+    with pytest.raises(OSError):
+        list(prefetcher)
+    prefetcher.close()
+
+
+def test_prefetcher_close_stops_thread():
+    prefetcher = Prefetcher(lambda: [b"line"], pending=1)
+    next(iter(prefetcher))
+    prefetcher.close()
+    assert not prefetcher.thread.is_alive()
+
+
+ITEMS = [{"id": 1}, {"id": "2"}, 12345678901, [1.5e10, 'a"]'], {"id": 5}]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+@pytest.mark.parametrize(
+    "document, pointer",
+    [
+        [ITEMS, ""],
+        [{"meta": {"data": [1]}, "x": "]", "data": ITEMS, "z": 1}, "/data"],
+        [[[0], {"a/b": ITEMS}], "/1/a~1b"],
+    ],
+)
+def test_json_array_reader(document, pointer, block_size):
+    text = json.dumps(document, indent=2)
+    reader = JSONArrayReader(io.BytesIO(text.encode()), block_size)
+    items = list(reader.items(parse_pointer(pointer)))
+    assert [item for _, _, item in items] == ITEMS
+    decode = json.JSONDecoder().raw_decode
+    for index, position, item in items:
+        assert decode(text, position)[0] == item
+    assert reader.bytes == len(text)
+
+
+@pytest.mark.parametrize(
+    "text", ["[]", " [ ] \n", '{"data": []}', '{"data": []} x']
+)
+def test_json_array_reader_empty(text):
+    pointer = "/data" if "data" in text else ""
+    reader = JSONArrayReader(io.StringIO(text), 2)
+    assert list(reader.items(parse_pointer(pointer))) == []
+
+
+@pytest.mark.parametrize(
+    "text, pointer, exp_message",
+    [
+        ["[1, 2", "", "Expecting ',' or ']': char 5"],
+        ["[1 2]", "", "Expecting ',' or ']': char 3"],
+        ['[1, {"a": }]', "", "Expecting value: char 10"],
+        ['{"a": [1]}', "", "Expecting '[': char 0"],
+        ['{"a": [1]}', "/b", "Missing key b: char 10"],
+        ["[[1]]", "/1", "Missing index 1: char 5"],
+        ["[1] trailing", "", "Extra data: char 4"],
+        ["[1][2]", "", "Extra data: char 3"],
+        ["[] \n x", "", "Extra data: char 5"],
+    ],
+)
+def test_json_array_reader_errors(text, pointer, exp_message):
+    reader = JSONArrayReader(io.StringIO(text), 2)
+    with pytest.raises(ValueError) as e:
+        list(reader.items(parse_pointer(pointer)))
+    assert str(e.value) == exp_message
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5])
+def test_json_array_reader_cut_values(block_size):
+    items = [True, None, -1.5e-3, "\u00e9\\", {"a": [False]}]
+    reader = JSONArrayReader(io.StringIO(json.dumps(items)), block_size)
+    assert [item for _, _, item in reader.items()] == items
+
+
+def test_json_array_reader_stops_on_malformed_item():
+    text = '[{"id": tru}, ' + ", ".join(['{"id": 1}'] * 100000) + "]"
+    reader = JSONArrayReader(io.BytesIO(text.encode()), 1024)
+    with pytest.raises(ValueError) as e:
+        list(reader.items())
+    assert str(e.value) == "Expecting value: char 8"
+    # the rest of file is not read
+    assert reader.bytes == 1024
+
+
+def test_parse_pointer():
+    assert parse_pointer("") == []
+    assert parse_pointer("/a~1b/0/~0c") == ["a/b", "0", "~c"]
+    with pytest.raises(ValueError):
+        parse_pointer("data")
+
+
+def test_validate_json_array(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"data": ITEMS}))
+    validation = validate_json_array(str(path), {"id": int}, "/data")
+    assert [str(f) for f in validation] == [
+        'item /data/1 (position 21): From key="id": \n\t'
+        "current value '2' (str) is not int",
+        "item /data/2 (position 34): "
+        "current value 12345678901 (int) is not dict",
+        "item /data/3 (position 47): "
+        "current value [15000000000.0, 'a\"]'] (list) is not dict",
+    ]
+    summary = validation.summary
+    assert (summary.records, summary.valid, summary.invalid) == (5, 2, 3)
+    assert summary.bytes == path.stat().st_size
+
+
+@pytest.mark.parametrize("extension, module", COMPRESSIONS)
+def test_validate_json_array_compressed(tmp_path, extension, module):
+    document = json.dumps({"data": ITEMS}).encode()
+    path = tmp_path / ("data.json" + extension)
+    path.write_bytes(module.compress(document))
+    validation = validate_json_array(str(path), {"id": int}, "/data", 8)
+    assert [f.pointer for f in validation] == ["/data/1", "/data/2", "/data/3"]
+    assert validation.summary.bytes == len(document)
+    assert validation.summary.stages["read"].records == 5
+
+
+def test_validate_json_array_limits(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([[1, 2]] * 10 + [[1, 2, 3], [1, "2"]]))
+    checker = Checker([int], limits=Limits(max_length=2, max_nodes=2))
+    validation = validate_json_array(str(path), checker)
+    assert [f.pointer for f in validation] == ["/10", "/11"]
+
+
+def test_validate_ndjson_counts_bytes_of_text():
+    lines = ['{"id": "ü"}\n', '{"id": 1}\n']
+    validation = validate_ndjson(io.StringIO("".join(lines)), SCHEMA)
+    assert [failure.offset for failure in validation] == [0]
+    assert validation.summary.bytes == len("".join(lines).encode())